@@ -1,3 +1,36 @@
 __version__ = "2.1.1"
-from . import integration
+import importlib
+from typing import TYPE_CHECKING
+
+from .cache import ParseCache
+from .diagnostics import Diagnostics
+from .dialects import DialectDetector
+from .inheritance import resolve_languages
+from .merge import MergeEngine
 from .parser import *
+from .profiling import Profiler
+from .table import TranslationTable
+from .walk import FileWalker
+
+if TYPE_CHECKING:
+    from .catalog import Catalog, write_catalog
+    from .external import write_language_files_external
+
+# Imported on first access, so `import babelbox` doesn't pay for typer and beet
+_LAZY_SUBMODULES = ("cli", "integration")
+# Attributes imported from their submodule on first access, since the submodules pull in mmap,
+# tempfile and heapq
+_LAZY_ATTRIBUTES = {
+    "Catalog": "catalog",
+    "write_catalog": "catalog",
+    "write_language_files_external": "external",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f"{__name__}.{_LAZY_ATTRIBUTES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Mapping, Optional, Union
+
+__all__ = [
+    "is_archive",
+    "split_archive_path",
+    "split_output_path",
+    "open_text",
+    "read_bytes",
+    "stat_source",
+    "make_output_dir",
+    "write_zip",
+]
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Archives read by this process, by path: (mtime and size, archive, files by name, lock)
+_archives: dict[str, tuple[tuple[int, int], Any, dict[str, Any], threading.Lock]] = {}
+_archives_lock = threading.Lock()
+
+
+def is_archive(path: Union[str, os.PathLike]):
+    return os.fspath(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_archive_path(path: Union[str, os.PathLike]) -> Optional[tuple[Path, str]]:
+    """
+    Splits a path into an existing zip or tar archive and the path inside of it, e.g.
+    `pack.zip/assets/lang` into `pack.zip` and `assets/lang`. Returns None if no part of the path
+    is an archive
+    """
+
+    path = Path(path)
+    for candidate in [path, *path.parents]:
+        if is_archive(candidate.name) and candidate.is_file():
+            inner = path.relative_to(candidate).as_posix()
+            return candidate, "" if inner == "." else inner
+    return None
+
+
+def split_output_path(path: Union[str, os.PathLike]) -> Optional[tuple[Path, str]]:
+    """ Like `split_archive_path`, but for zip archives that don't need to exist yet """
+
+    parts = Path(path).parts
+    for i, part in enumerate(parts):
+        if part.lower().endswith(".zip"):
+            return Path(*parts[: i + 1]), "/".join(parts[i + 1 :])
+    return None
+
+
+def list_members(path: Union[str, os.PathLike]) -> list[str]:
+    """ Returns the names of all files in an archive, in the order they are stored in """
+
+    return list(_open(Path(path))[2])
+
+
+def read_bytes(path: Union[str, os.PathLike]) -> bytes:
+    """ Reads a file, which may be inside of an archive """
+
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        if (split := split_archive_path(path)) is None:
+            raise
+
+    archive_path, name = split
+    _, archive, members, lock = _open(archive_path)
+    if (member := members.get(name)) is None:
+        raise FileNotFoundError(f"No such file in archive: '{path}'")
+    with lock:
+        if hasattr(archive, "read"):
+            return archive.read(member)
+        with archive.extractfile(member) as f:
+            return f.read()
+
+
+def open_text(path: Union[str, os.PathLike]) -> IO[str]:
+    """
+    Opens a file for reading text like `open(path, newline="", encoding="utf8")`. Files inside of
+    archives are read into memory instead of being extracted
+    """
+
+    try:
+        return open(path, newline="", encoding="utf8")
+    except OSError:
+        if split_archive_path(path) is None:
+            raise
+    return io.StringIO(read_bytes(path).decode("utf8"), newline="")
+
+
+def stat_source(path: Union[str, os.PathLike]) -> tuple[int, int]:
+    """
+    Returns the modification time in ns and the size of a file. Files inside of archives have the
+    modification time of their archive, so they change whenever the archive changes
+    """
+
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        if (split := split_archive_path(path)) is None:
+            raise
+
+    archive_path, name = split
+    (mtime, _), _, members, _ = _open(archive_path)
+    if (member := members.get(name)) is None:
+        raise FileNotFoundError(f"No such file in archive: '{path}'")
+    return mtime, member.file_size if hasattr(member, "file_size") else member.size
+
+
+def make_output_dir(path: Union[str, os.PathLike]):
+    """
+    Creates an output folder. For folders inside of a zip archive, only the folder containing the
+    archive is created, since the archive is written together with the files in it
+    """
+
+    if (output := split_output_path(path)) is not None:
+        path = output[0].parent
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def _open(path: Path):
+    stat = path.stat()
+    key = str(path.absolute())
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _archives_lock:
+        entry = _archives.get(key)
+        if entry is None or entry[0] != version:
+            if entry is not None:
+                entry[1].close()
+            archive = _open_archive(path)
+            entry = _archives[key] = (version, archive, _index(archive), threading.Lock())
+    return entry
+
+
+def _index(archive) -> dict[str, Any]:
+    # Files by their normalized name. Tars created with e.g. `tar -czf pack.tgz .` name their
+    # members `./lang/a.csv`, while paths into the archive are looked up as `lang/a.csv`
+    if hasattr(archive, "infolist"):
+        files = [(info.filename, info) for info in archive.infolist() if not info.is_dir()]
+    else:
+        files = [(member.name, member) for member in archive.getmembers() if member.isfile()]
+    return {_normalize_name(name): member for name, member in files}
+
+
+def _normalize_name(name: str) -> str:
+    return "/".join(part for part in name.split("/") if part not in ("", "."))
+
+
+def _open_archive(path: Path):
+    # Imported lazily, since they are only needed for archives
+    if path.name.lower().endswith(".zip"):
+        import zipfile
+
+        return zipfile.ZipFile(path)
+
+    import tarfile
+
+    return tarfile.open(path)
+
+
+def _close(path: Path):
+    with _archives_lock:
+        entry = _archives.pop(str(path.absolute()), None)
+    if entry is not None:
+        entry[1].close()
+
+
+def write_zip(
+    path: Union[str, os.PathLike], members: Mapping[str, bytes], skip_unchanged=False
+) -> set[str]:
+    """
+    Writes files into a zip archive, replacing files with the same name and keeping all others.
+    The archive is replaced atomically. With `skip_unchanged`, files whose content didn't change
+    are kept as they are and the archive is left untouched if nothing changed. Returns the names
+    of the written files
+    """
+
+    import zipfile
+
+    path = Path(path)
+    existing: dict[str, zipfile.ZipInfo] = {}
+    if path.exists():
+        with zipfile.ZipFile(path) as old:
+            existing = {info.filename: info for info in old.infolist()}
+
+    changed = set(members)
+    if skip_unchanged:
+        changed = {
+            name
+            for name in members
+            if not _zip_member_equals(existing.get(name), members[name])
+        }
+        if not changed:
+            return changed
+
+    _close(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    date_time = time.localtime()[:6]
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        if existing:
+            with zipfile.ZipFile(path) as old:
+                for info in old.infolist():
+                    if info.filename not in changed:
+                        archive.writestr(info, old.read(info))
+
+        for name, data in members.items():
+            if name in changed:
+                info = zipfile.ZipInfo(name, date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, data)
+
+    os.replace(tmp_path, path)
+    return changed
+
+
+def _zip_member_equals(info, data: bytes):
+    import zlib
+
+    return info is not None and info.file_size == len(data) and info.CRC == zlib.crc32(data)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from .archive import read_bytes, stat_source
+
+__all__ = ["ParseCache"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Bumped whenever the layout of entries changes
+FORMAT_VERSION = 4
+
+_DIALECT_ATTRIBUTES = (
+    "delimiter",
+    "quotechar",
+    "escapechar",
+    "doublequote",
+    "skipinitialspace",
+    "lineterminator",
+    "quoting",
+)
+
+
+def _dialect_key(dialect) -> object:
+    if dialect is None or isinstance(dialect, str):
+        return dialect
+    return [getattr(dialect, attr, None) for attr in _DIALECT_ATTRIBUTES]
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed csv files.
+
+    Entries are keyed on the content of a file and the settings used to parse it, so renaming or
+    touching a file does not invalidate its entry. Least recently used entries are evicted once
+    the cache grows beyond `max_size` bytes.
+
+    `file_key` remembers the size, modification time and content hash of each file, so unchanged
+    files only cost a stat. Call `save` to persist those between runs. Stats of files that were
+    not used since they were loaded are only kept while the files exist and are unchanged.
+    """
+
+    STATS_FILE = "file-stats"
+
+    def __init__(self, directory: Union[str, os.PathLike], max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._stats: Optional[dict[str, list]] = None
+        self._stats_changed = False
+        # Files whose stats were used since they were loaded
+        self._seen: set[str] = set()
+
+    def key(
+        self,
+        content: bytes,
+        prefix: str = "",
+        dialect=None,
+        dialect_overwrites: Optional[dict] = None,
+    ) -> str:
+        content_hash = hashlib.sha256(content).hexdigest()
+        return self._key(content_hash, prefix, dialect, dialect_overwrites)
+
+    def file_key(
+        self,
+        path: Union[str, os.PathLike],
+        prefix: str = "",
+        dialect=None,
+        dialect_overwrites: Optional[dict] = None,
+    ) -> str:
+        """ Like `key`, but only reads and hashes the file if its size or mtime changed """
+
+        if self._stats is None:
+            self._stats = self._load_stats()
+
+        path = Path(path)
+        mtime, size = stat_source(path)
+        name = str(path.absolute())
+        self._seen.add(name)
+
+        cached_stat = self._stats.get(name)
+        if cached_stat is not None and cached_stat[:2] == [mtime, size]:
+            content_hash = cached_stat[2]
+        else:
+            content_hash = hashlib.sha256(read_bytes(path)).hexdigest()
+            self._stats[name] = [mtime, size, content_hash]
+            self._stats_changed = True
+
+        return self._key(content_hash, prefix, dialect, dialect_overwrites)
+
+    def save(self):
+        """ Persists the file stats collected by `file_key` """
+
+        if self._stats is None or not self._stats_changed:
+            return
+
+        # Stats of removed or changed files are useless, since they would be hashed again anyway
+        for name in self._stats.keys() - self._seen:
+            try:
+                current = list(stat_source(name))
+            except Exception:
+                # E.g. the file, its archive or its folder was removed or the archive is broken
+                current = None
+            if current != self._stats[name][:2]:
+                del self._stats[name]
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / self.STATS_FILE, "w", encoding="utf8") as f:
+            json.dump(self._stats, f)
+        self._stats_changed = False
+
+    def _load_stats(self) -> dict[str, list]:
+        try:
+            with open(self.directory / self.STATS_FILE, encoding="utf8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _key(self, content_hash: str, prefix, dialect, dialect_overwrites) -> str:
+        settings = json.dumps(
+            [
+                FORMAT_VERSION,
+                prefix,
+                _dialect_key(dialect),
+                sorted((dialect_overwrites or {}).items()),
+            ],
+            default=repr,
+        )
+
+        return hashlib.sha256(f"{content_hash}\0{settings}".encode("utf8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, dict[str, str]]]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str):
+        """
+        Returns the cached languages, the line number of each identifier, the parent of each
+        inheriting language and the lines that are missing an identifier
+        """
+
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf8") as f:
+                entry = json.load(f)
+            languages: dict[str, dict[str, str]] = entry["languages"]
+            line_numbers: dict[str, int] = entry["line_numbers"]
+            parents: dict[str, str] = entry.get("parents", {})
+            missing_identifiers: list[int] = entry.get("missing_identifiers", [])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        # Mark entry as recently used
+        os.utime(path)
+        return languages, line_numbers, parents, missing_identifiers
+
+    def put(
+        self,
+        key: str,
+        languages: dict[str, dict[str, str]],
+        line_numbers: Optional[dict[str, int]] = None,
+        parents: Optional[dict[str, str]] = None,
+        missing_identifiers: Optional[list[int]] = None,
+    ):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        entry: dict = {"languages": languages, "line_numbers": line_numbers or {}}
+        if parents:
+            entry["parents"] = parents
+        if missing_identifiers:
+            entry["missing_identifiers"] = missing_identifiers
+        data = json.dumps(entry, ensure_ascii=False).encode("utf8")
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        else:
+            self._size += len(data)
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """ Removes least recently used entries until the cache fits into `max_size` """
+
+        entries = sorted(self._entries())
+        size = sum(size for _, _, size in entries)
+
+        for _, path, entry_size in entries:
+            if size <= self.max_size:
+                break
+            logger.info(f"Evicting parse cache entry {path.name!r}")
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+        self._size = size
+
+    def clear(self):
+        for _, path, _ in self._entries():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+    def _entry_path(self, key: str):
+        return self.directory / (key + ".json")
+
+    def _entries(self):
+        if not self.directory.is_dir():
+            return
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    yield stat.st_mtime_ns, Path(entry.path), stat.st_size
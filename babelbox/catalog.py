@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Union
+
+__all__ = ["Catalog", "write_catalog"]
+
+MAGIC = b"BBXCAT"
+FORMAT_VERSION = 1
+
+# magic, version, languages, identifiers, slots
+_HEADER = struct.Struct("<6sHIII")
+# offset and length of a string in the string pool
+_STRING = struct.Struct("<II")
+# hash of an identifier and its index + 1. Index 0 marks an empty slot
+_SLOT = struct.Struct("<II")
+
+_MISSING = 0xFFFFFFFF
+_MAX_OFFSET = 0xFFFFFFFE
+
+
+def _hash(identifier: bytes):
+    return zlib.crc32(identifier)
+
+
+def write_catalog(
+    path: Union[str, os.PathLike], languages: Mapping[str, Mapping[str, str]]
+) -> Path:
+    """
+    Compiles languages into a single binary catalog that `Catalog` can memory-map.
+
+    The catalog holds a hash index of all identifiers and a table of translations per language.
+    Strings are stored once in a shared, utf8 encoded pool. The file is replaced atomically, so
+    processes that mapped the previous catalog keep reading a consistent file.
+
+    | Header | Languages | Slots | Identifiers | Translations per language | String pool |
+    """
+
+    path = Path(path)
+
+    pool = bytearray()
+    pooled: dict[str, tuple[int, int]] = {}
+
+    def intern(s: str):
+        if (entry := pooled.get(s)) is None:
+            data = s.encode("utf8")
+            if len(pool) + len(data) > _MAX_OFFSET:
+                raise ValueError("Catalog string pool exceeds 4 GiB")
+            entry = pooled[s] = (len(pool), len(data))
+            pool.extend(data)
+        return entry
+
+    codes = list(languages)
+    index: dict[str, int] = {}
+    for translations in languages.values():
+        for identifier in translations:
+            index.setdefault(identifier, len(index))
+
+    # Keep the load factor at or below 50% so probe sequences stay short
+    slot_count = 1
+    while slot_count < 2 * len(index):
+        slot_count *= 2
+
+    slots = [(0, 0)] * slot_count
+    identifiers = bytearray()
+    for i, identifier in enumerate(index):
+        offset, length = intern(identifier)
+        identifiers += _STRING.pack(offset, length)
+
+        h = _hash(identifier.encode("utf8"))
+        slot = h & (slot_count - 1)
+        while slots[slot][1]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (h, i + 1)
+
+    columns = bytearray()
+    missing = _STRING.pack(_MISSING, 0)
+    for translations in languages.values():
+        column = [missing] * len(index)
+        for identifier, translation in translations.items():
+            column[index[identifier]] = _STRING.pack(*intern(translation))
+        columns += b"".join(column)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(codes), len(index), slot_count)
+    language_table = b"".join(_STRING.pack(*intern(code)) for code in codes)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(language_table)
+        f.write(b"".join(_SLOT.pack(*slot) for slot in slots))
+        f.write(identifiers)
+        f.write(columns)
+        f.write(pool)
+    os.replace(tmp, path)
+
+    return path
+
+
+class Catalog:
+    """
+    Read-only, memory-mapped catalog written by `write_catalog`.
+
+    Opening a catalog only reads its header and language codes. Each lookup hashes the identifier,
+    probes the index and decodes a single string, so startup is independent of the catalog size
+    and the pages of the file are shared between all processes that map it.
+
+    >>> with Catalog("translations.bbx") as catalog:
+    ...     catalog.get("en_us", "item.swords.gold.name")
+    'Gold sword'
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, language_count, identifier_count, slot_count = _HEADER.unpack_from(
+                self._mm
+            )
+        except struct.error:
+            self.close()
+            raise ValueError(f"'{self.path}' is not a babelbox catalog") from None
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"'{self.path}' is not a babelbox catalog of version {FORMAT_VERSION}"
+            )
+
+        self._identifier_count = identifier_count
+        self._slot_mask = slot_count - 1
+
+        languages_start = _HEADER.size
+        self._slots_start = languages_start + language_count * _STRING.size
+        self._identifiers_start = self._slots_start + slot_count * _SLOT.size
+        columns_start = self._identifiers_start + identifier_count * _STRING.size
+        column_size = identifier_count * _STRING.size
+        self._pool_start = columns_start + language_count * column_size
+
+        self._columns: dict[str, int] = {}
+        for i in range(language_count):
+            code = self._string(languages_start + i * _STRING.size)
+            self._columns[code] = columns_start + i * column_size
+
+    @property
+    def languages(self) -> list[str]:
+        return list(self._columns)
+
+    def __len__(self):
+        return self._identifier_count
+
+    def get(self, language_code: str, identifier: str, default=None) -> Optional[str]:
+        """ Returns the translation of `identifier` in a language or `default` if there is none """
+
+        column = self._columns.get(language_code)
+        if column is None:
+            return default
+
+        i = self._find(identifier)
+        if i is None:
+            return default
+
+        offset, length = _STRING.unpack_from(self._mm, column + i * _STRING.size)
+        if offset == _MISSING:
+            return default
+
+        start = self._pool_start + offset
+        return self._mm[start : start + length].decode("utf8")
+
+    def __getitem__(self, key: tuple[str, str]) -> str:
+        if (translation := self.get(*key)) is None:
+            raise KeyError(key)
+        return translation
+
+    def __contains__(self, key: tuple[str, str]):
+        return self.get(*key) is not None
+
+    def identifiers(self) -> Iterator[str]:
+        for i in range(self._identifier_count):
+            yield self._string(self._identifiers_start + i * _STRING.size)
+
+    def language(self, language_code: str) -> dict[str, str]:
+        """ Deserializes all translations of one language """
+
+        column = self._columns[language_code]
+        translations = {}
+        for i, identifier in enumerate(self.identifiers()):
+            offset, length = _STRING.unpack_from(self._mm, column + i * _STRING.size)
+            if offset != _MISSING:
+                start = self._pool_start + offset
+                translations[identifier] = self._mm[start : start + length].decode("utf8")
+        return translations
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return (
+            f"Catalog('{self.path}', {len(self._columns)} languages, {len(self)} identifiers)"
+        )
+
+    def _find(self, identifier: str) -> Optional[int]:
+        key = identifier.encode("utf8")
+        h = _hash(key)
+        slot = h & self._slot_mask
+
+        while True:
+            slot_hash, index = _SLOT.unpack_from(
+                self._mm, self._slots_start + slot * _SLOT.size
+            )
+            if not index:
+                return None
+
+            if slot_hash == h:
+                offset, length = _STRING.unpack_from(
+                    self._mm, self._identifiers_start + (index - 1) * _STRING.size
+                )
+                start = self._pool_start + offset
+                if length == len(key) and self._mm[start : start + length] == key:
+                    return index - 1
+
+            slot = (slot + 1) & self._slot_mask
+
+    def _string(self, position: int) -> str:
+        offset, length = _STRING.unpack_from(self._mm, position)
+        start = self._pool_start + offset
+        return self._mm[start : start + length].decode("utf8")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+
+from .archive import read_bytes, split_output_path, stat_source
+from .inheritance import materialize
+from .parser import _file_content_equals
+from .serialize import dumps
+
+__all__ = ["LanguageDiff", "diff_language_files", "fingerprint", "fingerprint_file"]
+
+FINGERPRINT_FILE = "fingerprint"
+
+
+class LanguageDiff(NamedTuple):
+    code: str
+    # Identifiers that are missing from the file, only in the file and translated differently
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+    exists: bool = True
+
+    def messages(self, max_examples: Optional[int] = 5) -> Iterator[str]:
+        if not self.exists:
+            yield f"{self.code}.json does not exist"
+            return
+        if not (self.added or self.removed or self.changed):
+            yield f"{self.code}.json is formatted differently"
+            return
+
+        for kind, identifiers in [
+            ("Missing", self.added),
+            ("Unexpected", self.removed),
+            ("Changed", self.changed),
+        ]:
+            if not identifiers:
+                continue
+            shown = identifiers if max_examples is None else identifiers[:max_examples]
+            hidden = len(identifiers) - len(shown)
+            more = f" and {hidden} more" if hidden else ""
+            yield f"{self.code}.json: {kind} {', '.join(map(repr, shown))}{more}"
+
+
+def diff_language_files(
+    dest_dir: Union[str, os.PathLike],
+    languages: Mapping[str, Mapping[str, str]],
+    indent: Optional[str] = None,
+) -> dict[str, LanguageDiff]:
+    """
+    Compares the language files in `dest_dir` with what `write_language_files` would write.
+    Returns the differences of each language whose file is out of date
+    """
+
+    diffs = {}
+    for code, translations in languages.items():
+        path = Path(dest_dir, code + ".json")
+        translations = materialize(translations)
+
+        data = dumps(translations, indent)
+        if _file_content_equals(path, data):
+            continue
+
+        try:
+            written = json.loads(read_bytes(path))
+        except FileNotFoundError:
+            diffs[code] = LanguageDiff(code, list(translations), [], [], exists=False)
+            continue
+        except (OSError, ValueError):
+            written = {}
+
+        if not isinstance(written, dict):
+            written = {}
+
+        diffs[code] = LanguageDiff(
+            code,
+            [identifier for identifier in translations if identifier not in written],
+            [identifier for identifier in written if identifier not in translations],
+            [
+                identifier
+                for identifier, translation in translations.items()
+                if identifier in written and written[identifier] != translation
+            ],
+        )
+
+    return diffs
+
+
+def fingerprint(
+    files: Iterable[tuple[Path, str]], dest_dir: Union[str, os.PathLike], settings: object
+) -> str:
+    """
+    Hashes the paths, prefixes, sizes and modification times of source files and of the language
+    files in `dest_dir`, together with the settings of a build. Only stats files, so it is cheap
+    to check whether anything changed since the fingerprint was taken
+    """
+
+    def stat(path: Path):
+        try:
+            return stat_source(path)
+        except OSError:
+            return None
+
+    if os.path.isdir(dest_dir):
+        outputs = sorted(Path(dest_dir).glob("*.json"))
+    elif (output := split_output_path(dest_dir)) is not None:
+        outputs = [output[0]]
+    else:
+        outputs = []
+    state = [
+        settings,
+        [(str(path), prefix, stat(path)) for path, prefix in files],
+        [(path.name, stat(path)) for path in outputs],
+    ]
+    return hashlib.blake2b(json.dumps(state).encode("utf8"), digest_size=16).hexdigest()
+
+
+def fingerprint_file(
+    directory: Union[str, os.PathLike], dest_dir: Union[str, os.PathLike]
+) -> Path:
+    """ Returns the file in `directory` the fingerprint of builds into `dest_dir` is stored in """
+
+    name = str(Path(dest_dir).absolute()).encode("utf8")
+    return Path(
+        directory, f"{FINGERPRINT_FILE}-{hashlib.blake2b(name, digest_size=8).hexdigest()}"
+    )
+
+
+def read_fingerprint(path: Union[str, os.PathLike]) -> Optional[str]:
+    try:
+        return Path(path).read_text("utf8").strip()
+    except OSError:
+        return None
+
+
+def write_fingerprint(path: Union[str, os.PathLike], value: str):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(value + "\n", "utf8")
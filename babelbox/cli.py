@@ -1,13 +1,42 @@
 import enum
 import logging
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 import typer
 
 import babelbox
 
-from .parser import load_languages, merge_languages, write_language_files
+from . import profiling
+from .archive import make_output_dir, split_archive_path, split_output_path
+from .cache import ParseCache
+from .catalog import write_catalog
+from .check import (
+    diff_language_files,
+    fingerprint,
+    fingerprint_file,
+    read_fingerprint,
+    write_fingerprint,
+)
+from .diagnostics import Diagnostics
+from .dialects import DialectDetector
+from .external import write_language_files_external
+from .manifest import load_manifest, load_targets, write_targets
+from .merge import MergeEngine
+from .parser import (
+    LoadedFile,
+    find_csv_files,
+    iter_csv_files,
+    load_files,
+    stream_files,
+    write_language_files,
+)
+from .profiling import Profiler
+from .walk import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, FileWalker
+from .watch import IncrementalBuild, watch
+
+logger = logging.getLogger(__name__)
 
 
 class CSVDialect(enum.Enum):
@@ -27,17 +56,33 @@ app = typer.Typer()
 
 @app.command()
 def main(
+    ctx: typer.Context,
     sources: List[Path] = typer.Argument(
-        ..., exists=True, readable=True, help="File or directory containing languages"
+        None,
+        readable=True,
+        show_default=False,
+        help="File, directory or zip/tar archive containing languages",
     ),
     out: Optional[Path] = typer.Option(
         None,
         "-o",
         "--out",
-        help="The output directory of the generated files",
-        file_okay=False,
+        help="The output directory of the generated files. May be inside of a zip archive,"
+        " e.g. 'pack.zip/assets/minecraft/lang'",
         writable=True,
     ),
+    include: List[str] = typer.Option(
+        [],
+        "--include",
+        show_default=False,
+        help="Only load files in directories matching this glob. Defaults to '*.csv'",
+    ),
+    exclude: List[str] = typer.Option(
+        [],
+        "--exclude",
+        show_default=False,
+        help="Skip files and folders in directories matching this glob",
+    ),
     prefix_identifiers: bool = typer.Option(
         False,
         "--prefix-identifiers",
@@ -62,6 +107,96 @@ def main(
     indent: str = typer.Option(
         "\t", "--indent", "-i", help="Indentation used when generating files"
     ),
+    skip_unchanged: bool = typer.Option(
+        False,
+        "--skip-unchanged",
+        is_flag=True,
+        help="Don't rewrite language files whose content did not change",
+    ),
+    manifest: Optional[Path] = typer.Option(
+        None,
+        "--manifest",
+        exists=True,
+        dir_okay=False,
+        help="Build all targets of a JSON or TOML manifest instead of SOURCES",
+    ),
+    catalog: Optional[Path] = typer.Option(
+        None,
+        "--catalog",
+        dir_okay=False,
+        writable=True,
+        help="Also compile all languages into a binary catalog at this path",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        help="Cache parsed files and detected dialects in this directory",
+        file_okay=False,
+        writable=True,
+    ),
+    jobs: int = typer.Option(
+        1,
+        "-j",
+        "--jobs",
+        min=0,
+        help="Number of parallel jobs parsing and writing files. 0 uses all CPUs",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        is_flag=True,
+        help="Walk, parse and merge sources concurrently with bounded memory",
+    ),
+    low_memory: bool = typer.Option(
+        False,
+        "--low-memory",
+        is_flag=True,
+        help="Spill translations to temporary files instead of keeping them in memory."
+        " Identifiers are written in sorted order",
+    ),
+    watch_sources: bool = typer.Option(
+        False,
+        "--watch",
+        "-w",
+        is_flag=True,
+        help="Watch sources and regenerate files of changed languages",
+    ),
+    poll_interval: float = typer.Option(
+        1.0, "--poll-interval", min=0, help="Seconds between checking sources for changes"
+    ),
+    serve: Optional[str] = typer.Option(
+        None,
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="Keep sources parsed in memory and build on requests of babelbox-client",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        is_flag=True,
+        help="Print time spent per stage, source file and language",
+    ),
+    profile_json: Optional[Path] = typer.Option(
+        None, "--profile-json", dir_okay=False, help="Write profile as JSON to this file"
+    ),
+    memory_report: bool = typer.Option(
+        False,
+        "--memory-report",
+        is_flag=True,
+        help="Print peak and retained memory per stage and source file. Slows down parsing",
+    ),
+    strict: bool = typer.Option(
+        False,
+        "--strict",
+        is_flag=True,
+        help="Fail if an identifier is defined in more than one file",
+    ),
+    check: bool = typer.Option(
+        False,
+        "--check",
+        is_flag=True,
+        help="Don't write files. Fail if language files are out of date",
+    ),
     dry: bool = typer.Option(
         False, "--dry", help="Dry run. Don't generate any files", is_flag=True
     ),
@@ -88,9 +223,86 @@ def main(
         style="{",
     )
 
+    cache = ParseCache(cache_dir / "parsed") if cache_dir else None
+    dialect_detector = DialectDetector(cache_dir / "dialects.json" if cache_dir else None)
+    profiler = Profiler(memory_report) if profile or profile_json or memory_report else None
+    # List every missing translation with --verbose, otherwise only the first few per file
+    diagnostics = Diagnostics(None if verbose else 5)
+
+    def print_profile():
+        if profiler is not None:
+            if profile:
+                typer.echo(profiler.summary(), err=True)
+            elif memory_report:
+                typer.echo(profiler.memory_summary(), err=True)
+            if profile_json:
+                profiler.dump(profile_json)
+
+    if manifest:
+        if sources or out or watch_sources or serve or low_memory or stream:
+            typer.secho(
+                "--manifest can't be combined with SOURCES, --out, --watch, --serve,"
+                " --low-memory or --stream",
+                err=True,
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+        # Parsing and output options are set per target or in the defaults of the manifest
+        target_options = {
+            "--prefix-identifiers": prefix_identifiers,
+            "--dialect": dialect,
+            "--delimiter": delimiter,
+            "--quotechar": quotechar,
+            "--indent": indent != "\t",
+            "--minify": minify,
+            "--include": include,
+            "--exclude": exclude,
+            "--catalog": catalog,
+        }
+        if given := [name for name, value in target_options.items() if value]:
+            typer.secho(
+                f"--manifest can't be combined with {', '.join(given)}."
+                " Set them in the defaults or targets of the manifest instead",
+                err=True,
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+        build_manifest(
+            manifest,
+            cache,
+            jobs,
+            dialect_detector,
+            profiler,
+            diagnostics,
+            skip_unchanged,
+            strict,
+            dry,
+            check,
+            verbose,
+        )
+        print_profile()
+        return
+
+    if not sources:
+        ctx.fail("Missing argument 'SOURCES...'.")
+
+    # Sources inside of archives don't exist on disk, so they are checked here instead of by click
+    for src in sources:
+        if not src.exists() and split_archive_path(src) is None:
+            ctx.fail(f"Invalid value for 'SOURCES...': Path {str(src)!r} does not exist.")
+
+    if out is not None and out.is_file() and split_output_path(out) is None:
+        ctx.fail(f"Invalid value for '-o' / '--out': Directory {str(out)!r} is a file.")
+
     if out is None:
         if len(sources) == 1:
-            out = sources[0] if sources[0].is_dir() else sources[0].parent
+            if (split := split_archive_path(sources[0])) is not None:
+                # Languages of an archive are written next to it
+                out = split[0].parent
+            else:
+                out = sources[0] if sources[0].is_dir() else sources[0].parent
         else:
             typer.secho(
                 "Multiple sources but no output specified", err=True, fg=typer.colors.RED
@@ -103,18 +315,288 @@ def main(
     if quotechar:
         csv_dialect_overwrites["quotechar"] = quotechar
 
-    languages = merge_languages(
-        map(
-            lambda src: load_languages(
-                src,
-                prefix_identifiers,
-                dialect=dialect.value if dialect else None,
-                csv_dialect_overwrites=csv_dialect_overwrites,
-            ),
+    walker = FileWalker(include or DEFAULT_INCLUDE, [*DEFAULT_EXCLUDE, *exclude])
+
+    dest: Path = out
+    output_indent = indent if not minify else None
+
+    def walk_files() -> List[Tuple[Path, str]]:
+        with profiling.stage(profiler, "walk"):
+            return [
+                f for src in sources for f in find_csv_files(src, prefix_identifiers, walker)
+            ]
+
+    # Builds with the same fingerprint produce the same files and pass the same checks. Only
+    # stored with --cache-dir, per output
+    fingerprint_path = fingerprint_file(cache_dir, dest) if cache_dir else None
+    settings = [
+        babelbox.__version__,
+        dialect.value if dialect else None,
+        csv_dialect_overwrites,
+        output_indent,
+        strict,
+        str(catalog) if catalog else None,
+    ]
+
+    def write(languages: Dict[str, Mapping[str, str]]):
+        if not dry:
+            make_output_dir(dest)
+            write_language_files(
+                dest,
+                languages,
+                output_indent,
+                skip_unchanged=skip_unchanged,
+                jobs=jobs,
+                profiler=profiler,
+            )
+
+    def compile_catalog(languages: Dict[str, Mapping[str, str]]):
+        if catalog and not dry:
+            with profiling.stage(profiler, "compile"):
+                catalog.parent.mkdir(parents=True, exist_ok=True)
+                write_catalog(catalog, languages)
+
+    if check and (watch_sources or serve or low_memory):
+        typer.secho(
+            "--check can't be combined with --watch, --serve or --low-memory",
+            err=True,
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    if low_memory:
+        if watch_sources or serve or catalog or strict:
+            typer.secho(
+                "--low-memory can't be combined with --watch, --serve, --catalog or --strict",
+                err=True,
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+        if split_output_path(dest) is not None:
+            typer.secho(
+                "--low-memory can't write into zip archives", err=True, fg=typer.colors.RED
+            )
+            raise typer.Exit(code=1)
+
+        if not dry:
+            dest.mkdir(parents=True, exist_ok=True)
+            try:
+                write_language_files_external(
+                    walk_files(),
+                    dest,
+                    output_indent,
+                    dialect=dialect.value if dialect else None,
+                    dialect_overwrites=csv_dialect_overwrites,
+                    dialect_detector=dialect_detector,
+                    diagnostics=diagnostics,
+                    skip_unchanged=skip_unchanged,
+                    profiler=profiler,
+                )
+            except ValueError as e:
+                typer.secho(str(e), err=True, fg=typer.colors.RED)
+                raise typer.Exit(code=1)
+            dialect_detector.save()
+            diagnostics.report(logger)
+        print_profile()
+        return
+
+    if watch_sources or serve:
+        # Incremental builds neither check collisions nor profile, and always keep files parsed
+        unsupported = {
+            "--strict": strict,
+            "--stream": stream,
+            "--profile": profile,
+            "--profile-json": profile_json,
+            "--memory-report": memory_report,
+        }
+        if given := [name for name, value in unsupported.items() if value]:
+            typer.secho(
+                f"--watch and --serve can't be combined with {', '.join(given)}",
+                err=True,
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+        build = IncrementalBuild(
             sources,
+            prefix_identifiers,
+            dialect=dialect.value if dialect else None,
+            csv_dialect_overwrites=csv_dialect_overwrites,
+            cache=cache,
+            jobs=jobs,
+            dialect_detector=dialect_detector,
+            walker=walker,
         )
+
+    if serve:
+        # http.server is only imported when serving, to keep startup fast
+        from .server import BuildServer, parse_address
+        from .server import serve as serve_builds
+
+        try:
+            address = parse_address(serve)
+        except ValueError:
+            typer.secho(f"Invalid address {serve!r}", err=True, fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+
+        server = BuildServer(
+            build,
+            dest,
+            output_indent,
+            skip_unchanged=skip_unchanged,
+            catalog=catalog,
+            jobs=jobs,
+        )
+        serve_builds(server, address)
+        dialect_detector.save()
+        return
+
+    if watch_sources:
+        typer.echo("Watching sources for changes. Press Ctrl+C to stop")
+
+        def on_change(languages: Dict[str, Mapping[str, str]]):
+            write(languages)
+            compile_catalog(build.resolved_languages())
+
+        watch(build, on_change, poll_interval)
+        dialect_detector.save()
+        return
+
+    load_files_or_stream: Callable[..., Iterable[LoadedFile]] = load_files
+    if stream:
+        load_files_or_stream = stream_files
+
+    load = partial(
+        load_files_or_stream,
+        dialect=dialect.value if dialect else None,
+        dialect_overwrites=csv_dialect_overwrites,
+        cache=cache,
+        jobs=jobs,
+        dialect_detector=dialect_detector,
+        profiler=profiler,
+        diagnostics=diagnostics,
     )
 
-    if not dry:
-        out.mkdir(parents=True, exist_ok=True)
-        write_language_files(out, languages, indent if not minify else None)
+    files: Optional[List[Tuple[Path, str]]] = None
+    if check:
+        files = walk_files()
+        if fingerprint_path and read_fingerprint(fingerprint_path) == fingerprint(
+            files, dest, settings
+        ):
+            # Nothing changed since the last build or check, so there is nothing to parse
+            typer.echo("Language files are up to date")
+            print_profile()
+            return
+
+    loaded: Iterable[LoadedFile]
+    if stream and files is None:
+        # Files are merged while later files are still being walked and parsed
+        loaded = load(
+            f for src in sources for f in iter_csv_files(src, prefix_identifiers, walker)
+        )
+    else:
+        if files is None:
+            files = walk_files()
+        loaded = load(files)
+
+    # Merge all files of all sources at once, in the order they were found in
+    merger = MergeEngine()
+    with profiling.stage(profiler, "stream" if stream else "merge"):
+        for f in loaded:
+            merger.add(f.path, f.languages, f.line_numbers, f.parents)
+
+    dialect_detector.save()
+    diagnostics.report(logger)
+
+    if merger.collisions:
+        merger.report_collisions(logging.ERROR if strict else logging.WARNING)
+        if strict:
+            typer.secho(
+                f"Found {len(merger.collisions)} duplicate identifiers",
+                err=True,
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
+    languages = merger.resolved_languages()
+    if check:
+        with profiling.stage(profiler, "check"):
+            diffs = diff_language_files(dest, languages, output_indent)
+
+        for diff in diffs.values():
+            for message in diff.messages(None if verbose else 5):
+                typer.echo(message)
+
+        if diffs:
+            typer.secho(
+                f"{len(diffs)} language files are out of date", err=True, fg=typer.colors.RED
+            )
+            raise typer.Exit(code=1)
+
+        typer.echo("Language files are up to date")
+    else:
+        write(languages)
+        compile_catalog(languages)
+
+    if fingerprint_path and not dry:
+        if files is None:
+            files = walk_files()
+        write_fingerprint(fingerprint_path, fingerprint(files, dest, settings))
+
+    print_profile()
+
+
+def build_manifest(
+    path: Path,
+    cache: Optional[ParseCache],
+    jobs: int,
+    dialect_detector: DialectDetector,
+    profiler: Optional[Profiler],
+    diagnostics: Diagnostics,
+    skip_unchanged: bool,
+    strict: bool,
+    dry: bool,
+    check: bool,
+    verbose: bool,
+):
+    try:
+        targets = load_manifest(path)
+    except ValueError as e:
+        typer.secho(str(e), err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    mergers = load_targets(targets, cache, jobs, dialect_detector, profiler, diagnostics)
+    dialect_detector.save()
+    diagnostics.report(logger)
+
+    collisions = 0
+    for merger in mergers.values():
+        if merger.collisions:
+            merger.report_collisions(logging.ERROR if strict else logging.WARNING)
+            collisions += len(merger.collisions)
+
+    if strict and collisions:
+        typer.secho(f"Found {collisions} duplicate identifiers", err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    languages = {name: merger.resolved_languages() for name, merger in mergers.items()}
+    if check:
+        stale = 0
+        with profiling.stage(profiler, "check"):
+            for target in targets:
+                diffs = diff_language_files(target.out, languages[target.name], target.indent)
+                for diff in diffs.values():
+                    for message in diff.messages(None if verbose else 5):
+                        typer.echo(f"{target.name}: {message}")
+                stale += len(diffs)
+
+        if stale:
+            typer.secho(
+                f"{stale} language files are out of date", err=True, fg=typer.colors.RED
+            )
+            raise typer.Exit(code=1)
+
+        typer.echo("Language files are up to date")
+    elif not dry:
+        write_targets(targets, languages, skip_unchanged, jobs, profiler)
@@ -0,0 +1,75 @@
+"""
+Sends requests to a running `babelbox --serve`.
+
+    $ babelbox-client build                      # Write languages that changed
+    $ babelbox-client check -a 127.0.0.1:8737    # Exit with 1 if files are out of date
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from .server import DEFAULT_HOST, DEFAULT_PORT, parse_address
+
+__all__ = ["request", "main"]
+
+COMMANDS = ("build", "check", "shutdown")
+
+
+def request(
+    command: str,
+    address: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+    timeout: Optional[float] = None,
+) -> dict:
+    """ Sends a command to the server at `address` and returns its response """
+
+    host, port = parse_address(address)
+    req = Request(f"http://{host}:{port}/{command}", data=b"", method="POST")
+    try:
+        with urlopen(req, timeout=timeout) as response:
+            return json.load(response)
+    except HTTPError as e:
+        raise RuntimeError(json.load(e).get("error", str(e))) from None
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument(
+        "-a", "--address", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}", help="[HOST:]PORT"
+    )
+    parser.add_argument("--timeout", type=float, help="Seconds to wait for the server")
+    parser.add_argument("--json", action="store_true", help="Print the response as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        response = request(args.command, args.address, args.timeout)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"babelbox-client: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    elif args.command == "build":
+        print(
+            f"Wrote {len(response['written'])} language files, skipped"
+            f" {len(response['skipped'])} in {response['seconds'] * 1000:.2f} ms"
+        )
+    elif args.command == "check":
+        for message in response["messages"]:
+            print(message)
+        print(
+            f"{len(response['stale'])} language files out of date"
+            f" ({response['seconds'] * 1000:.2f} ms)"
+        )
+
+    return 1 if args.command == "check" and response["stale"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterator, Mapping, Optional
+
+__all__ = ["Diagnostics", "FileDiagnostics"]
+
+
+class FileDiagnostics:
+    """ Missing translations and identifiers found in one csv file """
+
+    __slots__ = (
+        "path",
+        "languages",
+        "rows",
+        "missing",
+        "examples",
+        "missing_identifiers",
+        "max_examples",
+    )
+
+    def __init__(self, path, max_examples: Optional[int] = 5):
+        self.path = path
+        self.languages: list[str] = []
+        self.rows = 0
+        self.missing: dict[str, int] = {}
+        self.examples: dict[str, list[str]] = {}
+        self.missing_identifiers: list[int] = []
+        self.max_examples = max_examples
+
+    def missing_translation(self, language_code: str, identifier: str):
+        count = self.missing[language_code] = self.missing.get(language_code, 0) + 1
+        if self.max_examples is None or count <= self.max_examples:
+            self.examples.setdefault(language_code, []).append(identifier)
+
+    def missing_identifier(self, line: int):
+        self.missing_identifiers.append(line)
+
+    def count(self, languages: Mapping[str, Mapping[str, str]]):
+        """ Records the empty translations of languages that were already parsed """
+
+        self.languages = list(languages)
+        identifiers: set[str] = set()
+        for code, translations in languages.items():
+            identifiers.update(translations)
+            for identifier, translation in translations.items():
+                if not translation:
+                    self.missing_translation(code, identifier)
+        self.rows = len(identifiers)
+
+    def coverage(self) -> dict[str, float]:
+        """ Returns the share of translated identifiers of each language """
+
+        return {
+            code: (self.rows - self.missing.get(code, 0)) / self.rows if self.rows else 1.0
+            for code in self.languages
+        }
+
+    def messages(self, max_examples: Optional[int] = None) -> Iterator[str]:
+        for line in self.missing_identifiers:
+            yield f"{self.path!r}@{line}: Non-empty line is missing identifier"
+
+        for code, examples in self.examples.items():
+            shown = examples if max_examples is None else examples[:max_examples]
+            for identifier in shown:
+                yield f"{self.path!r}: Locale {code!r} has no translation for {identifier!r}"
+            if (more := self.missing[code] - len(shown)) > 0:
+                yield (
+                    f"{self.path!r}: Locale {code!r} has no translation for {more} more"
+                    " identifiers"
+                )
+
+
+class Diagnostics:
+    """
+    Collects missing translations and identifiers while parsing, instead of logging every cell.
+
+    Missing cells are counted per file and language. Only the first `max_examples` identifiers
+    of each are kept (`None` keeps all). Messages are only rendered when asked for with
+    `messages`, `report` or `summary`.
+    """
+
+    def __init__(self, max_examples: Optional[int] = 5):
+        self.max_examples = max_examples
+        self.files: dict[object, FileDiagnostics] = {}
+
+    def file(self, path) -> FileDiagnostics:
+        """ Starts collecting the diagnostics of a file, replacing earlier results for it """
+
+        diagnostics = self.files[path] = FileDiagnostics(path, self.max_examples)
+        return diagnostics
+
+    def update(self, other: Diagnostics):
+        self.files.update(other.files)
+
+    @property
+    def missing(self) -> int:
+        return sum(sum(f.missing.values()) for f in self.files.values())
+
+    def coverage(self) -> dict[str, dict[str, float]]:
+        """ Returns the share of translated identifiers of each file and language """
+
+        return {str(f.path): f.coverage() for f in self.files.values()}
+
+    def language_coverage(self) -> dict[str, float]:
+        """ Returns the share of translated identifiers of each language across all files """
+
+        rows: dict[str, int] = {}
+        missing: dict[str, int] = {}
+        for f in self.files.values():
+            for code in f.languages:
+                rows[code] = rows.get(code, 0) + f.rows
+                missing[code] = missing.get(code, 0) + f.missing.get(code, 0)
+
+        return {code: (n - missing[code]) / n if n else 1.0 for code, n in rows.items()}
+
+    def messages(self, max_examples: Optional[int] = None) -> Iterator[str]:
+        for f in self.files.values():
+            yield from f.messages(max_examples)
+
+    def report(
+        self,
+        logger: logging.Logger,
+        level=logging.WARNING,
+        max_examples: Optional[int] = None,
+    ):
+        """ Logs the collected messages, if `logger` is enabled for `level` """
+
+        if logger.isEnabledFor(level):
+            for message in self.messages(max_examples):
+                logger.log(level, message)
+
+    def summary(self, max_examples: Optional[int] = 3) -> str:
+        lines = ["Coverage:"]
+        for code, coverage in sorted(self.language_coverage().items(), key=lambda c: c[1]):
+            lines.append(f"  {code:<12} {coverage:8.2%}")
+
+        lines.append(f"Missing translations ({self.missing}):")
+        lines.extend(f"  {message}" for message in self.messages(max_examples))
+        return "\n".join(lines)
+
+    def to_json(self):
+        return {
+            "coverage": self.language_coverage(),
+            "files": [
+                {
+                    "path": str(f.path),
+                    "rows": f.rows,
+                    "coverage": f.coverage(),
+                    "missing": f.missing,
+                    "examples": f.examples,
+                    "missing_identifiers": f.missing_identifiers,
+                }
+                for f in self.files.values()
+            ],
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Type, Union
+
+from .archive import open_text
+
+__all__ = ["DialectDetector", "DetectedDialect", "sniff", "describe"]
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 1024
+
+_ATTRIBUTES = (
+    "delimiter",
+    "quotechar",
+    "escapechar",
+    "doublequote",
+    "skipinitialspace",
+    "lineterminator",
+    "quoting",
+)
+
+
+class DetectedDialect(csv.Dialect):
+    """ Picklable dialect created from the attributes of a detected dialect """
+
+    def __init__(self, **attributes):
+        for attr, value in attributes.items():
+            setattr(self, attr, value)
+        super().__init__()
+
+    def __repr__(self):
+        return f"DetectedDialect({describe(self)})"
+
+
+def sniff(sample: str) -> Type[csv.Dialect]:
+    """ Sniffs the dialect of a csv sample. Falls back to excel if sniffing fails """
+
+    try:
+        return csv.Sniffer().sniff(sample)
+    except Exception:
+        return csv.excel
+
+
+def describe(dialect) -> str:
+    return f"delimiter={dialect.delimiter!r}, quotechar={dialect.quotechar!r}"
+
+
+def _attributes(dialect) -> dict:
+    return {attr: getattr(dialect, attr) for attr in _ATTRIBUTES}
+
+
+class DialectDetector:
+    """
+    Detects csv dialects and remembers them per header signature and per directory.
+
+    Files with a header that was seen before reuse its dialect without being sniffed. If sniffing
+    a file fails, the dialect last detected in the same directory is used instead of excel.
+    If a `path` is passed, detected dialects are loaded from and saved to it.
+    """
+
+    def __init__(self, path: Optional[Union[str, os.PathLike]] = None):
+        self.path = Path(path) if path else None
+        self._headers: dict[str, dict] = {}
+        self._directories: dict[str, dict] = {}
+        self._dialects: dict[str, DetectedDialect] = {}
+
+        if self.path is not None:
+            self._load()
+
+    def detect_file(self, path: Union[str, os.PathLike]) -> DetectedDialect:
+        with open_text(path) as f:
+            return self.detect(path, f.read(SAMPLE_SIZE))
+
+    def detect(self, path: Union[str, os.PathLike], sample: str) -> DetectedDialect:
+        header = sample.split("\n", 1)[0]
+        signature = hashlib.sha1(header.encode("utf8")).hexdigest()
+        directory = str(Path(path).parent.absolute())
+
+        if signature in self._headers:
+            attributes = self._headers[signature]
+        else:
+            try:
+                attributes = _attributes(csv.Sniffer().sniff(sample))
+            except Exception:
+                attributes = self._directories.get(directory, _attributes(csv.excel))
+                logger.info(f"{str(path)!r}: Could not detect dialect")
+            else:
+                self._headers[signature] = attributes
+            self._directories[directory] = attributes
+
+        dialect = self._dialect(attributes)
+        logger.info(f"{str(path)!r}: Using dialect {describe(dialect)}")
+        return dialect
+
+    def save(self):
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf8") as f:
+            json.dump({"headers": self._headers, "directories": self._directories}, f)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf8") as f:  # type: ignore
+                data = json.load(f)
+            self._headers = data["headers"]
+            self._directories = data["directories"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _dialect(self, attributes: dict):
+        key = json.dumps(attributes, sort_keys=True)
+        if (dialect := self._dialects.get(key)) is None:
+            dialect = self._dialects[key] = DetectedDialect(**attributes)
+        return dialect
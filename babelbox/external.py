@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import filecmp
+import heapq
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from . import profiling
+from .diagnostics import Diagnostics
+from .dialects import DialectDetector
+from .parser import DialectLike, WriteResult, open_csv, read_sheet
+from .profiling import Profiler
+
+__all__ = ["write_language_files_external"]
+
+logger = logging.getLogger(__name__)
+
+# Number of translations buffered in memory before they are spilled to disk
+DEFAULT_RUN_SIZE = 100_000
+# Maximum number of runs merged at once. More runs are first merged into larger runs
+MAX_FAN_IN = 64
+
+# identifier, sequence number, translation
+Entry = Tuple[str, int, str]
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def write_language_files_external(
+    files: Iterable[tuple[Path, str]],
+    dest_dir: Union[str, os.PathLike],
+    indent: Optional[str] = None,
+    dialect: Optional[DialectLike] = None,
+    dialect_overwrites: Optional[dict] = None,
+    dialect_detector: Optional[DialectDetector] = None,
+    diagnostics: Optional[Diagnostics] = None,
+    skip_unchanged: bool = False,
+    run_size: int = DEFAULT_RUN_SIZE,
+    temp_dir: Optional[Union[str, os.PathLike]] = None,
+    profiler: Optional[Profiler] = None,
+) -> WriteResult:
+    """
+    Loads the (path, prefix) pairs returned by `find_csv_files` and writes a `<language code>.json`
+    file for each language, with memory bounded by `run_size` instead of the size of the sources.
+
+    Rows are streamed from the files. Whenever `run_size` translations are buffered, the buffer of
+    each language is sorted by identifier and spilled to a run file in `temp_dir`. The runs of
+    each language are then k-way merged straight into its language file. Identifiers are written
+    in sorted order. Like `merge_languages`, later files and rows override earlier ones.
+    """
+
+    if diagnostics is None:
+        report_diagnostics = diagnostics = Diagnostics()
+    else:
+        report_diagnostics = None
+
+    buffers: dict[str, list[Entry]] = {}
+    runs: dict[str, list[Path]] = {}
+    result = WriteResult([], [])
+
+    with tempfile.TemporaryDirectory(prefix="babelbox-", dir=temp_dir) as run_dir:
+
+        def spill():
+            for code, buffer in buffers.items():
+                if buffer:
+                    buffer.sort()
+                    runs.setdefault(code, []).append(_write_run(run_dir, buffer))
+                    buffer.clear()
+
+        with profiling.stage(profiler, "parse"):
+            buffered = 0
+            sequence = 0
+            for path, prefix in files:
+                start = time.perf_counter()
+                report = diagnostics.file(path)
+                with open_csv(path, dialect, dialect_overwrites, dialect_detector) as reader:
+                    parents: dict[str, str] = {}
+                    codes, indices, sheet = read_sheet(reader, prefix, report, parents)
+                    if parents:
+                        raise ValueError(
+                            f"'{path}': Languages that inherit from a parent language can't be"
+                            " written with low memory"
+                        )
+                    targets = [
+                        (buffers.setdefault(code, []), j, code)
+                        for code, j in zip(codes, indices)
+                    ]
+
+                    for identifier, row in sheet:
+                        for buffer, j, code in targets:
+                            if not (translation := row[j]):
+                                report.missing_translation(code, identifier)
+                                translation = ""
+                            buffer.append((identifier, sequence, translation))
+
+                        sequence += 1
+                        buffered += len(targets)
+                        if buffered >= run_size:
+                            spill()
+                            buffered = 0
+
+                if profiler is not None:
+                    profiler.files.append(
+                        profiling.FileProfile(
+                            str(path),
+                            time.perf_counter() - start,
+                            profiling.source_size(path),
+                            report.rows,
+                            len(codes),
+                        )
+                    )
+
+        if report_diagnostics is not None:
+            report_diagnostics.report(logger)
+
+        with profiling.stage(profiler, "write"):
+            for code in list(buffers):
+                buffer = sorted(buffers.pop(code))
+                code_runs = runs.get(code, [])
+                if not code_runs and not buffer:
+                    continue
+
+                # Merge runs into larger runs until they can be merged at once
+                while len(code_runs) > MAX_FAN_IN:
+                    merged = _merge(map(_read_run, code_runs[:MAX_FAN_IN]))
+                    code_runs = [*code_runs[MAX_FAN_IN:], _write_run(run_dir, merged)]
+
+                start = time.perf_counter()
+                path = Path(dest_dir, code + ".json")
+                translations = _merge([*map(_read_run, code_runs), iter(buffer)])
+                size, entries, written = _write_json(
+                    path, translations, indent, skip_unchanged
+                )
+                (result.written if written else result.skipped).append(path)
+
+                if profiler is not None:
+                    elapsed = time.perf_counter() - start
+                    profiler.record_language(code, elapsed, size, entries, written)
+
+    logger.info(f"Wrote {len(result.written)} language files, skipped {len(result.skipped)}")
+    return result
+
+
+def _write_run(directory: str, entries: Iterable[Entry]) -> Path:
+    fd, name = tempfile.mkstemp(".run", dir=directory)
+    with open(fd, "w", encoding="utf8") as f:
+        for entry in entries:
+            f.write(_encode(entry))
+            f.write("\n")
+    return Path(name)
+
+
+def _read_run(path: Path) -> Iterator[Entry]:
+    with open(path, encoding="utf8") as f:
+        for line in f:
+            identifier, sequence, translation = json.loads(line)
+            yield identifier, sequence, translation
+
+
+def _merge(runs: Iterable[Iterator[Entry]]) -> Iterator[Entry]:
+    """ Merges sorted runs. Of entries with the same identifier, only the last one is kept """
+
+    previous: Optional[Entry] = None
+    for entry in heapq.merge(*runs):
+        if previous is not None and previous[0] != entry[0]:
+            yield previous
+        previous = entry
+
+    if previous is not None:
+        yield previous
+
+
+def _write_json(
+    path: Path, entries: Iterable[Entry], indent: Optional[str], skip_unchanged: bool
+):
+    """
+    Writes entries like `json.dump` writes a dict of them. Returns the size of the file, the number
+    of entries and whether the file was written
+    """
+
+    if indent is None:
+        first, separator, last = "{", ", ", "}"
+    else:
+        first, separator, last = "{\n" + indent, ",\n" + indent, "\n}"
+
+    entries_written = 0
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf8") as f:
+        for identifier, _, translation in entries:
+            f.write(separator if entries_written else first)
+            f.write(_encode(identifier))
+            f.write(": ")
+            f.write(_encode(translation))
+            entries_written += 1
+
+        f.write(last if entries_written else "{}")
+        size = f.tell()
+
+    if skip_unchanged and path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return size, entries_written, False
+
+    logger.info(f"Writing language file {path!r}")
+    os.replace(tmp_path, path)
+    return size, entries_written, True
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+from collections import ChainMap
+from typing import Iterable, Mapping, Optional
+
+__all__ = ["resolve_languages", "dependents", "materialize", "split_language_code"]
+
+logger = logging.getLogger(__name__)
+
+PARENT_SEPARATOR = ":"
+
+
+def split_language_code(header: str) -> tuple[str, Optional[str]]:
+    """ Splits a column header like `en_gb:en_us` into the language code and its parent """
+
+    code, separator, parent = header.partition(PARENT_SEPARATOR)
+    return code, parent if separator and parent else None
+
+
+def resolve_languages(
+    languages: Mapping[str, Mapping[str, str]], parents: Mapping[str, str]
+) -> dict[str, Mapping[str, str]]:
+    """
+    Resolves the languages that inherit from a parent language.
+
+    Inheriting languages only store the translations that differ from their parent. Each one is
+    resolved to a `ChainMap` of its own translations and those of its ancestors, so lookups fall
+    back to the parent lazily and nothing is copied until the language is written. Identifiers are
+    ordered like those of the root language, followed by the ones only its descendants define.
+    Unknown parents and cycles are logged and end the chain.
+    """
+
+    resolved: dict[str, Mapping[str, str]] = {}
+    for code, translations in languages.items():
+        chain = [translations]
+        seen = {code}
+        parent = parents.get(code)
+        while parent is not None:
+            if parent in seen:
+                logger.warning(f"Language {code!r} inherits from itself through {parent!r}")
+                break
+            if parent not in languages:
+                logger.warning(f"Language {code!r} inherits from unknown language {parent!r}")
+                break
+            seen.add(parent)
+            chain.append(languages[parent])
+            parent = parents.get(parent)
+
+        resolved[code] = ChainMap(*chain) if len(chain) > 1 else translations  # type: ignore
+    return resolved
+
+
+def dependents(parents: Mapping[str, str], language_codes: Iterable[str]) -> set[str]:
+    """ Returns the languages that inherit from any of `language_codes`, directly or not """
+
+    children: dict[str, list[str]] = {}
+    for code, parent in parents.items():
+        children.setdefault(parent, []).append(code)
+
+    found: set[str] = set()
+    pending = list(language_codes)
+    while pending:
+        for child in children.get(pending.pop(), ()):
+            if child not in found:
+                found.add(child)
+                pending.append(child)
+    return found
+
+
+def materialize(translations: Mapping[str, str]) -> dict[str, str]:
+    """ Copies resolved translations into a dict, folding chains from the root down """
+
+    if isinstance(translations, dict):
+        return translations
+    if isinstance(translations, ChainMap):
+        result: dict[str, str] = {}
+        for mapping in reversed(translations.maps):
+            result.update(mapping)
+        return result
+    return dict(translations)
@@ -1 +1,10 @@
-from . import beet
+import importlib
+
+# Integrations import their host tool, so they are only imported on first access
+_LAZY_SUBMODULES = ("beet",)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
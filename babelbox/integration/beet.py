@@ -1,8 +1,16 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
 from typing import Iterable, Optional
 
 from beet import Context, Language, Plugin
 
 import babelbox
+from babelbox.inheritance import materialize, resolve_languages
+from babelbox.walk import DEFAULT_EXCLUDE, DEFAULT_INCLUDE
+
+logger = logging.getLogger(__name__)
 
 
 def beet_default(ctx: Context):
@@ -16,29 +24,99 @@ def beet_default(ctx: Context):
         csv_dialect_overwrites["delimiter"] = delimiter
     prefix_identifiers = config.get("prefix_identifiers")
     dialect = config.get("dialect")
+    cache = config.get("cache", True)
+    jobs = config.get("jobs", 1)
+    include = config.get("include")
+    exclude = config.get("exclude", ())
 
-    ctx.require(create_babelbox_plugin(load, csv_dialect_overwrites, prefix_identifiers))
+    ctx.require(
+        create_babelbox_plugin(
+            load,
+            csv_dialect_overwrites,
+            prefix_identifiers,
+            dialect=dialect,
+            cache=cache,
+            jobs=jobs,
+            include=include,
+            exclude=exclude,
+        )
+    )
 
 
 def create_babelbox_plugin(
     load: Iterable[str] = (),
     csv_dialect_overwrites: Optional[dict] = None,
     prefix_identifiers: bool = False,
+    dialect: Optional[str] = None,
+    cache: bool = True,
+    jobs: Optional[int] = 1,
+    diagnostics: Optional[babelbox.Diagnostics] = None,
+    include: Optional[Iterable[str]] = None,
+    exclude: Iterable[str] = (),
 ) -> Plugin:
+    """
+    Creates a plugin that loads languages from the paths matching the `load` patterns.
+    Files matched by several patterns are only loaded once. All files are parsed as one batch by
+    `jobs` processes and merged into the resource pack at once.
+    With `cache`, parsed files and detected dialects are kept in the beet project cache, so
+    unchanged files are not parsed again on rebuilds.
+    Missing translations are collected in `diagnostics` and logged after loading.
+    Files in matched directories are selected with the `include` and `exclude` globs and
+    `.babelboxignore` files
+    """
+
+    walker = babelbox.FileWalker(include or DEFAULT_INCLUDE, [*DEFAULT_EXCLUDE, *exclude])
+
     def plugin(ctx: Context):
         minecraft = ctx.assets["minecraft"]
 
-        for pattern in load:
-            for path in ctx.directory.glob(pattern):
-                languages = babelbox.load_languages(
-                    path,
-                    prefix_identifiers,
-                    dialect=None,
-                    csv_dialect_overwrites=csv_dialect_overwrites,
-                )
+        if cache:
+            cache_dir = ctx.cache["babelbox"].directory
+            parse_cache = babelbox.ParseCache(cache_dir / "parsed")
+            dialect_detector = babelbox.DialectDetector(cache_dir / "dialects.json")
+        else:
+            parse_cache = None
+            dialect_detector = babelbox.DialectDetector()
+
+        collector = diagnostics if diagnostics is not None else babelbox.Diagnostics()
+        files = find_csv_files(ctx.directory, load, prefix_identifiers, walker)
+        loaded = babelbox.load_files(
+            files,
+            dialect,
+            csv_dialect_overwrites,
+            cache=parse_cache,
+            jobs=jobs,
+            dialect_detector=dialect_detector,
+            diagnostics=collector,
+        )
+        languages = babelbox.merge_languages(f.languages for f in loaded)
+        parents = {code: parent for f in loaded for code, parent in f.parents.items()}
+        resolved = resolve_languages(languages, parents)
 
-                minecraft.languages.merge(
-                    {code: Language(translations) for code, translations in languages.items()}
-                )
+        minecraft.languages.merge(
+            {
+                code: Language(materialize(translations))
+                for code, translations in resolved.items()
+            }
+        )
+
+        dialect_detector.save()
+        collector.report(logger)
 
     return plugin
+
+
+def find_csv_files(
+    directory: Path,
+    load: Iterable[str],
+    prefix_identifiers: bool,
+    walker: Optional[babelbox.FileWalker] = None,
+):
+    """ Resolves all `load` patterns and returns each csv file and identifier prefix once """
+
+    files: dict[tuple[Path, str], None] = {}
+    for pattern in load:
+        for path in directory.glob(pattern):
+            for file, prefix in babelbox.find_csv_files(path, prefix_identifiers, walker):
+                files.setdefault((file.resolve(), prefix))
+    return list(files)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional, Union
+
+from . import profiling
+from .archive import make_output_dir, split_archive_path
+from .cache import ParseCache
+from .catalog import write_catalog
+from .diagnostics import Diagnostics
+from .dialects import DialectDetector
+from .merge import MergeEngine
+from .parser import LoadedFile, WriteResult, find_csv_files, load_files, write_language_files
+from .profiling import Profiler
+from .walk import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, FileWalker
+
+__all__ = ["Target", "load_manifest", "load_targets", "write_targets"]
+
+logger = logging.getLogger(__name__)
+
+DIALECTS = ("excel", "excel-tab", "unix")
+
+# Options of a target and their types
+_OPTIONS: dict[str, type] = {
+    "name": str,
+    "sources": list,
+    "out": str,
+    "prefix_identifiers": bool,
+    "dialect": str,
+    "delimiter": str,
+    "quotechar": str,
+    "indent": str,
+    "minify": bool,
+    "include": list,
+    "exclude": list,
+    "catalog": str,
+}
+
+
+class Target(NamedTuple):
+    name: str
+    sources: list[Path]
+    out: Path
+    prefix_identifiers: bool = False
+    dialect: Optional[str] = None
+    dialect_overwrites: Optional[dict] = None
+    indent: Optional[str] = "\t"
+    include: tuple[str, ...] = DEFAULT_INCLUDE
+    exclude: tuple[str, ...] = ()
+    catalog: Optional[Path] = None
+
+
+def load_manifest(path: Union[str, os.PathLike]) -> list[Target]:
+    """
+    Reads the targets of a JSON or TOML manifest.
+
+    ```toml
+    [defaults]
+    prefix_identifiers = true
+
+    [[targets]]
+    name = "survival"
+    sources = ["shared/ui", "survival/lang"]
+    out = "build/survival/assets/minecraft/lang"
+    ```
+
+    Each target needs `sources` and `out`. Targets can set `prefix_identifiers`, `dialect`,
+    `delimiter`, `quotechar`, `indent`, `minify`, `include`, `exclude` and `catalog`, and inherit
+    all of them from `defaults`. Relative paths are relative to the folder of the manifest.
+    Sources must exist and targets can't share an output folder.
+    """
+
+    path = Path(path)
+    if path.suffix == ".toml":
+        data = _load_toml(path)
+    else:
+        data = json.loads(path.read_text("utf8"))
+
+    if not isinstance(data, dict) or not isinstance(data.get("targets"), list):
+        raise ValueError(f"'{path}': Manifest has no list of targets")
+
+    defaults = data.get("defaults", {})
+    targets = []
+    names = set()
+    outputs: dict[Path, str] = {}
+    for i, entry in enumerate(data["targets"]):
+        options = {**defaults, **entry}
+        name = options.get("name", options.get("out", f"targets[{i}]"))
+        target = _parse_target(options, name, path.parent, f"'{path}': Target {name!r}")
+        if target.name in names:
+            raise ValueError(f"'{path}': Target {name!r} is defined more than once")
+        names.add(target.name)
+
+        # Targets are written concurrently, so they would overwrite each other's files
+        out = Path(os.path.abspath(target.out))
+        if out in outputs:
+            raise ValueError(
+                f"'{path}': Targets {outputs[out]!r} and {name!r} write into the same folder"
+            )
+        outputs[out] = target.name
+        targets.append(target)
+
+    return targets
+
+
+def _load_toml(path: Path):
+    try:
+        import tomllib  # type: ignore
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore
+        except ImportError:
+            raise ValueError(
+                f"'{path}': Reading TOML manifests requires Python 3.11 or tomli"
+            ) from None
+
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def _parse_target(options: dict, name: str, base: Path, context: str):
+    for key, value in options.items():
+        if key not in _OPTIONS:
+            raise ValueError(f"{context}: Unknown option {key!r}")
+        if not isinstance(value, _OPTIONS[key]):
+            raise ValueError(f"{context}: {key!r} must be of type {_OPTIONS[key].__name__}")
+
+    for key in ("sources", "out"):
+        if key not in options:
+            raise ValueError(f"{context}: Missing {key!r}")
+
+    if (dialect := options.get("dialect")) is not None and dialect not in DIALECTS:
+        raise ValueError(f"{context}: 'dialect' must be one of {', '.join(DIALECTS)}")
+
+    sources = [base / src for src in options["sources"]]
+    for src in sources:
+        if not src.exists() and split_archive_path(src) is None:
+            raise ValueError(f"{context}: Source '{src}' does not exist")
+
+    dialect_overwrites = {}
+    for key in ("delimiter", "quotechar"):
+        if key in options:
+            dialect_overwrites[key] = options[key]
+
+    catalog = options.get("catalog")
+    return Target(
+        name,
+        sources,
+        base / options["out"],
+        options.get("prefix_identifiers", False),
+        dialect,
+        dialect_overwrites,
+        None if options.get("minify") else options.get("indent", "\t"),
+        tuple(options.get("include") or DEFAULT_INCLUDE),
+        tuple(options.get("exclude", ())),
+        base / catalog if catalog is not None else None,
+    )
+
+
+def load_targets(
+    targets: list[Target],
+    cache: Optional[ParseCache] = None,
+    jobs: Optional[int] = 1,
+    dialect_detector: Optional[DialectDetector] = None,
+    profiler: Optional[Profiler] = None,
+    diagnostics: Optional[Diagnostics] = None,
+) -> dict[str, MergeEngine]:
+    """
+    Loads and merges the languages of each target.
+
+    Files used by more than one target are only parsed once. Identifiers are prefixed per target
+    after parsing, so a file is shared even if targets prefix its identifiers differently. All
+    files are parsed in one batch, by `jobs` processes.
+    """
+
+    with profiling.stage(profiler, "walk"):
+        target_files = [
+            [
+                (path, prefix)
+                for src in target.sources
+                for path, prefix in find_csv_files(
+                    src,
+                    target.prefix_identifiers,
+                    FileWalker(target.include, [*DEFAULT_EXCLUDE, *target.exclude]),
+                )
+            ]
+            for target in targets
+        ]
+
+    # Files with the same dialect options are loaded together
+    batches: dict[tuple, list[Path]] = {}
+    for target, files in zip(targets, target_files):
+        batch = batches.setdefault(_dialect_key(target), [])
+        batch.extend(path.resolve() for path, _ in files)
+
+    loaded: dict[tuple, LoadedFile] = {}
+    for key, paths in batches.items():
+        paths = list(dict.fromkeys(paths))
+        results = load_files(
+            [(path, "") for path in paths],
+            key[0],
+            dict(key[1]),
+            cache=cache,
+            jobs=jobs,
+            dialect_detector=dialect_detector,
+            profiler=profiler,
+            diagnostics=diagnostics,
+        )
+        loaded.update(((key, path), result) for path, result in zip(paths, results))
+
+    merged = {}
+    with profiling.stage(profiler, "merge"):
+        for target, files in zip(targets, target_files):
+            key = _dialect_key(target)
+            merger = merged[target.name] = MergeEngine()
+            for path, prefix in files:
+                _, languages, line_numbers, parents = loaded[key, path.resolve()]
+                if prefix:
+                    languages = {
+                        code: {
+                            prefix + identifier: t for identifier, t in translations.items()
+                        }
+                        for code, translations in languages.items()
+                    }
+                    line_numbers = {prefix + i: line for i, line in line_numbers.items()}
+                merger.add(path, languages, line_numbers, parents)
+
+    return merged
+
+
+def _dialect_key(target: Target):
+    return target.dialect, tuple(sorted((target.dialect_overwrites or {}).items()))
+
+
+def write_targets(
+    targets: list[Target],
+    languages: Mapping[str, Mapping[str, Mapping[str, str]]],
+    skip_unchanged=False,
+    jobs: Optional[int] = 1,
+    profiler: Optional[Profiler] = None,
+) -> dict[str, WriteResult]:
+    """
+    Writes the resolved languages of each target, as returned by `load_targets`, into its output folder
+    and compiles its catalog. Targets are written in parallel by `jobs` threads
+    """
+
+    def write(target: Target):
+        make_output_dir(target.out)
+        target_languages = languages[target.name]
+        result = write_language_files(
+            target.out, target_languages, target.indent, skip_unchanged
+        )
+        if target.catalog is not None:
+            target.catalog.parent.mkdir(parents=True, exist_ok=True)
+            write_catalog(target.catalog, target_languages)
+        return result
+
+    with profiling.stage(profiler, "write"), ThreadPoolExecutor(jobs or None) as executor:
+        return {
+            target.name: result
+            for target, result in zip(targets, executor.map(write, targets))
+        }
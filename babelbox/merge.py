@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections import defaultdict
+from typing import Iterator, Mapping, NamedTuple, Optional, Union
+
+from .inheritance import resolve_languages
+
+__all__ = ["MergeEngine", "Origin", "Collision"]
+
+logger = logging.getLogger(__name__)
+
+_LINE_BITS = 32
+_LINE_MASK = (1 << _LINE_BITS) - 1
+
+
+class Origin(NamedTuple):
+    path: str
+    line: int
+
+    def __str__(self):
+        return f"{self.path!r}@{self.line}" if self.line else repr(self.path)
+
+
+class Collision(NamedTuple):
+    identifier: str
+    first: Origin
+    second: Origin
+
+    def __str__(self):
+        return f"{self.identifier!r} defined in {self.first} is overridden by {self.second}"
+
+
+class MergeEngine:
+    """
+    Merges the languages of many files in one pass and remembers where each translation came from.
+
+    The origin of each translation is packed into a single int (file index and line number), so
+    the index costs one dict entry per translation. Translations of the same language and
+    identifier defined in more than one file are recorded as collisions. Later files override earlier ones, like `merge_languages`.
+    Languages that inherit from a parent only hold the translations that differ from it until
+    they are resolved.
+    """
+
+    def __init__(self):
+        self.languages: dict[str, dict[str, str]] = defaultdict(dict)
+        self.parents: dict[str, str] = {}
+        self.files: list[str] = []
+        self.collisions: list[Collision] = []
+        # Packed origins by language code and identifier
+        self._origins: dict[str, dict[str, int]] = defaultdict(dict)
+
+    def add(
+        self,
+        path: Union[str, os.PathLike],
+        languages: Mapping[str, Mapping[str, str]],
+        line_numbers: Optional[Mapping[str, int]] = None,
+        parents: Optional[Mapping[str, str]] = None,
+    ):
+        file_index = len(self.files)
+        self.files.append(str(path))
+        line_numbers = line_numbers or {}
+        self.parents.update(parents or {})
+
+        # Identifiers are reported once per file, even if they override several languages
+        collided: set[str] = set()
+        for language_code, translations in languages.items():
+            origins = self._origins[language_code]
+            for identifier in translations:
+                origin = file_index << _LINE_BITS | line_numbers.get(identifier, 0)
+                previous = origins.get(identifier)
+                if previous is not None and previous >> _LINE_BITS != file_index:
+                    if identifier not in collided:
+                        collided.add(identifier)
+                        self.collisions.append(
+                            Collision(identifier, self._unpack(previous), self._unpack(origin))
+                        )
+                origins[identifier] = origin
+
+            self.languages[language_code].update(translations)
+
+    def resolved_languages(self) -> dict[str, Mapping[str, str]]:
+        """ Returns the languages with inheriting languages resolved, see `resolve_languages` """
+
+        return resolve_languages(self.languages, self.parents)
+
+    def origin(self, identifier: str, language_code: Optional[str] = None) -> Optional[Origin]:
+        """
+        Returns the file and line the current translation of `identifier` in `language_code` came
+        from. Without a language, returns where the identifier was last defined in any language
+        """
+
+        if language_code is not None:
+            packed = self._origins.get(language_code, {}).get(identifier)
+        else:
+            packed = max(
+                (o[identifier] for o in self._origins.values() if identifier in o),
+                default=None,
+            )
+        return self._unpack(packed) if packed is not None else None
+
+    def origins(self) -> Iterator[tuple[str, Origin]]:
+        """ Yields each identifier and where it was last defined in any language """
+
+        latest: dict[str, int] = {}
+        for origins in self._origins.values():
+            for identifier, packed in origins.items():
+                if packed > latest.get(identifier, -1):
+                    latest[identifier] = packed
+        for identifier, packed in latest.items():
+            yield identifier, self._unpack(packed)
+
+    def report_collisions(self, level=logging.WARNING):
+        for collision in self.collisions:
+            logger.log(level, f"Duplicate identifier: {collision}")
+
+    def _unpack(self, packed: int):
+        return Origin(self.files[packed >> _LINE_BITS], packed & _LINE_MASK)
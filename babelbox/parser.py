@@ -1,38 +1,191 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
-from . import utils
+from . import archive, dialects, profiling, utils
+from .cache import ParseCache
+from .diagnostics import Diagnostics, FileDiagnostics
+from .dialects import DialectDetector
+from .inheritance import materialize, resolve_languages, split_language_code
+from .profiling import Profiler
+from .serialize import Serializer, get_serializer
+from .table import TranslationTable
+from .walk import FileWalker
 
 __all__ = [
+    "find_csv_files",
+    "iter_csv_files",
+    "load_files",
+    "stream_files",
     "load_languages",
     "load_languages_from_csv",
     "write_language_files",
     "merge_languages",
+    "WriteResult",
+    "LoadedFile",
 ]
 
 import csv
 import logging
 import os
-from collections import defaultdict
-from typing import Iterable, Optional, Type, Union
+import threading
+import time
+from collections import ChainMap, defaultdict, deque
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from itertools import chain, compress
+from operator import not_
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+if TYPE_CHECKING:
+    from _csv import _reader as CsvReader
 
 logger = logging.getLogger(__name__)
 
 DialectLike = Union[str, csv.Dialect, Type[csv.Dialect]]
+# path, prefix, dialect, dialect overwrites, diagnostics and whether to measure memory
+_JobArgs = Tuple[Path, str, Optional[DialectLike], Optional[dict], Diagnostics, bool]
+
+DEFAULT_QUEUE_SIZE = 16
+_default_walker = FileWalker()
+_DONE = object()
+
+
+class WriteResult(NamedTuple):
+    written: list[Path]
+    skipped: list[Path]
 
 
 def write_language_files(
     dest_dir: Union[str, os.PathLike],
-    languages: dict[str, dict[str, str]],
+    languages: Mapping[str, Mapping[str, str]],
     indent: Optional[str] = None,
-):
-    for language_code, translations in languages.items():
+    skip_unchanged: bool = False,
+    jobs: Optional[int] = 1,
+    profiler: Optional[Profiler] = None,
+    backend: Optional[str] = None,
+) -> WriteResult:
+    """
+    Writes a `<language code>.json` file for each language
+
+    With `skip_unchanged`, files whose content would not change are left untouched, which keeps
+    their modification times stable. Languages are serialized by `jobs` threads. `None` or 0 uses
+    the executor default. If `dest_dir` is inside of a zip archive, e.g.
+    `pack.zip/assets/minecraft/lang`, all files are written into the archive at once.
+    Each file is serialized into one buffer by the JSON `backend`, see `get_serializer`, and
+    written at once.
+    """
+
+    serializer = get_serializer(backend)
+
+    def write(item: tuple[str, Mapping[str, str]]):
+        language_code, translations = item
         path = Path(dest_dir, language_code + ".json")
-        logging.info(f"Writing language file {path!r}")
-        with open(path, "w", encoding="utf8") as f:
-            json.dump(translations, f, indent=indent, ensure_ascii=False)
+        start = time.perf_counter()
+        translations = materialize(translations)
+        data = serializer(translations, indent)
+
+        written = not skip_unchanged or not _file_content_equals(path, data)
+        if not skip_unchanged:
+            logging.info(f"Writing language file {path!r}")
+            with open(path, "wb") as f:
+                f.write(data)
+        elif written:
+            logging.info(f"Writing language file {path!r}")
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        if profiler is not None:
+            elapsed = time.perf_counter() - start
+            profiler.record_language(
+                language_code, elapsed, len(data), len(translations), written
+            )
+        return path, written
+
+    if (output := archive.split_output_path(dest_dir)) is not None:
+        return _write_zip(
+            dest_dir, output, languages, indent, skip_unchanged, jobs, profiler, serializer
+        )
+
+    # Imported lazily like all thread pools and queues, since they pull in heapq
+    from concurrent.futures import ThreadPoolExecutor
+
+    result = WriteResult([], [])
+    with profiling.stage(profiler, "write"), ThreadPoolExecutor(jobs or None) as executor:
+        for path, written in executor.map(write, languages.items()):
+            (result.written if written else result.skipped).append(path)
+
+    logging.info(f"Wrote {len(result.written)} language files, skipped {len(result.skipped)}")
+    return result
+
+
+def _write_zip(
+    dest_dir: Union[str, os.PathLike],
+    output: tuple[Path, str],
+    languages: Mapping[str, Mapping[str, str]],
+    indent: Optional[str],
+    skip_unchanged: bool,
+    jobs: Optional[int],
+    profiler: Optional[Profiler],
+    serializer: Serializer,
+) -> WriteResult:
+    """ Serializes languages in memory and writes them into a zip archive in one pass """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    archive_path, folder = output
+
+    def serialize(item: tuple[str, Mapping[str, str]]):
+        language_code, translations = item
+        start = time.perf_counter()
+        data = serializer(materialize(translations), indent)
+        return data, time.perf_counter() - start
+
+    with profiling.stage(profiler, "write"):
+        with ThreadPoolExecutor(jobs or None) as executor:
+            serialized = list(executor.map(serialize, languages.items()))
+
+        names = [f"{folder}/{code}.json" if folder else f"{code}.json" for code in languages]
+        logging.info(f"Writing {len(names)} language files into {str(archive_path)!r}")
+        written = archive.write_zip(
+            archive_path, dict(zip(names, (data for data, _ in serialized))), skip_unchanged
+        )
+
+    result = WriteResult([], [])
+    for (code, translations), name, (data, seconds) in zip(
+        languages.items(), names, serialized
+    ):
+        path = Path(dest_dir, code + ".json")
+        (result.written if name in written else result.skipped).append(path)
+        if profiler is not None:
+            profiler.record_language(
+                code, seconds, len(data), len(translations), name in written
+            )
+
+    logging.info(f"Wrote {len(result.written)} language files, skipped {len(result.skipped)}")
+    return result
+
+
+def _file_content_equals(path: Path, data: bytes):
+    try:
+        if archive.stat_source(path)[1] != len(data):
+            return False
+        return archive.read_bytes(path) == data
+    except OSError:
+        return False
 
 
 def load_languages(
@@ -40,33 +193,399 @@ def load_languages(
     prefix_identifiers=False,
     dialect: Optional[DialectLike] = None,
     csv_dialect_overwrites: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    jobs: Optional[int] = 1,
+    dialect_detector: Optional[DialectDetector] = None,
+    profiler: Optional[Profiler] = None,
+    as_table=False,
+    diagnostics: Optional[Diagnostics] = None,
+    walker: Optional[FileWalker] = None,
 ):
-    """ Loads languages from directory """
+    """
+    Loads languages from directory
+
+    If a `cache` is passed, files whose content and parse settings did not change since they were
+    last parsed are loaded from the cache instead.
+    Files are parsed by a pool of `jobs` processes. `None` or 0 uses one process per CPU.
+    Languages are always merged in the order the files were found in.
+    If no `dialect` is passed, a `dialect_detector` can be passed to share detected dialects
+    between files.
+    A `profiler` records the time spent in each stage and on each file.
+    With `as_table`, languages are returned as a `TranslationTable`. Files are streamed into the
+    table as they are parsed, so their translations are not kept in memory besides the table.
+    Missing translations are collected in `diagnostics` if passed, otherwise they are logged.
+    A `walker` selects the files of directories.
+    Languages that inherit from a parent language are resolved lazily, see `resolve_languages`.
+    """
+
+    with profiling.stage(profiler, "walk"):
+        files = find_csv_files(src, prefix_identifiers, walker)
+
+    if as_table:
+        streamed = stream_files(
+            files,
+            dialect,
+            csv_dialect_overwrites,
+            cache=cache,
+            jobs=jobs,
+            dialect_detector=dialect_detector,
+            profiler=profiler,
+            diagnostics=diagnostics,
+        )
+        table = TranslationTable()
+        table_parents: dict[str, str] = {}
+        with profiling.stage(profiler, "stream"):
+            for f in streamed:
+                table.update(f.languages)
+                table_parents.update(f.parents)
+            _inherit(table, table_parents)
+        return table
+
+    loaded = load_files(
+        files,
+        dialect,
+        csv_dialect_overwrites,
+        cache=cache,
+        jobs=jobs,
+        dialect_detector=dialect_detector,
+        profiler=profiler,
+        diagnostics=diagnostics,
+    )
+
+    with profiling.stage(profiler, "merge"):
+        parents = {code: parent for f in loaded for code, parent in f.parents.items()}
+        if not parents:
+            return merge_languages(f.languages for f in loaded)
+
+        return resolve_languages(merge_languages(f.languages for f in loaded), parents)
+
+
+def find_csv_files(
+    src: Union[str, os.PathLike], prefix_identifiers=False, walker: Optional[FileWalker] = None
+):
+    """
+    Finds csv files in source and the prefix of their identifiers.
+    Directories are searched with `walker`, which by default finds all .csv files
+    """
+
+    return list(iter_csv_files(src, prefix_identifiers, walker))
+
+
+def iter_csv_files(
+    src: Union[str, os.PathLike], prefix_identifiers=False, walker: Optional[FileWalker] = None
+) -> Iterator[tuple[Path, str]]:
+    """ Like `find_csv_files`, but yields files while the source is walked """
 
     src = Path(src)
 
     if src.is_dir():
-        files = list(utils.files_in_dir(src))
-    else:
+        files: Iterable[Path] = (walker or _default_walker).walk(src)
+    elif src.suffix == ".csv":
         # Source is a file. Only load languages from that file
         files = [src]
         src = src.parent
+    elif (split := archive.split_archive_path(src)) is not None:
+        # Source is a zip or tar archive, or a folder inside of one
+        files = (walker or _default_walker).walk_archive(*split)
+    else:
+        files = []
 
-    file_languages: list[dict[str, dict[str, str]]] = []
     for f in files:
-        prefix = utils.relative_path_to(f, src) + "." if prefix_identifiers else ""
+        yield f, utils.relative_path_to(f, src) + "." if prefix_identifiers else ""
+
+
+class LoadedFile(NamedTuple):
+    path: Path
+    languages: dict[str, dict[str, str]]
+    line_numbers: dict[str, int]
+    # Parent of each language that inherits from another one
+    parents: dict[str, str]
+
+
+def load_files(
+    files: list[tuple[Path, str]],
+    dialect: Optional[DialectLike] = None,
+    dialect_overwrites: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    jobs: Optional[int] = 1,
+    dialect_detector: Optional[DialectDetector] = None,
+    profiler: Optional[Profiler] = None,
+    diagnostics: Optional[Diagnostics] = None,
+) -> list[LoadedFile]:
+    """
+    Loads the (path, prefix) pairs returned by `find_csv_files`.
+    Results are returned in the order of `files`. See `load_languages` for the options
+    """
+
+    results: list[Optional[LoadedFile]] = [None] * len(files)
+    keys: list[str] = [""] * len(files)
+
+    # Detect dialects in this process, so detections are shared between all files. Detection
+    # comes first, so cache entries are keyed on the dialect files are parsed with
+    with profiling.stage(profiler, "sniff"):
+        dialects = [_detect_dialect(path, dialect, dialect_detector) for path, _ in files]
+
+    pending: list[int] = []
+    for i, (path, prefix) in enumerate(files):
+        keys[i], results[i] = _load_cached(
+            path, prefix, dialects[i], dialect_overwrites, cache, profiler, diagnostics
+        )
+        if results[i] is None:
+            pending.append(i)
+
+    job_args = [
+        _job_args(*files[i], dialects[i], dialect_overwrites, diagnostics, profiler)
+        for i in pending
+    ]
 
-        if f.suffix == ".csv":
-            file_languages.append(
-                load_languages_from_csv(
-                    f, prefix, dialect=dialect, dialect_overwrites=csv_dialect_overwrites
+    jobs = jobs or os.cpu_count() or 1
+
+    with profiling.stage(profiler, "parse"):
+        if jobs > 1 and len(job_args) > 1:
+            # Imported lazily, since it pulls in multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(min(jobs, len(job_args))) as executor:
+                parsed = list(executor.map(_parse_csv_job, job_args))
+        else:
+            parsed = list(map(_parse_csv_job, job_args))
+
+    for i, result in zip(pending, parsed):
+        results[i] = _finish_job(files[i][0], keys[i], result, cache, profiler, diagnostics)
+
+    if cache is not None:
+        cache.save()
+
+    return cast("list[LoadedFile]", results)
+
+
+def stream_files(
+    files: Iterable[tuple[Path, str]],
+    dialect: Optional[DialectLike] = None,
+    dialect_overwrites: Optional[dict] = None,
+    cache: Optional[ParseCache] = None,
+    jobs: Optional[int] = 1,
+    dialect_detector: Optional[DialectDetector] = None,
+    profiler: Optional[Profiler] = None,
+    diagnostics: Optional[Diagnostics] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Iterator[LoadedFile]:
+    """
+    Like `load_files`, but yields each file as soon as it and all files before it are loaded.
+
+    `files` is consumed by a background thread, for example while `iter_csv_files` walks the
+    sources. At most `queue_size` walked files wait to be parsed and at most `queue_size` files
+    are being parsed or wait to be consumed, so walking, parsing and merging the results overlap
+    and memory is bounded by the queue sizes instead of the number of files.
+    """
+
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    walked: queue.Queue = queue.Queue(queue_size)
+    stop = threading.Event()
+
+    def walk():
+        try:
+            for item in chain(files, [_DONE]):
+                while not stop.is_set():
+                    try:
+                        walked.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+        except BaseException as e:
+            walked.put(e)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1:
+        # Imported lazily, since it pulls in multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor: Executor = ProcessPoolExecutor(jobs)
+    else:
+        # Parses in the background, so the consumer overlaps with parsing
+        executor = ThreadPoolExecutor(1)
+
+    # Files being loaded, in order. Either loaded already or the future of their parse job
+    window: deque[tuple[Path, str, Union[LoadedFile, Future]]] = deque()
+
+    def finish():
+        path, key, result = window.popleft()
+        if isinstance(result, Future):
+            return _finish_job(path, key, result.result(), cache, profiler, diagnostics)
+        return result
+
+    walker = threading.Thread(target=walk, name="babelbox-walk", daemon=True)
+    walker.start()
+    with executor:
+        try:
+            while (item := walked.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+
+                path, prefix = item
+                with profiling.stage(profiler, "sniff"):
+                    file_dialect = _detect_dialect(path, dialect, dialect_detector)
+                key, loaded = _load_cached(
+                    path,
+                    prefix,
+                    file_dialect,
+                    dialect_overwrites,
+                    cache,
+                    profiler,
+                    diagnostics,
                 )
-            )
+                if loaded is None:
+                    args = _job_args(
+                        path, prefix, file_dialect, dialect_overwrites, diagnostics, profiler
+                    )
+                    window.append((path, key, executor.submit(_parse_csv_job, args)))
+                else:
+                    window.append((path, key, loaded))
+
+                # Hand out finished files right away and wait for the oldest if the window is full
+                while window and (len(window) >= queue_size or _done(window[0][2])):
+                    yield finish()
+
+            while window:
+                yield finish()
+        finally:
+            # Stop walking and parsing if the consumer stopped early
+            stop.set()
+            for _, _, result in window:
+                if isinstance(result, Future):
+                    result.cancel()
+
+    if cache is not None:
+        cache.save()
+
+
+def _done(result: Union[LoadedFile, Future]):
+    return not isinstance(result, Future) or result.done()
+
+
+def _load_cached(
+    path: Path,
+    prefix: str,
+    dialect: Optional[DialectLike],
+    dialect_overwrites: Optional[dict],
+    cache: Optional[ParseCache],
+    profiler: Optional[Profiler],
+    diagnostics: Optional[Diagnostics],
+) -> tuple[str, Optional[LoadedFile]]:
+    """ Returns the cache key of a file and the file, if it was found in the cache """
+
+    if cache is None:
+        return "", None
+
+    start = time.perf_counter()
+    with profiling.stage(profiler, "cache"):
+        key = cache.file_key(path, prefix, dialect, dialect_overwrites)
+        cached = cache.get_entry(key)
+
+    if cached is None:
+        return key, None
+
+    languages, line_numbers, parents, missing_identifiers = cached
+    logger.info(f"Loaded {str(path)!r} from parse cache")
+    if profiler is not None:
+        profiler.record_file(path, time.perf_counter() - start, languages, True)
+
+    # Replay the diagnostics of the file, so they are reported like when it is parsed
+    file_diagnostics = Diagnostics(None) if diagnostics is None else diagnostics
+    report = file_diagnostics.file(path)
+    report.count(languages)
+    report.missing_identifiers.extend(missing_identifiers)
+    if diagnostics is None:
+        file_diagnostics.report(logger)
+    return key, LoadedFile(path, languages, line_numbers, parents)
+
+
+def _detect_dialect(
+    path: Path, dialect: Optional[DialectLike], dialect_detector: Optional[DialectDetector]
+) -> Optional[DialectLike]:
+    if dialect is None and dialect_detector is not None:
+        return dialect_detector.detect_file(path)
+    return dialect
+
+
+def _job_args(
+    path: Path,
+    prefix: str,
+    dialect: Optional[DialectLike],
+    dialect_overwrites: Optional[dict],
+    diagnostics: Optional[Diagnostics],
+    profiler: Optional[Profiler] = None,
+) -> _JobArgs:
+    # Each job collects into its own, empty diagnostics, which are cheap to send to workers
+    job_diagnostics = Diagnostics(
+        diagnostics.max_examples if diagnostics is not None else None
+    )
+    measure_memory = profiler is not None and profiler.memory
+    return path, prefix, dialect, dialect_overwrites, job_diagnostics, measure_memory
+
+
+def _finish_job(
+    path: Path,
+    key: str,
+    result: tuple[dict, dict, dict, float, Diagnostics, profiling.MemoryUsage],
+    cache: Optional[ParseCache],
+    profiler: Optional[Profiler],
+    diagnostics: Optional[Diagnostics],
+):
+    languages, line_numbers, parents, seconds, job_diagnostics, memory = result
 
-    return merge_languages(file_languages)
+    if diagnostics is not None:
+        diagnostics.update(job_diagnostics)
+    else:
+        job_diagnostics.report(logger)
+    if profiler is not None:
+        profiler.record_file(
+            path, seconds, languages, memory=memory if profiler.memory else None
+        )
+    if cache is not None:
+        with profiling.stage(profiler, "cache"):
+            report = job_diagnostics.files.get(path)
+            missing_identifiers = report.missing_identifiers if report is not None else None
+            cache.put(key, languages, line_numbers, parents, missing_identifiers)
+    return LoadedFile(path, languages, line_numbers, parents)
+
+
+def _parse_csv_job(args: _JobArgs):
+    path, prefix, dialect, dialect_overwrites, diagnostics, measure_memory = args
+
+    start = time.perf_counter()
+    line_numbers: dict[str, int] = {}
+    parents: dict[str, str] = {}
+    # Measured in the job, so files parsed by worker processes are measured too
+    with profiling.measure_memory(measure_memory) as memory:
+        languages = load_languages_from_csv(
+            path,
+            prefix,
+            dialect=dialect,
+            dialect_overwrites=dialect_overwrites,
+            line_numbers=line_numbers,
+            diagnostics=diagnostics,
+            parents=parents,
+        )
+    return languages, line_numbers, parents, time.perf_counter() - start, diagnostics, memory
+
+
+def merge_languages(
+    language_collections: Iterable[Mapping[str, Mapping[str, str]]], as_table=False
+):
+    """
+    Merges languages. Translations of later collections overwrite earlier ones.
+    With `as_table`, the result is a `TranslationTable` instead of a dict per language.
+    """
 
+    if as_table:
+        table = TranslationTable()
+        for languages in language_collections:
+            table.update(languages)
+        return table
 
-def merge_languages(language_collections: Iterable[dict[str, dict[str, str]]]):
     result: dict[str, dict[str, str]] = defaultdict(dict)
 
     for languages in language_collections:
@@ -76,11 +595,24 @@ def merge_languages(language_collections: Iterable[dict[str, dict[str, str]]]):
     return result
 
 
+def _inherit(table: TranslationTable, parents: Mapping[str, str]):
+    # Fills the cells inheriting languages lack with the translations of their ancestors, in the
+    # order `resolve_languages` iterates them in
+    for code, translations in resolve_languages(table, parents).items():
+        if isinstance(translations, ChainMap):
+            table.replace(code, translations)
+
+
 def load_languages_from_csv(
     path: Union[str, os.PathLike],
     prefix: str = "",
     dialect: Optional[DialectLike] = None,
     dialect_overwrites: Optional[dict] = None,
+    dialect_detector: Optional[DialectDetector] = None,
+    as_table=False,
+    line_numbers: Optional[dict[str, int]] = None,
+    diagnostics: Optional[Diagnostics] = None,
+    parents: Optional[dict[str, str]] = None,
 ):
     """
     Loads csv file and parses it to a dictionary mapping each column to a language code.
@@ -90,41 +622,173 @@ def load_languages_from_csv(
     | cat        | Cat   | Katze |
 
     => {"en_us": {"car": "Car", "cat": "Katze"}, "de_de": {"car": "Autor", "cat": "Katze"}}
+
+    With `as_table`, the languages are returned as a `TranslationTable`.
+    If a `line_numbers` dict is passed, it is filled with the line each identifier was read from.
+    Missing translations and identifiers are collected in `diagnostics`. Without it, they are
+    logged as warnings once the file is parsed.
+
+    A column named `en_gb:en_us` declares that `en_gb` inherits from `en_us`. Its empty cells and
+    the cells equal to those of `en_us` in the same row are inherited. If a `parents` dict is
+    passed, it is filled with the parent of each such language and only the cells that differ
+    are returned. Otherwise inheriting languages are resolved within the file.
     """
 
-    with open(path, newline="", encoding="utf8") as csv_file:
+    if diagnostics is None:
+        # Only keep the identifiers for the messages if they will be logged
+        diagnostics = Diagnostics(None if logger.isEnabledFor(logging.WARNING) else 0)
+        result = load_languages_from_csv(
+            path,
+            prefix,
+            dialect,
+            dialect_overwrites,
+            dialect_detector,
+            as_table,
+            line_numbers,
+            diagnostics,
+            parents,
+        )
+        diagnostics.report(logger)
+        return result
+
+    report = diagnostics.file(path)
+
+    with open_csv(path, dialect, dialect_overwrites, dialect_detector) as reader:
+        sheet_parents: dict[str, str] = {}
+        language_codes, language_indices, sheet = read_sheet(
+            reader, prefix, report, sheet_parents
+        )
+
+        identifiers: list[str] = []
+        rows: list[list] = []
+        for identifier, row in sheet:
+            identifiers.append(identifier)
+            rows.append(row)
+            if line_numbers is not None:
+                line_numbers[identifier] = reader.line_num
+
+        # Transpose the rows once and insert the translations of each language at once
+        languages: dict[str, dict[str, str]] = defaultdict(dict)
+        columns: list = list(zip(*rows))
+        for code, j in zip(language_codes, language_indices) if rows else ():
+            column = columns[j]
+            if (parent := sheet_parents.get(code)) is not None:
+                # Only keep the cells that differ from the parent
+                if parent in language_codes:
+                    parent_column = columns[language_indices[language_codes.index(parent)]]
+                    keep = [t and t != p for t, p in zip(column, parent_column)]
+                else:
+                    keep = column
+                languages[code].update(compress(zip(identifiers, column), keep))
+                continue
+
+            if None in column:
+                # Padded short rows
+                for identifier in compress(identifiers, map(not_, column)):
+                    report.missing_translation(code, identifier)
+                column = [translation or "" for translation in column]
+            else:
+                for k in _empty_cells(column):
+                    report.missing_translation(code, identifiers[k])
+
+            languages[code].update(zip(identifiers, column))
+
+        if parents is not None:
+            parents.update(sheet_parents)
+        elif sheet_parents:
+            languages = {
+                code: materialize(translations)
+                for code, translations in resolve_languages(languages, sheet_parents).items()
+            }
+
+        return TranslationTable(languages) if as_table else languages
+
+
+@contextmanager
+def open_csv(
+    path: Union[str, os.PathLike],
+    dialect: Optional[DialectLike] = None,
+    dialect_overwrites: Optional[dict] = None,
+    dialect_detector: Optional[DialectDetector] = None,
+) -> Iterator[CsvReader]:
+    """ Opens a csv file with a `csv.reader`, detecting its dialect if none is passed """
+
+    with archive.open_text(path) as csv_file:
 
         if dialect is None:
-            try:
-                dialect = csv.Sniffer().sniff(csv_file.read(1024))
-            except Exception:
-                dialect = csv.excel
-            finally:
-                csv_file.seek(0)
+            sample = csv_file.read(dialects.SAMPLE_SIZE)
+            csv_file.seek(0)
 
-        reader = csv.DictReader(csv_file, dialect=dialect, **(dialect_overwrites or {}))
-        indentifier_column, *language_codes = reader.fieldnames or [""]
+            if dialect_detector is not None:
+                dialect = dialect_detector.detect(path, sample)
+            else:
+                dialect = dialects.sniff(sample)
+                logger.info(f"{str(path)!r}: Using dialect {dialects.describe(dialect)}")
 
-        languages: dict[str, dict[str, str]] = defaultdict(dict)
-        for i, row in enumerate(reader):
-            if not (identifier := row[indentifier_column]):
-                if any(row.values()):
-                    logger.warning(f"{path!r}@{i+2}: Non-empty line is missing identifier")
+        yield csv.reader(csv_file, dialect=dialect, **(dialect_overwrites or {}))
+
+
+def read_sheet(
+    reader: CsvReader,
+    prefix: str,
+    report: FileDiagnostics,
+    parents: Optional[dict[str, str]] = None,
+) -> tuple[list[str], list[int], Iterator[tuple[str, list]]]:
+    """
+    Reads the header of a sheet. Returns its language codes, the index of each language code in a
+    row and an iterator over the (identifier, row) pairs of the sheet. Rows without identifier
+    and comments are skipped. If a `parents` dict is passed, it is filled with the parent of each
+    language whose column is named like `en_gb:en_us`.
+    """
+
+    header: list[str] = next(reader, [])
+    identifier_column, *columns = header or [""]
+
+    # Rows are parsed positionally. Like csv.DictReader, the last of several columns with the
+    # same name wins, missing cells are None and blank lines are skipped
+    column_indices = {name: i for i, name in enumerate(header)}
+    identifier_index = column_indices.get(identifier_column)
+    language_indices = [column_indices[name] for name in columns]
+
+    language_codes = []
+    for name in columns:
+        code, parent = split_language_code(name)
+        language_codes.append(code)
+        if parent is not None and parents is not None:
+            parents[code] = parent
+    report.languages = language_codes
+    value_indices = sorted(column_indices.values())
+    width = len(header)
+    padding: list = [None] * width
+
+    def rows():
+        for i, row in enumerate(filter(None, reader)):
+            if len(row) < width:
+                row += padding[len(row) :]
+
+            identifier = row[identifier_index] if identifier_index is not None else None
+            if not identifier:
+                if len(row) > width or any([row[j] for j in value_indices]):
+                    report.missing_identifier(i + 2)
                 continue
 
             # Skip comments
-            if identifier.startswith("#") and not any(map(lambda l: row[l], language_codes)):
+            if identifier[0] == "#" and not any([row[j] for j in language_indices]):
                 continue
 
-            identifier = prefix + identifier
+            report.rows += 1
+            yield prefix + identifier, row
+
+    return language_codes, language_indices, rows()
 
-            for code in language_codes:
-                if not (translation := row[code]):
-                    logger.warning(
-                        f"{path!r}: Locale {code!r} has no translation for {identifier!r}"
-                    )
-                    translation = ""
 
-                languages[code][identifier] = translation
+def _empty_cells(column: tuple[str, ...]):
+    """ Yields the indices of empty cells. Scanning with `index` keeps the search in C """
 
-        return languages
+    i = -1
+    try:
+        while True:
+            i = column.index("", i + 1)
+            yield i
+    except ValueError:
+        return
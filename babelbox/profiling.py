@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, NamedTuple, Optional, Union
+
+from .archive import stat_source
+
+__all__ = ["Profiler", "FileProfile", "LanguageProfile", "MemoryProfile", "measure_memory"]
+
+
+class FileProfile(NamedTuple):
+    path: str
+    seconds: float
+    bytes: int
+    rows: int
+    columns: int
+    cached: bool = False
+    peak_memory: int = 0
+    retained_memory: int = 0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+
+class LanguageProfile(NamedTuple):
+    code: str
+    seconds: float
+    bytes: int
+    entries: int
+    written: bool = True
+
+
+class MemoryProfile(NamedTuple):
+    # Bytes allocated at the peak and still allocated at the end, relative to the start
+    peak: int
+    retained: int
+
+
+class MemoryUsage:
+    __slots__ = ("start", "peak", "retained")
+
+    def __init__(self, start=0):
+        self.start = start
+        self.peak = 0
+        self.retained = 0
+
+
+# tracemalloc only has one peak. Before it is reset, the peak is added to all open measurements
+_measurements: list[MemoryUsage] = []
+_measurements_lock = threading.Lock()
+
+
+@contextmanager
+def measure_memory(enabled=True) -> Iterator[MemoryUsage]:
+    """
+    Measures the peak and retained memory allocated by Python with `tracemalloc` while the context
+    is entered. Measurements can be nested. Tracing is started if necessary and stopped again.
+    Before Python 3.9 the peak can't be reset, so peaks include allocations of earlier
+    measurements
+    """
+
+    usage = MemoryUsage()
+    if not enabled:
+        yield usage
+        return
+
+    # Imported lazily, since memory is only measured with --memory-report
+    import tracemalloc
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    with _measurements_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        for measurement in _measurements:
+            measurement.peak = max(measurement.peak, peak)
+        if (reset_peak := getattr(tracemalloc, "reset_peak", None)) is not None:
+            reset_peak()
+        usage.start = usage.peak = current
+        _measurements.append(usage)
+
+    try:
+        yield usage
+    finally:
+        with _measurements_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            _measurements[:] = [m for m in _measurements if m is not usage]
+            peak = max(usage.peak, peak)
+            for measurement in _measurements:
+                measurement.peak = max(measurement.peak, peak)
+            usage.peak = peak - usage.start
+            usage.retained = current - usage.start
+
+        if started:
+            tracemalloc.stop()
+
+
+class Profiler:
+    """
+    Records wall time per stage (walking, sniffing, parsing, merging, writing), per source file and
+    per output language.
+
+    Pass it to `load_languages` and `write_language_files` and read the results with `summary` or
+    `to_json`. With `memory`, the peak and retained memory of each stage and each parsed file are
+    also recorded with `tracemalloc`, which slows down parsing considerably.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stages: dict[str, float] = {}
+        self.stage_memory: dict[str, MemoryProfile] = {}
+        self.files: list[FileProfile] = []
+        self.languages: list[LanguageProfile] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            with measure_memory(self.memory) as usage:
+                yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+            if self.memory:
+                # Stages entered repeatedly keep their highest peak and sum what they retained
+                peak, retained = self.stage_memory.get(name, (0, 0))
+                self.stage_memory[name] = MemoryProfile(
+                    max(peak, usage.peak), retained + usage.retained
+                )
+
+    def record_file(
+        self,
+        path: Union[str, os.PathLike],
+        seconds: float,
+        languages: dict[str, dict[str, str]],
+        cached=False,
+        memory: Optional[MemoryUsage] = None,
+    ):
+        size = source_size(path)
+        rows = max(map(len, languages.values()), default=0)
+        peak, retained = (memory.peak, memory.retained) if memory is not None else (0, 0)
+        self.files.append(
+            FileProfile(str(path), seconds, size, rows, len(languages), cached, peak, retained)
+        )
+
+    def record_language(
+        self, code: str, seconds: float, size: int, entries: int, written=True
+    ):
+        self.languages.append(LanguageProfile(code, seconds, size, entries, written))
+
+    def summary(self, top: Optional[int] = 10) -> str:
+        lines = ["Stages:"]
+        for name, seconds in sorted(self.stages.items(), key=lambda s: -s[1]):
+            lines.append(f"  {name:<12} {seconds * 1000:10.2f} ms")
+
+        lines.append(f"Files ({len(self.files)}, slowest first):")
+        for f in sorted(self.files, key=lambda f: -f.seconds)[:top]:
+            lines.append(
+                f"  {f.seconds * 1000:10.2f} ms {f.rows:>7} rows {f.columns:>4} cols"
+                f" {f.rows_per_second:>10.0f} rows/s {f.bytes_per_second / 1e6:8.2f} MB/s"
+                f"{' (cached)' if f.cached else ''}  {f.path}"
+            )
+
+        lines.append(f"Languages ({len(self.languages)}, slowest first):")
+        for lang in sorted(self.languages, key=lambda l: -l.seconds)[:top]:
+            lines.append(
+                f"  {lang.seconds * 1000:10.2f} ms {lang.entries:>7} entries"
+                f" {lang.bytes:>10} bytes{'' if lang.written else ' (skipped)'}  {lang.code}"
+            )
+
+        if self.memory:
+            lines.append(self.memory_summary(top))
+
+        return "\n".join(lines)
+
+    def memory_summary(self, top: Optional[int] = 10) -> str:
+        lines = ["Memory per stage (peak, retained):"]
+        for name, memory in sorted(self.stage_memory.items(), key=lambda s: -s[1].peak):
+            lines.append(
+                f"  {name:<12} {memory.peak / 1e6:10.2f} MB {memory.retained / 1e6:10.2f} MB"
+            )
+
+        lines.append("Memory per file (peak, retained, largest first):")
+        for f in sorted(self.files, key=lambda f: -f.peak_memory)[:top]:
+            lines.append(
+                f"  {f.peak_memory / 1e6:10.2f} MB {f.retained_memory / 1e6:10.2f} MB"
+                f"{' (cached)' if f.cached else ''}  {f.path}"
+            )
+
+        return "\n".join(lines)
+
+    def to_json(self):
+        return {
+            "stages": self.stages,
+            "stage_memory": {name: m._asdict() for name, m in self.stage_memory.items()},
+            "files": [
+                {
+                    **f._asdict(),
+                    "rows_per_second": f.rows_per_second,
+                    "bytes_per_second": f.bytes_per_second,
+                }
+                for f in self.files
+            ],
+            "languages": [lang._asdict() for lang in self.languages],
+        }
+
+    def dump(self, path: Union[str, os.PathLike]):
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(self.to_json(), f, indent=2)
+
+
+def source_size(path: Union[str, os.PathLike]) -> int:
+    """ Returns the size of a source file, or 0 if it can't be stat-ed anymore """
+
+    try:
+        return stat_source(path)[1]
+    except OSError:
+        return 0
+
+
+def stage(profiler: Optional[Profiler], name: str):
+    return profiler.stage(name) if profiler is not None else nullcontext()
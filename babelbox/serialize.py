@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Callable, Mapping, Optional, Union
+
+__all__ = ["BACKENDS", "Serializer", "dumps", "get_serializer"]
+
+BACKENDS = ("json", "orjson")
+
+# Serializes the translations of a language with an indent, or minified if it is None
+Serializer = Callable[[Mapping[str, str], Optional[str]], bytes]
+
+
+def dumps(translations: Mapping[str, str], indent: Optional[str] = None) -> bytes:
+    """ Serializes translations with the fastest installed backend """
+
+    return get_serializer()(translations, indent)
+
+
+def get_serializer(backend: Optional[str] = None) -> Serializer:
+    """
+    Returns a function that serializes the translations of a language into a UTF-8 document,
+    byte for byte like `json.dumps(translations, indent=indent, ensure_ascii=False)`.
+
+    The `json` backend uses the standard library, the `orjson` backend requires orjson. Without a
+    `backend`, orjson is used if it is installed.
+    """
+
+    if backend is None:
+        return _dumps_orjson if _orjson() is not None else _dumps_json
+    if backend == "json":
+        return _dumps_json
+    if backend == "orjson":
+        if _orjson() is None:
+            raise ValueError("The orjson backend requires orjson to be installed")
+        return _dumps_orjson
+    raise ValueError(f"Unknown JSON backend {backend!r}. Must be one of {', '.join(BACKENDS)}")
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    # Imported on first use, so startup doesn't pay for it
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return None
+    return orjson
+
+
+@lru_cache(maxsize=None)
+def _encoder(indent: Optional[str]):
+    # The C encoder is only used without indent, so indented documents are encoded minified with
+    # the indent as item separator. Translations are flat, so only entries are separated by it
+    separators = (", ", ": ") if indent is None else (",\n" + indent, ": ")
+    return json.JSONEncoder(ensure_ascii=False, separators=separators).encode
+
+
+def _dumps_json(translations: Mapping[str, str], indent: Optional[Union[str, int]] = None):
+    if isinstance(indent, int):
+        indent = " " * indent
+    if not isinstance(translations, dict):
+        translations = dict(translations)
+
+    document = _encoder(indent)(translations)
+    if indent is not None and translations:
+        document = "{\n" + indent + document[1:-1] + "\n}"
+    return document.encode("utf8")
+
+
+def _dumps_orjson(translations: Mapping[str, str], indent: Optional[Union[str, int]] = None):
+    orjson = _orjson()
+    if isinstance(indent, int):
+        indent = " " * indent
+    if not isinstance(translations, dict):
+        translations = dict(translations)
+
+    try:
+        document: bytes = orjson.dumps(translations, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        # E.g. lone surrogates, which the standard library reports more precisely
+        return _dumps_json(translations, indent)
+
+    if not translations:
+        return document
+    # Newlines in strings are escaped, so the only newlines are the ones between entries
+    if indent is None:
+        return b"{" + document[4:-2].replace(b",\n  ", b", ") + b"}"
+    return document.replace(b"\n  ", b"\n" + indent.encode("utf8"))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Optional, Union
+
+from . import profiling
+from .archive import make_output_dir
+from .catalog import write_catalog
+from .check import diff_language_files
+from .parser import write_language_files
+from .profiling import Profiler
+from .watch import IncrementalBuild
+
+__all__ = ["BuildServer", "make_server", "parse_address", "serve"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8737
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """ Parses `host:port` or a bare port. The host defaults to localhost """
+
+    host, _, port = address.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+class BuildServer:
+    """
+    Answers build and check requests for the sources of an `IncrementalBuild`.
+
+    Parsed files stay in memory between requests. Each request only re-parses files that changed
+    since the previous one and a build only rewrites the languages affected by those changes.
+    """
+
+    def __init__(
+        self,
+        build: IncrementalBuild,
+        dest_dir: Union[str, os.PathLike],
+        indent: Optional[str] = None,
+        skip_unchanged=False,
+        catalog: Optional[Union[str, os.PathLike]] = None,
+        jobs: Optional[int] = 1,
+    ):
+        self.build = build
+        self.dest_dir = Path(dest_dir)
+        self.indent = indent
+        self.skip_unchanged = skip_unchanged
+        self.catalog = catalog
+        self.jobs = jobs
+
+        # Languages that changed since they were last written
+        self._pending: set[str] = set()
+
+    def update(self, profiler: Optional[Profiler] = None):
+        with profiling.stage(profiler, "update"):
+            self._pending.update(self.build.update())
+
+    def build_languages(self):
+        """ Writes the languages that changed since the last build """
+
+        start = time.perf_counter()
+        profiler = Profiler()
+        self.update(profiler)
+
+        resolved = self.build.resolved_languages()
+        languages = {
+            code: resolved[code] for code in sorted(self._pending) if code in resolved
+        }
+        make_output_dir(self.dest_dir)
+        result = write_language_files(
+            self.dest_dir, languages, self.indent, self.skip_unchanged, self.jobs, profiler
+        )
+        if self.catalog is not None and self._pending:
+            with profiling.stage(profiler, "compile"):
+                write_catalog(self.catalog, resolved)
+        self._pending.clear()
+
+        return {
+            "written": [str(path) for path in result.written],
+            "skipped": [str(path) for path in result.skipped],
+            "seconds": time.perf_counter() - start,
+            "stages": profiler.stages,
+        }
+
+    def check(self):
+        """ Lists the languages whose files differ from what a build would write """
+
+        start = time.perf_counter()
+        profiler = Profiler()
+        self.update(profiler)
+
+        with profiling.stage(profiler, "check"):
+            languages = self.build.resolved_languages()
+            diffs = diff_language_files(self.dest_dir, languages, self.indent)
+
+        return {
+            "stale": sorted(diffs),
+            "messages": [message for diff in diffs.values() for message in diff.messages()],
+            "seconds": time.perf_counter() - start,
+            "stages": profiler.stages,
+        }
+
+
+class _HTTPServer(HTTPServer):
+    build_server: BuildServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _HTTPServer
+
+    def do_POST(self):
+        command = self.path.strip("/")
+        build_server = self.server.build_server
+
+        try:
+            if command == "build":
+                response = build_server.build_languages()
+            elif command == "check":
+                response = build_server.check()
+            elif command == "shutdown":
+                response = {}
+                # `shutdown` waits for the request loop, so it can't be called from within it
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                self._respond(404, {"error": f"Unknown command {command!r}"})
+                return
+        except Exception as e:
+            logger.exception(f"Request {command!r} failed")
+            self._respond(500, {"error": str(e)})
+            return
+
+        self._respond(200, response)
+
+    def _respond(self, status: int, response: dict):
+        body = json.dumps(response).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        logger.info(format % args)
+
+
+def make_server(build_server: BuildServer, address: tuple[str, int]) -> HTTPServer:
+    """ Binds an HTTP server to `address`. Requests are answered one at a time """
+
+    server = _HTTPServer(address, _Handler)
+    server.build_server = build_server
+    return server
+
+
+def serve(build_server: BuildServer, address: tuple[str, int]):
+    """ Parses all sources and then answers requests until shut down or interrupted """
+
+    start = time.perf_counter()
+    build_server.update()
+    logger.info(f"Parsed sources in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    with make_server(build_server, address) as server:
+        host, port = server.server_address[:2]
+        logger.warning(f"Serving builds on http://{host}:{port}. Press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
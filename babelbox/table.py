@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+from typing import Iterator, Mapping, Optional
+
+__all__ = ["TranslationTable", "LanguageView"]
+
+
+class TranslationTable(Mapping[str, "LanguageView"]):
+    """
+    Columnar storage for the translations of many languages.
+
+    Every identifier is interned and stored once in a shared index. Each language is a column of
+    translations aligned with that index, with `None` marking identifiers the language lacks.
+    Mapping a language code returns a read-only, dict-like view of its translations, which
+    iterates identifiers in the order they were first added to that language, like a dict.
+
+    | Identifier | en_us | de_de |\n
+    | car        | Car   | Auto  |\n
+    | cat        | Cat   |       |
+
+    => identifiers: ["car", "cat"], columns: {"en_us": ["Car", "Cat"], "de_de": ["Auto", None]}
+    """
+
+    def __init__(self, languages: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self.identifiers: list[str] = []
+        self.columns: dict[str, list[Optional[str]]] = {}
+        self._index: dict[str, int] = {}
+        # Indices of the identifiers of each language, in the order they were added to it
+        self._orders: dict[str, list[int]] = {}
+
+        if languages is not None:
+            self.update(languages)
+
+    def set(self, language_code: str, identifier: str, translation: str):
+        if (i := self._index.get(identifier)) is None:
+            i = self._index[identifier] = len(self.identifiers)
+            self.identifiers.append(sys.intern(identifier))
+
+        if (column := self.columns.get(language_code)) is None:
+            column = self.columns[language_code] = []
+            self._orders[language_code] = []
+
+        if i >= len(column):
+            column.extend([None] * (len(self.identifiers) - len(column)))
+
+        if column[i] is None:
+            self._orders[language_code].append(i)
+        column[i] = translation
+
+    def update(self, languages: Mapping[str, Mapping[str, str]]):
+        """ Adds languages to the table. Existing translations are overwritten """
+
+        for language_code, translations in languages.items():
+            for identifier, translation in translations.items():
+                self.set(language_code, identifier, translation)
+
+    def replace(self, language_code: str, translations: Mapping[str, str]):
+        """ Replaces all translations of a language, in the order of `translations` """
+
+        translations = dict(translations)
+        self.columns[language_code] = []
+        self._orders[language_code] = []
+        for identifier, translation in translations.items():
+            self.set(language_code, identifier, translation)
+
+    def get_translation(self, language_code: str, identifier: str) -> Optional[str]:
+        if (i := self._index.get(identifier)) is None:
+            return None
+
+        column = self.columns.get(language_code, ())
+        return column[i] if i < len(column) else None
+
+    def to_dict(self) -> dict[str, dict[str, str]]:
+        return {code: dict(view) for code, view in self.items()}
+
+    def __getitem__(self, language_code: str) -> LanguageView:
+        if language_code not in self.columns:
+            raise KeyError(language_code)
+        return LanguageView(self, language_code)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return f"TranslationTable({len(self.columns)} languages, {len(self.identifiers)} identifiers)"
+
+
+class LanguageView(Mapping[str, str]):
+    """ Read-only view of the translations of one language in a `TranslationTable` """
+
+    __slots__ = ("table", "language_code")
+
+    def __init__(self, table: TranslationTable, language_code: str):
+        self.table = table
+        self.language_code = language_code
+
+    def __getitem__(self, identifier: str) -> str:
+        if (translation := self.table.get_translation(self.language_code, identifier)) is None:
+            raise KeyError(identifier)
+        return translation
+
+    def __iter__(self) -> Iterator[str]:
+        identifiers = self.table.identifiers
+        return (identifiers[i] for i in self.table._orders[self.language_code])
+
+    def __len__(self):
+        return len(self.table._orders[self.language_code])
+
+    def __repr__(self):
+        return f"LanguageView({self.language_code!r}, {dict(self)!r})"
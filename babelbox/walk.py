@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from .archive import list_members
+
+__all__ = ["FileWalker", "IGNORE_FILE"]
+
+IGNORE_FILE = ".babelboxignore"
+
+DEFAULT_INCLUDE = ("*.csv",)
+DEFAULT_EXCLUDE = (".git/", ".hg/", ".svn/")
+
+
+class _Rule(NamedTuple):
+    regex: re.Pattern
+    # Matched against the path relative to `base` instead of the name
+    anchored: bool
+    directories_only: bool
+    base: str
+
+    def matches(self, name: str, rel_dir: str, is_dir: bool):
+        if self.directories_only and not is_dir:
+            return False
+        if self.anchored:
+            return self.regex.fullmatch((rel_dir + name)[len(self.base) :]) is not None
+        return self.regex.fullmatch(name) is not None
+
+
+def compile_pattern(pattern: str, base: str = "") -> _Rule:
+    """
+    Compiles a glob in the style of .gitignore.
+
+    `*` and `?` don't match `/`, `**` matches any number of folders. A trailing `/` only matches
+    folders. Patterns containing a `/` are matched against the path relative to the source (or the
+    folder of the ignore file), all others against the name of files and folders at any depth.
+    """
+
+    directories_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        elif c == "*":
+            regex.append("[^/]*")
+        elif c == "?":
+            regex.append("[^/]")
+        elif c == "[" and (end := pattern.find("]", i + 2)) != -1:
+            chars = pattern[i + 1 : end].replace("\\", "\\\\")
+            regex.append(f"[^{chars[1:]}]" if chars[0] == "!" else f"[{chars}]")
+            i = end + 1
+            continue
+        else:
+            regex.append(re.escape(c))
+        i += 1
+
+    return _Rule(re.compile("".join(regex)), anchored, directories_only, base)
+
+
+def read_ignore_file(path: Union[str, os.PathLike], base: str = "") -> list[_Rule]:
+    with open(path, encoding="utf8") as f:
+        lines = (line.strip() for line in f)
+        return [compile_pattern(line, base) for line in lines if line and line[0] != "#"]
+
+
+class FileWalker:
+    """
+    Finds source files below a folder with `os.scandir`.
+
+    Files must match one of the `include` globs and none of the `exclude` globs. Excluded folders
+    are not descended into. Each folder may contain a `.babelboxignore` file with more exclude
+    globs (one per line, `#` starts a comment) that apply to everything below it. Paths are only
+    created for matching files. Files are found in the same order as with `os.walk`.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] = DEFAULT_INCLUDE,
+        exclude: Iterable[str] = DEFAULT_EXCLUDE,
+        ignore_file: Optional[str] = IGNORE_FILE,
+    ):
+        self.include = [compile_pattern(pattern) for pattern in include]
+        self.exclude = [compile_pattern(pattern) for pattern in exclude]
+        self.ignore_file = ignore_file
+
+    def walk(self, directory: Union[str, os.PathLike]) -> Iterator[Path]:
+        yield from self._walk(os.fspath(directory), "", self.exclude)
+
+    def walk_archive(self, path: Union[str, os.PathLike], folder: str = "") -> Iterator[Path]:
+        """
+        Like `walk`, but finds the files below `folder` in a zip or tar archive. Ignore files in
+        archives are not read. Files are found in the order they are stored in
+        """
+
+        prefix = folder.strip("/") + "/" if folder.strip("/") else ""
+        for name in list_members(path):
+            if not name.startswith(prefix):
+                continue
+
+            *folders, filename = name[len(prefix) :].split("/")
+            rel_dir = ""
+            for part in folders:
+                if any(rule.matches(part, rel_dir, True) for rule in self.exclude):
+                    break
+                rel_dir += part + "/"
+            else:
+                if any(
+                    rule.matches(filename, rel_dir, False) for rule in self.include
+                ) and not any(rule.matches(filename, rel_dir, False) for rule in self.exclude):
+                    yield Path(path, name)
+
+    def _walk(self, directory: str, rel_dir: str, exclude: list[_Rule]) -> Iterator[Path]:
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        if self.ignore_file and any(e.name == self.ignore_file for e in entries):
+            try:
+                exclude = exclude + read_ignore_file(
+                    os.path.join(directory, self.ignore_file), rel_dir
+                )
+            except OSError:
+                pass
+
+        subdirectories = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                if not any(rule.matches(name, rel_dir, True) for rule in exclude):
+                    # Like `os.walk`, symlinks to folders are not followed
+                    if not entry.is_symlink():
+                        subdirectories.append((entry.path, f"{rel_dir}{name}/"))
+                continue
+
+            if any(rule.matches(name, rel_dir, False) for rule in self.include) and not any(
+                rule.matches(name, rel_dir, False) for rule in exclude
+            ):
+                yield Path(entry.path)
+
+        for path, rel in subdirectories:
+            yield from self._walk(path, rel, exclude)
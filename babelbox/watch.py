@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Optional, Union
+
+from .archive import stat_source
+from .cache import ParseCache
+from .dialects import DialectDetector
+from .inheritance import dependents, resolve_languages
+from .parser import DialectLike, LoadedFile, find_csv_files, load_files
+from .walk import FileWalker
+
+__all__ = ["IncrementalBuild", "watch"]
+
+logger = logging.getLogger(__name__)
+
+
+class _ParsedFile:
+    __slots__ = ("stat", "prefix", "languages", "parents")
+
+    def __init__(
+        self,
+        stat: tuple[int, int],
+        prefix: str,
+        languages: dict[str, dict[str, str]],
+        parents: dict[str, str],
+    ):
+        self.stat = stat
+        self.prefix = prefix
+        self.languages = languages
+        self.parents = parents
+
+
+class IncrementalBuild:
+    """
+    Keeps the parsed files of sources in memory.
+
+    Each call to `update` only re-parses files that were added or modified since the last call and
+    re-merges the languages those files (or removed files) contributed to. Languages inheriting
+    from an affected language are affected too. Files that fail to parse are logged and keep their
+    last parsed translations until they are modified again.
+    """
+
+    def __init__(
+        self,
+        sources: Iterable[Union[str, os.PathLike]],
+        prefix_identifiers=False,
+        dialect: Optional[DialectLike] = None,
+        csv_dialect_overwrites: Optional[dict] = None,
+        cache: Optional[ParseCache] = None,
+        jobs: Optional[int] = 1,
+        dialect_detector: Optional[DialectDetector] = None,
+        walker: Optional[FileWalker] = None,
+    ):
+        self.sources = [Path(src) for src in sources]
+        self.prefix_identifiers = prefix_identifiers
+        self.dialect = dialect
+        self.csv_dialect_overwrites = csv_dialect_overwrites
+        self.cache = cache
+        self.jobs = jobs
+        self.dialect_detector = dialect_detector
+        self.walker = walker
+
+        self.languages: dict[str, dict[str, str]] = {}
+        self.parents: dict[str, str] = {}
+        self._files: dict[Path, _ParsedFile] = {}
+        self._order: list[Path] = []
+        # Stats of files that failed to parse, so they are only retried once they change
+        self._failed: dict[Path, tuple[int, int]] = {}
+
+    def update(self) -> dict[str, Mapping[str, str]]:
+        """ Re-parses changed files. Returns the resolved languages affected by the changes """
+
+        files: list[tuple[Path, str]] = []
+        for src in self.sources:
+            files.extend(find_csv_files(src, self.prefix_identifiers, self.walker))
+
+        order: list[Path] = []
+        stats: dict[Path, tuple[int, int]] = {}
+        changed: list[tuple[Path, str]] = []
+        for path, prefix in files:
+            try:
+                stats[path] = stat_source(path)
+            except OSError:
+                # Removed between walking and stat-ing
+                continue
+
+            order.append(path)
+            parsed = self._files.get(path)
+            if parsed is None or parsed.stat != stats[path] or parsed.prefix != prefix:
+                if self._failed.get(path) != stats[path]:
+                    changed.append((path, prefix))
+
+        for path in self._failed.keys() - stats.keys():
+            del self._failed[path]
+
+        loaded = self._load(changed, stats)
+        order = [path for path in order if path in self._files or path in loaded]
+
+        removed = self._files.keys() - stats.keys()
+        if not loaded and not removed and order == self._order:
+            return {}
+
+        affected: set[str] = set()
+        for path in removed:
+            logger.info(f"Removed {str(path)!r}")
+            affected.update(self._files.pop(path).languages)
+
+        for path, (prefix, (_, languages, _, parents)) in loaded.items():
+            logger.info(f"Parsed {str(path)!r}")
+            if (old := self._files.get(path)) is not None:
+                affected.update(old.languages)
+            affected.update(languages)
+            self._failed.pop(path, None)
+            self._files[path] = _ParsedFile(stats[path], prefix, languages, parents)
+
+        if order != self._order:
+            kept = set(order).intersection(self._order)
+            if [p for p in order if p in kept] != [p for p in self._order if p in kept]:
+                # Files were reordered, so any of their overrides might have changed
+                for parsed in self._files.values():
+                    affected.update(parsed.languages)
+            self._order = order
+
+        parents = {
+            code: parent
+            for path in self._order
+            for code, parent in self._files[path].parents.items()
+        }
+        affected |= dependents(self.parents, affected) | dependents(parents, affected)
+        self.parents = parents
+
+        self._merge(affected)
+        resolved = self.resolved_languages()
+        return {
+            code: translations for code, translations in resolved.items() if code in affected
+        }
+
+    def _load(
+        self, files: list[tuple[Path, str]], stats: dict[Path, tuple[int, int]]
+    ) -> dict[Path, tuple[str, LoadedFile]]:
+        try:
+            loaded = load_files(
+                files,
+                self.dialect,
+                self.csv_dialect_overwrites,
+                cache=self.cache,
+                jobs=self.jobs,
+                dialect_detector=self.dialect_detector,
+            )
+        except Exception:
+            if len(files) == 1:
+                path = files[0][0]
+                logger.exception(f"Failed to parse {str(path)!r}")
+                self._failed[path] = stats[path]
+                return {}
+
+            # Load the files one by one, so only the ones that fail are skipped
+            result: dict[Path, tuple[str, LoadedFile]] = {}
+            for file in files:
+                result.update(self._load([file], stats))
+            return result
+
+        return {path: (prefix, file) for (path, prefix), file in zip(files, loaded)}
+
+    def resolved_languages(self) -> dict[str, Mapping[str, str]]:
+        """ Returns the merged languages with inheriting languages resolved """
+
+        return resolve_languages(self.languages, self.parents)
+
+    def _merge(self, language_codes: set[str]):
+        merged: dict[str, dict[str, str]] = {}
+        for path in self._order:
+            for code, translations in self._files[path].languages.items():
+                if code in language_codes:
+                    merged.setdefault(code, {}).update(translations)
+
+        for code in language_codes:
+            if code in merged:
+                self.languages[code] = merged[code]
+            else:
+                self.languages.pop(code, None)
+
+
+def watch(
+    build: IncrementalBuild,
+    on_change: Callable[[dict[str, Mapping[str, str]]], object],
+    interval: float = 1.0,
+):
+    """
+    Polls the sources of `build` every `interval` seconds until interrupted.
+    `on_change` is called with the languages affected by each change, starting with the initial
+    build. Errors are logged and the sources are polled again after the next interval
+    """
+
+    try:
+        while True:
+            try:
+                languages = build.update()
+            except Exception:
+                logger.exception("Failed to update the build")
+            else:
+                if languages:
+                    on_change(languages)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
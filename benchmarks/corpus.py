@@ -0,0 +1,55 @@
+""" Generates synthetic csv corpora for benchmarks """
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import NamedTuple
+
+__all__ = ["CorpusSpec", "generate_corpus"]
+
+
+class CorpusSpec(NamedTuple):
+    files: int = 40
+    rows: int = 1000
+    languages: int = 15
+    depth: int = 3
+    comment_ratio: float = 0.05
+    empty_ratio: float = 0.05
+    seed: int = 0
+
+
+def generate_corpus(directory: Path, spec: CorpusSpec = CorpusSpec()) -> list[Path]:
+    """
+    Writes `spec.files` csv files into a folder tree below `directory`.
+
+    Every file has `spec.rows` rows and `spec.languages` language columns. Files are spread over a
+    tree `spec.depth` folders deep, so `--prefix-identifiers` produces long prefixes. A share of
+    rows are comments and a share of cells are left empty.
+    """
+
+    rng = random.Random(spec.seed)
+    codes = [f"lang_{i:03}" for i in range(spec.languages)]
+
+    paths = []
+    for f in range(spec.files):
+        folder = Path(directory, *(f"node{(f >> d) % 3}" for d in range(spec.depth)))
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"sheet{f}.csv"
+
+        lines = [",".join(["Identifier", *codes])]
+        for r in range(spec.rows):
+            if rng.random() < spec.comment_ratio:
+                lines.append(f"# Section {r}" + "," * spec.languages)
+                continue
+
+            cells = [
+                "" if rng.random() < spec.empty_ratio else f"Text {r} in {code} ✓"
+                for code in codes
+            ]
+            lines.append(",".join([f"item.sheet{f}.entry{r}", *cells]))
+
+        path.write_text("\n".join(lines) + "\n", "utf8")
+        paths.append(path)
+
+    return paths
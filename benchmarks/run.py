@@ -0,0 +1,206 @@
+"""
+Runs the babelbox benchmarks on a synthetic corpus.
+
+    $ python -m benchmarks.run                     # Compare against benchmarks/baseline.json
+    $ python -m benchmarks.run --update-baseline   # Record a new baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import babelbox
+from babelbox.serialize import get_serializer
+
+from .corpus import CorpusSpec, generate_corpus
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+Benchmark = Callable[["Context"], Callable[[], object]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+class Context:
+    def __init__(self, directory: Path, spec: CorpusSpec):
+        self.directory = directory
+        self.spec = spec
+        self.corpus = directory / "corpus"
+        self.out = directory / "out"
+        self.out.mkdir()
+        self.files = generate_corpus(self.corpus, spec)
+        # Single sheets with many language columns and with many rows
+        wide = spec._replace(files=1, languages=spec.languages * 10, depth=0)
+        long = spec._replace(files=1, rows=spec.rows * spec.files, depth=0)
+        (self.wide_sheet,) = generate_corpus(directory / "wide", wide)
+        (self.long_sheet,) = generate_corpus(directory / "long", long)
+        self.file_languages = [babelbox.load_languages_from_csv(f) for f in self.files]
+        self.languages = babelbox.merge_languages(self.file_languages)
+
+
+def benchmark(name: str):
+    def decorator(setup: Benchmark):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+@benchmark("load_languages_from_csv")
+def bench_load_languages_from_csv(ctx: Context):
+    return lambda: [babelbox.load_languages_from_csv(f) for f in ctx.files]
+
+
+@benchmark("load_languages_from_csv_wide")
+def bench_load_languages_from_csv_wide(ctx: Context):
+    return lambda: babelbox.load_languages_from_csv(ctx.wide_sheet)
+
+
+@benchmark("load_languages_from_csv_long")
+def bench_load_languages_from_csv_long(ctx: Context):
+    return lambda: babelbox.load_languages_from_csv(ctx.long_sheet)
+
+
+@benchmark("load_languages")
+def bench_load_languages(ctx: Context):
+    return lambda: babelbox.load_languages(ctx.corpus, prefix_identifiers=True)
+
+
+@benchmark("merge_languages")
+def bench_merge_languages(ctx: Context):
+    return lambda: babelbox.merge_languages(ctx.file_languages)
+
+
+@benchmark("write_language_files")
+def bench_write_language_files(ctx: Context):
+    return lambda: babelbox.write_language_files(ctx.out, ctx.languages, "\t")
+
+
+def bench_serialize(backend: str):
+    def setup(ctx: Context):
+        serializer = get_serializer(backend)
+        return lambda: [serializer(t, "\t") for t in ctx.languages.values()]
+
+    return setup
+
+
+# Compares the JSON backends of `write_language_files`, without the cost of writing files
+benchmark("serialize_json")(bench_serialize("json"))
+if importlib.util.find_spec("orjson") is not None:
+    benchmark("serialize_orjson")(bench_serialize("orjson"))
+
+
+@benchmark("cli")
+def bench_cli(ctx: Context):
+    args = [sys.executable, "-m", "babelbox", str(ctx.corpus), "-p", "-q", "-o", str(ctx.out)]
+    return lambda: subprocess.run(args, check=True)
+
+
+@benchmark("import")
+def bench_import(ctx: Context):
+    args = [sys.executable, "-c", "import babelbox"]
+    return lambda: subprocess.run(args, check=True)
+
+
+@benchmark("cli_startup")
+def bench_cli_startup(ctx: Context):
+    args = [sys.executable, "-m", "babelbox", "--version"]
+    return lambda: subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
+
+
+def run(spec: CorpusSpec, repeat: int = 3, names: Optional[list[str]] = None):
+    """ Returns the best of `repeat` wall times in seconds for each benchmark """
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        ctx = Context(Path(directory), spec)
+
+        for name, setup in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+
+            func = setup(ctx)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            results[name] = min(timings)
+
+    return results
+
+
+def find_regressions(results: dict[str, float], baseline: dict[str, float], tolerance: float):
+    return {
+        name: (baseline[name], seconds)
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + tolerance)
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*", help="Only run these benchmarks")
+    parser.add_argument("-o", "--output", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed slowdown relative to baseline"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--languages", type=int, default=defaults.languages)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    args = parser.parse_args(argv)
+
+    # Empty cells are logged as warnings. Measure them like `babelbox -q` would
+    logging.basicConfig(level=logging.ERROR)
+
+    spec = CorpusSpec(args.files, args.rows, args.languages, args.depth)
+    results = run(spec, args.repeat, args.names)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": spec._asdict(),
+        "results": results,
+    }
+
+    for name, seconds in results.items():
+        print(f"{name:<25} {seconds * 1000:10.2f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["corpus"] != report["corpus"]:
+        print("Corpus differs from baseline. Skipping regression check")
+        return 0
+
+    regressions = find_regressions(results, baseline["results"], args.tolerance)
+    for name, (before, after) in regressions.items():
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+""" Measures the import time of babelbox with `python -X importtime` """
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+
+__all__ = ["import_times", "imported_modules"]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \|(\s*)(\S+)")
+
+
+def import_times(statement: str = "import babelbox") -> dict[str, int]:
+    """ Returns the cumulative import time in microseconds of each top-level module imported """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if (match := _IMPORTTIME_LINE.match(line)) and len(match[3]) == 1:
+            times[match[4]] = times.get(match[4], 0) + int(match[2])
+    return times
+
+
+def imported_modules(statement: str = "import babelbox") -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return set(result.stdout.split())
@@ -35,3 +35,11 @@ def test(c, verbose=False, s=False):
     if os.system(f"poetry run pytest --cov={str(SRC_DIR)} --cov-report=xml {flags}") == 0:
         os.system("poetry run coverage report")
         os.system("poetry run coverage-badge -o coverage.svg -f")
+
+
+@task
+def bench(c, update_baseline=False):
+    """ Run benchmarks and compare them against the committed baseline """
+
+    flags = "--update-baseline" if update_baseline else ""
+    os.system(f"poetry run python -m benchmarks.run {flags}")
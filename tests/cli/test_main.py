@@ -1,11 +1,14 @@
+import json
 import logging
 from pathlib import Path
+from typing import List
 from unittest.mock import MagicMock, patch
 
 import pytest
 from pytest_insta import SnapshotFixture
 from typer.testing import CliRunner
 
+import babelbox
 from babelbox import cli
 
 
@@ -178,6 +181,263 @@ class Test_csv_dialect_options:
             }
 
 
+class Test_strict:
+    args = ["tests/cli/examples/tree/a.csv", "tests/cli/examples/tree", "-o", "build"]
+
+    def test_warn_duplicates(self, runner: CliRunner, caplog):
+        with patch("babelbox.cli.write_language_files", new=MagicMock()) as mock_write:
+            with patch("pathlib.Path.mkdir", new=MagicMock()):
+                result = runner.invoke(cli.app, self.args, catch_exceptions=False)
+
+                assert result.exit_code == 0
+                mock_write.assert_called_once()
+                assert "Duplicate identifier: 'x'" in caplog.text
+
+    def test_fail_on_duplicates(self, runner: CliRunner):
+        with patch("babelbox.cli.write_language_files", new=MagicMock()) as mock_write:
+            result = runner.invoke(cli.app, [*self.args, "--strict"], catch_exceptions=False)
+
+            assert result.exit_code == 1
+            assert "Found 2 duplicate identifiers" in result.output
+            mock_write.assert_not_called()
+
+
+class Test_include_exclude:
+    def test_exclude(self, runner: CliRunner):
+        with patch("babelbox.cli.write_language_files", new=MagicMock()) as mock_write:
+            args = ["tests/cli/examples/tree", "--exclude", "leave/"]
+            runner.invoke(cli.app, args, catch_exceptions=False)
+
+            mock_write.assert_called_once()
+            assert set(mock_write.call_args[0][1]["a"]) == {"x", "y", "s", "t"}
+
+    def test_include(self, runner: CliRunner, tmp_path: Path):
+        result = runner.invoke(
+            cli.app,
+            ["tests/cli/examples/tree", "--include", "a.csv", "-o", str(tmp_path)],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        assert json.loads((tmp_path / "a.json").read_text("utf8")) == {"x": "1", "y": "10"}
+
+
+class Test_stream:
+    def test_same_output(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "-p", "-o"]
+        runner.invoke(cli.app, [*args, str(tmp_path / "a")], catch_exceptions=False)
+        result = runner.invoke(
+            cli.app, [*args, str(tmp_path / "b"), "--stream"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+
+        for path in (tmp_path / "a").iterdir():
+            assert path.read_text("utf8") == (tmp_path / "b" / path.name).read_text("utf8")
+
+
+class Test_low_memory:
+    def test_same_translations(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "-p", "-o"]
+        runner.invoke(cli.app, [*args, str(tmp_path / "a")], catch_exceptions=False)
+        result = runner.invoke(
+            cli.app, [*args, str(tmp_path / "b"), "--low-memory"], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+
+        for path in (tmp_path / "a").iterdir():
+            expected = json.loads(path.read_text("utf8"))
+            assert json.loads((tmp_path / "b" / path.name).read_text("utf8")) == expected
+
+    def test_incompatible_options(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "--low-memory", "--strict", "-o", str(tmp_path)]
+        result = runner.invoke(cli.app, args)
+
+        assert result.exit_code == 1
+        assert not list(tmp_path.iterdir())
+
+
+class Test_watch:
+    @pytest.mark.parametrize("mode", [["--watch"], ["--serve", "0"]])
+    @pytest.mark.parametrize(
+        "option", ["--strict", "--stream", "--profile", "--memory-report"]
+    )
+    def test_incompatible_options(
+        self, runner: CliRunner, tmp_path: Path, mode: List[str], option: str
+    ):
+        args = ["tests/cli/examples/tree", *mode, option, "-o", str(tmp_path)]
+        with patch("babelbox.cli.watch") as mock_watch:
+            result = runner.invoke(cli.app, args)
+            mock_watch.assert_not_called()
+
+        assert result.exit_code == 1
+        assert f"can't be combined with {option}" in result.output
+        assert not list(tmp_path.iterdir())
+
+
+class Test_manifest:
+    def test_build_targets(self, runner: CliRunner, tmp_path: Path):
+        manifest = tmp_path / "babelbox.json"
+        examples = Path("tests/cli/examples").resolve()
+        targets = [
+            {"sources": [str(examples / "tree")], "out": "tree", "prefix_identifiers": True},
+            {"sources": [str(examples / "multiple_csv")], "out": "multiple", "minify": True},
+        ]
+        manifest.write_text(json.dumps({"targets": targets}), "utf8")
+
+        result = runner.invoke(cli.app, ["--manifest", str(manifest)], catch_exceptions=False)
+        assert result.exit_code == 0
+
+        expected = babelbox.load_languages(examples / "tree", prefix_identifiers=True)
+        for code, translations in expected.items():
+            assert (
+                json.loads((tmp_path / "tree" / f"{code}.json").read_text("utf8"))
+                == translations
+            )
+        assert list((tmp_path / "multiple").glob("*.json"))
+
+    @pytest.mark.parametrize(
+        "option",
+        [["-p"], ["--dialect", "excel"], ["-d", ";"], ["--indent", "  "], ["--minify"]],
+    )
+    def test_target_options(self, runner: CliRunner, tmp_path: Path, option: List[str]):
+        manifest = tmp_path / "babelbox.json"
+        examples = Path("tests/cli/examples").resolve()
+        targets = [{"sources": [str(examples / "tree")], "out": "tree"}]
+        manifest.write_text(json.dumps({"targets": targets}), "utf8")
+
+        result = runner.invoke(cli.app, ["--manifest", str(manifest), *option])
+        assert result.exit_code == 1
+        assert "can't be combined with" in result.output
+        assert not (tmp_path / "tree").exists()
+
+    def test_check(self, runner: CliRunner, tmp_path: Path):
+        manifest = tmp_path / "babelbox.json"
+        examples = Path("tests/cli/examples").resolve()
+        targets = [{"name": "tree", "sources": [str(examples / "tree")], "out": "tree"}]
+        manifest.write_text(json.dumps({"targets": targets}), "utf8")
+        args = ["--manifest", str(manifest)]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+
+        result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 0
+
+        (tmp_path / "tree" / "a.json").write_text("{}", "utf8")
+        result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 1
+        assert "tree: a.json: Missing" in result.output
+        assert (tmp_path / "tree" / "a.json").read_text("utf8") == "{}"
+
+    def test_invalid_manifest(self, runner: CliRunner, tmp_path: Path):
+        manifest = tmp_path / "babelbox.json"
+        manifest.write_text(json.dumps({"targets": [{"sources": []}]}), "utf8")
+
+        result = runner.invoke(cli.app, ["--manifest", str(manifest)])
+        assert result.exit_code == 1
+        assert "Missing 'out'" in result.output
+
+    def test_sources_and_manifest(self, runner: CliRunner, tmp_path: Path):
+        manifest = tmp_path / "babelbox.json"
+        manifest.write_text(json.dumps({"targets": []}), "utf8")
+
+        result = runner.invoke(
+            cli.app, ["tests/cli/examples/tree", "--manifest", str(manifest)]
+        )
+        assert result.exit_code == 1
+
+
+def test_memory_report(runner: CliRunner, tmp_path: Path):
+    args = ["tests/cli/examples/tree", "-o", str(tmp_path), "--memory-report"]
+    result = runner.invoke(cli.app, args, catch_exceptions=False)
+
+    assert result.exit_code == 0
+    assert "Memory per stage" in result.output
+    assert "tree/a.csv" in result.output.replace("\\", "/")
+
+
+class Test_check:
+    def test_up_to_date(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "-o", str(tmp_path)]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+
+        result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert "up to date" in result.output
+
+    def test_out_of_date(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "-o", str(tmp_path)]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+        (tmp_path / "a.json").write_text('{"x": "2"}', "utf8")
+        (tmp_path / "b.json").unlink()
+
+        result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 1
+        assert "a.json: Missing 'y'" in result.output
+        assert "a.json: Changed 'x'" in result.output
+        assert "b.json does not exist" in result.output
+        assert not (tmp_path / "b.json").exists()
+
+    def test_fingerprint_skips_parsing(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree", "-o", str(tmp_path / "out")]
+        args += ["--cache-dir", str(tmp_path / "cache")]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+
+        with patch("babelbox.cli.load_files") as mock_load_files:
+            result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 0
+        mock_load_files.assert_not_called()
+
+        (tmp_path / "out" / "a.json").write_text("{}", "utf8")
+        result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 1
+
+    def test_fingerprint_strict(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/tree/a.csv", "tests/cli/examples/tree"]
+        args += ["-o", str(tmp_path / "out"), "--cache-dir", str(tmp_path / "cache")]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+
+        result = runner.invoke(cli.app, [*args, "--check", "--strict"], catch_exceptions=False)
+        assert result.exit_code == 1
+        assert "duplicate identifiers" in result.output
+
+    def test_fingerprint_per_output(self, runner: CliRunner, tmp_path: Path):
+        cache = ["--cache-dir", str(tmp_path / "cache")]
+        a = ["tests/cli/examples/tree", "-o", str(tmp_path / "a"), *cache]
+        b = ["tests/cli/examples/multiple_csv", "-o", str(tmp_path / "b"), *cache]
+        runner.invoke(cli.app, a, catch_exceptions=False)
+        runner.invoke(cli.app, b, catch_exceptions=False)
+
+        for args in (a, b):
+            with patch("babelbox.cli.load_files") as mock_load_files:
+                result = runner.invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+            assert result.exit_code == 0
+            mock_load_files.assert_not_called()
+
+
+class Test_catalog:
+    def test_compile(self, runner: CliRunner, tmp_path: Path):
+        args = ["tests/cli/examples/multiple_csv", "-o", str(tmp_path / "out")]
+        result = runner.invoke(
+            cli.app,
+            [*args, "--catalog", str(tmp_path / "catalog.bbx")],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+
+        with babelbox.Catalog(tmp_path / "catalog.bbx") as catalog:
+            for path in (tmp_path / "out").glob("*.json"):
+                assert catalog.language(path.stem) == json.loads(path.read_text("utf8"))
+
+    def test_dry(self, runner: CliRunner, tmp_path: Path):
+        args = [
+            "tests/cli/examples/multiple_csv",
+            "--dry",
+            "--catalog",
+            str(tmp_path / "c.bbx"),
+        ]
+        runner.invoke(cli.app, args, catch_exceptions=False)
+
+        assert not (tmp_path / "c.bbx").exists()
+
+
 class Test_logging:
     def test_default_loglevel(self, runner: CliRunner):
         with patch("logging.basicConfig") as mock_logconfig:
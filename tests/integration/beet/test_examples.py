@@ -1,8 +1,11 @@
 import os
+from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 from beet import run_beet
+from beet.core.cache import MultiCache
 from pytest_insta import SnapshotFixture
 
 
@@ -11,3 +14,32 @@ def test_build(snapshot: SnapshotFixture, directory: str):
     with run_beet(directory=f"tests/integration/beet/examples/{directory}") as ctx:
         languages = list(map(lambda l: {l[0]: l[1].content}, ctx.assets.languages.items()))
         assert snapshot("resourcepack.json") == languages
+
+
+def test_cache(tmp_path: Path):
+    cache = MultiCache(tmp_path)
+    directory = "tests/integration/beet/examples/tree"
+
+    with run_beet(directory=directory, cache=cache) as ctx:
+        expected = {code: lang.content for code, lang in ctx.assets.languages.items()}
+
+    with patch("babelbox.parser.load_languages_from_csv") as mock_load_csv:
+        with run_beet(directory=directory, cache=cache) as ctx:
+            mock_load_csv.assert_not_called()
+            assert {
+                code: lang.content for code, lang in ctx.assets.languages.items()
+            } == expected
+
+    assert (tmp_path / "babelbox" / "dialects.json").is_file()
+
+
+def test_overlapping_patterns_load_once():
+    config = {
+        "pipeline": ["babelbox.integration.beet"],
+        "meta": {"babelbox": {"load": ["root", "root/**/*.csv", "root"]}},
+    }
+
+    with patch("babelbox.parser.load_languages_from_csv", return_value={}) as mock_load_csv:
+        with run_beet(config, directory="tests/integration/beet/examples/tree"):
+            paths = [call.args[0] for call in mock_load_csv.call_args_list]
+            assert len(paths) == len(set(paths)) > 0
@@ -16,3 +16,14 @@ def test_prefix_filename(snapshot: SnapshotFixture):
     assert snapshot("languages.json") == babelbox.load_languages(
         "tests/parser/examples/misc", True
     )
+
+
+@pytest.mark.parametrize(
+    "directory", ["tests/parser/examples/misc", "tests/cli/examples/tree"]
+)
+def test_parallel(directory):
+    serial = babelbox.load_languages(directory, True)
+    parallel = babelbox.load_languages(directory, True, jobs=2)
+
+    assert parallel == serial
+    assert {c: list(t) for c, t in parallel.items()} == {c: list(t) for c, t in serial.items()}
@@ -5,7 +5,7 @@ import unittest.mock
 from pathlib import Path
 from re import match
 from typing import Type, cast
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from _pytest.logging import LogCaptureFixture
@@ -220,6 +220,30 @@ class Test_parsing:
                 "b": {"x": "2", "# A Comment": ""},
             }
 
+    def test_duplicate_columns(self):
+        """ Like csv.DictReader, the last column with the same name wins """
+
+        data = """Ident,a,a
+                x,1,2"""
+        with patch("builtins.open", mock_open(read_data=inspect.cleandoc(data))):
+            languages = babelbox.load_languages_from_csv("test.csv")
+            assert languages == {"a": {"x": "2"}}
+
+    def test_missing_and_extra_cells(self, caplog: LogCaptureFixture):
+        data = """Ident,a,b
+                x,1
+                y,3,4,5
+                ,,,6"""
+        with caplog.at_level(logging.WARNING):
+            with patch("builtins.open", mock_open(read_data=inspect.cleandoc(data))):
+                languages = babelbox.load_languages_from_csv("test.csv")
+                assert languages == {"a": {"x": "1", "y": "3"}, "b": {"x": "", "y": "4"}}
+
+            assert [r.getMessage() for r in caplog.records] == [
+                "'test.csv'@4: Non-empty line is missing identifier",
+                "'test.csv': Locale 'b' has no translation for 'x'",
+            ]
+
     def test_enswith_newlines(self):
         languages = babelbox.load_languages_from_csv(
             "tests/parser/examples/ends_with_newlines.csv",
@@ -231,6 +255,23 @@ class Test_parsing:
         }
 
 
+class Test_line_numbers:
+    def test(self):
+        data = """Ident,a,b
+                # Comment
+
+                x,1,2
+                "y
+                z",3,4
+                w,5,6"""
+
+        line_numbers = {}
+        with patch("builtins.open", mock_open(read_data=inspect.cleandoc(data))):
+            babelbox.load_languages_from_csv("test.csv", "p.", line_numbers=line_numbers)
+
+        assert line_numbers == {"p.x": 4, "p.y\nz": 6, "p.w": 7}
+
+
 class Test_prefix:
     def test(self):
         data = """Ident,a,b
@@ -270,11 +311,8 @@ class Test_dialect:
     )
     def test_sniff_dialect(self, data, expected_dialect):
         with patch("builtins.open", mock_open(read_data=inspect.cleandoc(data))):
-            with patch("csv.DictReader.__init__", new=MagicMock()) as mock_reader:
-                mock_reader.return_value = None
-
-                with pytest.raises(AttributeError):
-                    babelbox.load_languages_from_csv("test.csv")
+            with patch("csv.reader", return_value=iter([])) as mock_reader:
+                babelbox.load_languages_from_csv("test.csv")
 
                 mock_reader.assert_called_once()
                 dialect = cast(Type[csv.Dialect], mock_reader.call_args_list[0][1]["dialect"])
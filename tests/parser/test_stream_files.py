@@ -0,0 +1,60 @@
+import itertools
+import time
+from pathlib import Path
+
+import pytest
+
+import babelbox
+from babelbox.cache import ParseCache
+
+DIRECTORY = "tests/cli/examples/tree"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_same_as_load_files(jobs: int):
+    files = babelbox.find_csv_files(DIRECTORY, True)
+    streamed = list(babelbox.stream_files(iter(files), jobs=jobs, queue_size=2))
+
+    assert streamed == babelbox.load_files(files)
+
+
+def test_iter_csv_files():
+    assert list(babelbox.iter_csv_files(DIRECTORY, True)) == babelbox.find_csv_files(
+        DIRECTORY, True
+    )
+
+
+def test_cache(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    files = babelbox.find_csv_files(DIRECTORY, True)
+    expected = list(babelbox.stream_files(files, cache=cache))
+
+    assert list(babelbox.stream_files(files, cache=cache)) == expected
+    assert (tmp_path / ParseCache.STATS_FILE).exists()
+
+
+def test_bounded():
+    walked = 0
+
+    def files():
+        nonlocal walked
+        for path, prefix in itertools.cycle(babelbox.find_csv_files(DIRECTORY)):
+            walked += 1
+            yield path, prefix
+
+    stream = babelbox.stream_files(files(), queue_size=2)
+    next(stream)
+    time.sleep(0.2)
+
+    # Queued walked files, the window of parsed files and the one in hand
+    assert walked <= 2 + 2 + 2
+    stream.close()
+
+
+def test_walk_error():
+    def files():
+        yield from babelbox.find_csv_files(DIRECTORY)
+        raise OSError("walk failed")
+
+    with pytest.raises(OSError, match="walk failed"):
+        list(babelbox.stream_files(files()))
@@ -11,14 +11,40 @@ def test():
     dest_dir = Path("tests/cli/res")
 
     expected_langfile_path = Path("tests/cli/res/en_us.json")
-    expected_json = {"x": "1", "y": "2"}
+    expected_json = b'{"x": "1", "y": "2"}'
 
     with patch("builtins.open", new=MagicMock()) as mock_open:
-        with patch("json.dump", new=MagicMock()) as mock_dump:
-            babelbox.write_language_files(dest_dir, languages)
+        babelbox.write_language_files(dest_dir, languages)
 
-            mock_open.assert_called_once()
-            assert mock_open.call_args[0][0] == expected_langfile_path
+        mock_open.assert_called_once()
+        assert mock_open.call_args[0][0] == expected_langfile_path
 
-            mock_dump.assert_called_once()
-            assert mock_dump.call_args[0][0] == expected_json
+        # The document is written with a single call
+        mock_write = mock_open.return_value.__enter__.return_value.write
+        mock_write.assert_called_once_with(expected_json)
+
+
+class Test_skip_unchanged:
+    def test_write_new_files(self, tmp_path: Path):
+        languages = {"en_us": {"x": "1"}, "de_de": {"x": "ä"}}
+
+        result = babelbox.write_language_files(tmp_path, languages, "\t", skip_unchanged=True)
+
+        assert sorted(result.written) == [tmp_path / "de_de.json", tmp_path / "en_us.json"]
+        assert result.skipped == []
+        assert (tmp_path / "de_de.json").read_text("utf8") == '{\n\t"x": "ä"\n}'
+
+    def test_skip_unchanged_files(self, tmp_path: Path):
+        languages = {"en_us": {"x": "1"}, "de_de": {"x": "2"}}
+        babelbox.write_language_files(tmp_path, languages)
+        mtime = (tmp_path / "en_us.json").stat().st_mtime_ns
+
+        languages["de_de"]["x"] = "3"
+        result = babelbox.write_language_files(
+            tmp_path, languages, skip_unchanged=True, jobs=2
+        )
+
+        assert result.written == [tmp_path / "de_de.json"]
+        assert result.skipped == [tmp_path / "en_us.json"]
+        assert (tmp_path / "en_us.json").stat().st_mtime_ns == mtime
+        assert (tmp_path / "de_de.json").read_text("utf8") == '{"x": "3"}'
@@ -0,0 +1,176 @@
+import json
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+import babelbox
+from babelbox import archive, cli
+from babelbox.cache import ParseCache
+from babelbox.walk import FileWalker
+
+TREE = Path("tests/cli/examples/tree")
+
+
+def make_zip(path: Path, files: dict, folder=""):
+    with zipfile.ZipFile(path, "w") as f:
+        for name, content in files.items():
+            f.writestr(folder + name, content)
+    return path
+
+
+def zip_tree(path: Path, folder=""):
+    files = {f.relative_to(TREE).as_posix(): f.read_bytes() for f in TREE.rglob("*.csv")}
+    return make_zip(path, files, folder)
+
+
+def read_zip(path: Path):
+    with zipfile.ZipFile(path) as f:
+        return {name: f.read(name).decode("utf8") for name in f.namelist()}
+
+
+@pytest.mark.parametrize("prefix_identifiers", [False, True])
+def test_zip_source(tmp_path: Path, prefix_identifiers):
+    pack = zip_tree(tmp_path / "pack.zip")
+
+    languages = babelbox.load_languages(pack, prefix_identifiers=prefix_identifiers)
+    assert languages == babelbox.load_languages(TREE, prefix_identifiers=prefix_identifiers)
+
+
+def test_tar_source(tmp_path: Path):
+    pack = tmp_path / "pack.tar.gz"
+    with tarfile.open(pack, "w:gz") as f:
+        f.add(TREE, arcname="lang")
+
+    languages = babelbox.load_languages(pack / "lang", prefix_identifiers=True)
+    assert languages == babelbox.load_languages(TREE, prefix_identifiers=True)
+
+
+def test_tar_with_dot_prefix(tmp_path: Path):
+    # Like `tar -czf pack.tgz .` inside of the tree
+    pack = tmp_path / "pack.tgz"
+    with tarfile.open(pack, "w:gz") as f:
+        f.add(TREE, arcname=".")
+
+    assert archive.list_members(pack)[0] == "a.csv"
+    languages = babelbox.load_languages(pack, prefix_identifiers=True)
+    assert languages == babelbox.load_languages(TREE, prefix_identifiers=True)
+    assert archive.stat_source(pack / "node/b.csv")[1] == (TREE / "node/b.csv").stat().st_size
+
+
+def test_folder_in_archive(tmp_path: Path):
+    pack = zip_tree(tmp_path / "pack.zip", "assets/lang/")
+
+    files = babelbox.find_csv_files(pack / "assets/lang/node", True)
+    assert [prefix for _, prefix in files] == ["b.", "leave.c."]
+
+    file = pack / "assets/lang/a.csv"
+    assert babelbox.load_languages(file) == babelbox.load_languages(TREE / "a.csv")
+
+
+def test_exclude(tmp_path: Path):
+    pack = zip_tree(tmp_path / "pack.zip")
+
+    walker = FileWalker(exclude=["leave/", "a.csv"])
+    assert list(walker.walk_archive(pack)) == [pack / "node/b.csv"]
+
+
+def test_cache(tmp_path: Path):
+    pack = zip_tree(tmp_path / "pack.zip")
+    cache = ParseCache(tmp_path / "cache")
+    babelbox.load_languages(pack, cache=cache)
+
+    languages = babelbox.load_languages(pack, cache=ParseCache(tmp_path / "cache"))
+    assert languages == babelbox.load_languages(TREE)
+
+    make_zip(pack, {"a.csv": "id,en_us\nx,changed\n"})
+    assert babelbox.load_languages(pack, cache=cache) == {"en_us": {"x": "changed"}}
+
+
+def test_write_zip(tmp_path: Path):
+    pack = make_zip(tmp_path / "pack.zip", {"pack.mcmeta": "{}", "assets/lang/old.json": "{}"})
+    dest = pack / "assets/lang"
+
+    result = babelbox.write_language_files(dest, {"en_us": {"x": "1"}, "de_de": {"x": "ä"}})
+
+    assert result.written == [dest / "en_us.json", dest / "de_de.json"]
+    assert read_zip(pack) == {
+        "pack.mcmeta": "{}",
+        "assets/lang/old.json": "{}",
+        "assets/lang/en_us.json": '{"x": "1"}',
+        "assets/lang/de_de.json": '{"x": "ä"}',
+    }
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_write_zip_skip_unchanged(tmp_path: Path):
+    pack = tmp_path / "out" / "pack.zip"
+    babelbox.write_language_files(pack, {"en_us": {"x": "1"}, "de_de": {"x": "2"}})
+    os.utime(pack, ns=(0, 0))
+
+    result = babelbox.write_language_files(pack, {"en_us": {"x": "1"}}, skip_unchanged=True)
+    assert result.skipped == [pack / "en_us.json"]
+    assert pack.stat().st_mtime_ns == 0
+
+    result = babelbox.write_language_files(pack, {"en_us": {"x": "3"}}, skip_unchanged=True)
+    assert result.written == [pack / "en_us.json"]
+    assert json.loads(read_zip(pack)["en_us.json"]) == {"x": "3"}
+    assert "de_de.json" in read_zip(pack)
+
+
+def test_split_paths(tmp_path: Path):
+    pack = make_zip(tmp_path / "pack.zip", {})
+
+    assert archive.split_archive_path(pack / "a/b.csv") == (pack, "a/b.csv")
+    assert archive.split_archive_path(pack) == (pack, "")
+    assert archive.split_archive_path(tmp_path / "missing.zip/a") is None
+    assert archive.split_output_path(tmp_path / "missing.zip/a") == (
+        tmp_path / "missing.zip",
+        "a",
+    )
+    assert archive.split_output_path(tmp_path / "a") is None
+
+
+class Test_cli:
+    def test_zip_to_zip(self, tmp_path: Path):
+        pack = zip_tree(tmp_path / "pack.zip", "lang/")
+        out = tmp_path / "out.zip" / "assets" / "minecraft" / "lang"
+        args = [str(pack / "lang"), "-o", str(out), "-p", "--minify"]
+
+        result = CliRunner().invoke(cli.app, args, catch_exceptions=False)
+        assert result.exit_code == 0
+
+        languages = babelbox.load_languages(TREE, prefix_identifiers=True)
+        assert read_zip(tmp_path / "out.zip") == {
+            f"assets/minecraft/lang/{code}.json": json.dumps(translations, ensure_ascii=False)
+            for code, translations in languages.items()
+        }
+
+        result = CliRunner().invoke(cli.app, [*args, "--check"], catch_exceptions=False)
+        assert result.exit_code == 0
+
+    def test_low_memory_profile(self, tmp_path: Path):
+        pack = zip_tree(tmp_path / "pack.zip")
+        out = tmp_path / "out"
+        args = [str(pack), "-o", str(out), "--low-memory", "--profile"]
+
+        result = CliRunner().invoke(cli.app, args, catch_exceptions=False)
+        assert result.exit_code == 0
+        assert json.loads((out / "a.json").read_text("utf8"))["x"] == "1"
+
+    def test_default_out(self, tmp_path: Path):
+        pack = zip_tree(tmp_path / "pack.zip")
+
+        result = CliRunner().invoke(cli.app, [str(pack)], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert (tmp_path / "a.json").exists()
+
+    def test_out_is_file(self, tmp_path: Path):
+        (tmp_path / "out").write_text("", "utf8")
+
+        result = CliRunner().invoke(cli.app, [str(TREE), "-o", str(tmp_path / "out")])
+        assert result.exit_code == 2
+        assert "is a file" in result.output
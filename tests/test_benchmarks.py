@@ -0,0 +1,30 @@
+import csv
+from pathlib import Path
+
+from benchmarks import run
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+
+def test_generate_corpus(tmp_path: Path):
+    spec = CorpusSpec(files=4, rows=10, languages=3, depth=2)
+    files = generate_corpus(tmp_path, spec)
+
+    assert len(files) == 4
+    assert all(len(f.relative_to(tmp_path).parts) == 3 for f in files)
+
+    with open(files[0], newline="", encoding="utf8") as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 11
+    assert all(len(row) == 4 for row in rows)
+
+
+def test_run():
+    results = run.run(CorpusSpec(files=2, rows=5, languages=2, depth=1), repeat=1)
+    assert set(results) == set(run.BENCHMARKS)
+
+
+def test_find_regressions():
+    results = {"a": 1.0, "b": 2.0, "c": 1.0}
+    baseline = {"a": 1.0, "b": 1.0}
+
+    assert run.find_regressions(results, baseline, tolerance=0.5) == {"b": (1.0, 2.0)}
@@ -0,0 +1,154 @@
+import json
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+
+import babelbox
+from babelbox.cache import ParseCache
+from babelbox.diagnostics import Diagnostics
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    return ParseCache(tmp_path / "cache")
+
+
+class Test_key:
+    def test_same_content(self, cache: ParseCache):
+        assert cache.key(b"a,b") == cache.key(b"a,b")
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ((b"a,b",), (b"a,c",)),
+            ((b"a,b", ""), (b"a,b", "x.")),
+            ((b"a,b", "", None), (b"a,b", "", "excel")),
+            ((b"a,b", "", None, {"delimiter": ","}), (b"a,b", "", None, {"delimiter": "|"})),
+        ],
+    )
+    def test_different_settings(self, cache: ParseCache, a, b):
+        assert cache.key(*a) != cache.key(*b)
+
+
+class Test_file_key:
+    def test_matches_key(self, cache: ParseCache, tmp_path: Path):
+        path = tmp_path / "a.csv"
+        path.write_bytes(b"a,b")
+
+        assert cache.file_key(path, "x.") == cache.key(b"a,b", "x.")
+
+    def test_unchanged_file_not_read(self, cache: ParseCache, tmp_path: Path):
+        path = tmp_path / "a.csv"
+        path.write_bytes(b"a,b")
+        key = cache.file_key(path)
+        cache.save()
+
+        cache = ParseCache(cache.directory)
+        with patch.object(Path, "read_bytes") as mock_read_bytes:
+            assert cache.file_key(path) == key
+            mock_read_bytes.assert_not_called()
+
+    def test_changed_file(self, cache: ParseCache, tmp_path: Path):
+        path = tmp_path / "a.csv"
+        path.write_bytes(b"a,b")
+        key = cache.file_key(path)
+
+        path.write_bytes(b"a,b,c")
+        assert cache.file_key(path) != key
+
+    def test_prune_stats(self, cache: ParseCache, tmp_path: Path):
+        paths = [tmp_path / name for name in ("kept.csv", "removed.csv", "used.csv")]
+        for path in paths:
+            path.write_bytes(b"a,b")
+            cache.file_key(path)
+        cache.save()
+
+        paths[1].unlink()
+        paths[2].write_bytes(b"a,b,c")
+        cache = ParseCache(cache.directory)
+        cache.file_key(paths[2])
+        cache.save()
+
+        stats = json.loads((cache.directory / ParseCache.STATS_FILE).read_text("utf8"))
+        assert sorted(stats) == [str(paths[0]), str(paths[2])]
+
+
+class Test_get_put:
+    def test_miss(self, cache: ParseCache):
+        assert cache.get(cache.key(b"")) is None
+
+    def test_roundtrip(self, cache: ParseCache):
+        languages = {"en_us": {"x": "ඣ"}, "de_de": {"x": ""}}
+        key = cache.key(b"x")
+
+        cache.put(key, languages)
+        assert cache.get(key) == languages
+
+    def test_evict_least_recently_used(self, tmp_path: Path):
+        cache = ParseCache(tmp_path, max_size=160)
+        languages = {"a": {"x": "1" * 20}}
+
+        cache.put("old", languages)
+        cache.put("new", languages)
+        cache.put("newest", languages)
+
+        assert cache.get("old") is None
+        assert cache.get("new") == languages
+        assert cache.get("newest") == languages
+
+
+class Test_load_languages:
+    def test_reuse_cached_files(self, cache: ParseCache):
+        expected = babelbox.load_languages("tests/parser/examples/misc", True, cache=cache)
+
+        with patch("babelbox.parser.load_languages_from_csv") as mock_load_csv:
+            languages = babelbox.load_languages(
+                "tests/parser/examples/misc", True, cache=cache
+            )
+            mock_load_csv.assert_not_called()
+
+        assert languages == expected
+
+    def test_settings_invalidate(self, cache: ParseCache):
+        babelbox.load_languages("tests/parser/examples/misc", False, cache=cache)
+
+        with patch(
+            "babelbox.parser.load_languages_from_csv", return_value={}
+        ) as mock_load_csv:
+            babelbox.load_languages("tests/parser/examples/misc", True, cache=cache)
+            assert mock_load_csv.call_count == 3
+
+    def test_detected_dialect(self, cache: ParseCache, tmp_path: Path):
+        src = tmp_path / "src"
+        src.mkdir()
+        # Can't be sniffed, so it falls back to the dialect of other files in its directory
+        (src / "b.csv").write_text("Ident;en_us\ny;a,b;c\n", "utf8")
+        detector = babelbox.DialectDetector()
+        babelbox.load_languages(src, cache=cache, dialect_detector=detector)
+
+        (src / "a.csv").write_text("Ident;en_us\nx;1\n", "utf8")
+        detector = babelbox.DialectDetector()
+        languages = babelbox.load_languages(src, cache=cache, dialect_detector=detector)
+        assert languages == {"en_us": {"x": "1", "y": "a,b"}}
+
+    def test_replay_diagnostics(
+        self, cache: ParseCache, tmp_path: Path, caplog: LogCaptureFixture
+    ):
+        (tmp_path / "a.csv").write_text("Ident,en_us,de_de\nx,1,\n,2,3\n", "utf8")
+
+        with caplog.at_level(logging.WARNING):
+            babelbox.load_languages(tmp_path / "a.csv", cache=cache)
+        expected = caplog.messages
+        assert any("missing identifier" in message for message in expected)
+        caplog.clear()
+
+        with caplog.at_level(logging.WARNING):
+            babelbox.load_languages(tmp_path / "a.csv", cache=cache)
+        assert caplog.messages == expected
+
+        diagnostics = Diagnostics()
+        babelbox.load_languages(tmp_path / "a.csv", cache=cache, diagnostics=diagnostics)
+        assert list(diagnostics.messages()) == expected
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+import babelbox
+from babelbox.catalog import Catalog, write_catalog
+
+LANGUAGES = {
+    "en_us": {"x": "1", "y": "2", "empty": ""},
+    "de_de": {"y": "ඣ", "z": "3"},
+}
+
+
+@pytest.fixture
+def catalog(tmp_path: Path):
+    with Catalog(write_catalog(tmp_path / "catalog.bbx", LANGUAGES)) as catalog:
+        yield catalog
+
+
+class Test_catalog:
+    def test_get(self, catalog: Catalog):
+        assert catalog.get("en_us", "x") == "1"
+        assert catalog.get("de_de", "y") == "ඣ"
+        assert catalog.get("en_us", "empty") == ""
+        assert catalog["de_de", "z"] == "3"
+
+    def test_missing(self, catalog: Catalog):
+        assert catalog.get("en_us", "z") is None
+        assert catalog.get("en_us", "unknown", "default") == "default"
+        assert catalog.get("fr_fr", "x") is None
+        assert ("de_de", "x") not in catalog
+        with pytest.raises(KeyError):
+            catalog["de_de", "x"]
+
+    def test_languages(self, catalog: Catalog):
+        assert catalog.languages == ["en_us", "de_de"]
+        assert len(catalog) == 4
+        assert list(catalog.identifiers()) == ["x", "y", "empty", "z"]
+        assert {code: catalog.language(code) for code in catalog.languages} == LANGUAGES
+
+    def test_many_identifiers(self, tmp_path: Path):
+        languages = {"en_us": {f"item.{i}": str(i) for i in range(5000)}}
+
+        with Catalog(write_catalog(tmp_path / "catalog.bbx", languages)) as catalog:
+            assert all(catalog.get("en_us", f"item.{i}") == str(i) for i in range(5000))
+            assert catalog.get("en_us", "item.5000") is None
+
+    def test_empty(self, tmp_path: Path):
+        with Catalog(write_catalog(tmp_path / "catalog.bbx", {})) as catalog:
+            assert catalog.languages == []
+            assert catalog.get("en_us", "x") is None
+
+    def test_invalid_file(self, tmp_path: Path):
+        path = tmp_path / "catalog.bbx"
+        path.write_bytes(b"{}\n")
+
+        with pytest.raises(ValueError):
+            Catalog(path)
+
+    def test_from_table(self, tmp_path: Path):
+        table = babelbox.TranslationTable(LANGUAGES)
+
+        with Catalog(write_catalog(tmp_path / "catalog.bbx", table)) as catalog:
+            assert catalog.language("de_de") == LANGUAGES["de_de"]
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+import babelbox
+from babelbox.check import LanguageDiff, diff_language_files, fingerprint
+
+LANGUAGES = {"en_us": {"x": "1", "y": "2"}, "de_de": {"x": "ä"}}
+
+
+class Test_diff_language_files:
+    def test_up_to_date(self, tmp_path: Path):
+        babelbox.write_language_files(tmp_path, LANGUAGES, "\t")
+
+        assert diff_language_files(tmp_path, LANGUAGES, "\t") == {}
+
+    def test_differences(self, tmp_path: Path):
+        babelbox.write_language_files(tmp_path, {"en_us": {"x": "0", "z": "3"}})
+
+        assert diff_language_files(tmp_path, LANGUAGES) == {
+            "en_us": LanguageDiff("en_us", ["y"], ["z"], ["x"]),
+            "de_de": LanguageDiff("de_de", ["x"], [], [], exists=False),
+        }
+
+    def test_formatting(self, tmp_path: Path):
+        babelbox.write_language_files(tmp_path, LANGUAGES)
+
+        diffs = diff_language_files(tmp_path, LANGUAGES, "\t")
+        assert list(diffs["en_us"].messages()) == ["en_us.json is formatted differently"]
+
+    def test_messages(self):
+        diff = LanguageDiff("en_us", ["a", "b", "c"], [], ["d"])
+
+        assert list(diff.messages(2)) == [
+            "en_us.json: Missing 'a', 'b' and 1 more",
+            "en_us.json: Changed 'd'",
+        ]
+
+
+class Test_fingerprint:
+    def test_stable(self, tmp_path: Path):
+        source = tmp_path / "a.csv"
+        source.write_text("Ident,en_us\nx,1\n", "utf8")
+        files = [(source, "")]
+
+        assert fingerprint(files, tmp_path, [None]) == fingerprint(files, tmp_path, [None])
+        assert fingerprint(files, tmp_path, [None]) != fingerprint(files, tmp_path, ["\t"])
+
+    def test_changed_files(self, tmp_path: Path):
+        source = tmp_path / "a.csv"
+        source.write_text("Ident,en_us\nx,1\n", "utf8")
+        (tmp_path / "out").mkdir()
+        files = [(source, "")]
+        before = fingerprint(files, tmp_path / "out", None)
+
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        after_source = fingerprint(files, tmp_path / "out", None)
+        assert after_source != before
+
+        (tmp_path / "out" / "en_us.json").write_text("{}", "utf8")
+        assert fingerprint(files, tmp_path / "out", None) != after_source
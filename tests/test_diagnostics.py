@@ -0,0 +1,113 @@
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+
+import babelbox
+from babelbox.cache import ParseCache
+from babelbox.diagnostics import Diagnostics
+
+MISSING = "tests/parser/examples/misc/missing_translations.csv"
+
+
+@pytest.fixture
+def diagnostics():
+    return Diagnostics()
+
+
+class Test_collect:
+    def test_no_logging(self, diagnostics: Diagnostics, caplog: LogCaptureFixture):
+        with caplog.at_level(logging.WARNING):
+            babelbox.load_languages_from_csv(MISSING, diagnostics=diagnostics)
+            assert not caplog.records
+
+        f = diagnostics.files[MISSING]
+        assert f.languages == ["en_us", "de_de"]
+        assert f.rows == 2
+        assert f.missing == {"en_us": 1, "de_de": 1}
+        assert f.examples == {"en_us": ["spoon"], "de_de": ["cat"]}
+        assert diagnostics.missing == 2
+
+    def test_coverage(self, diagnostics: Diagnostics):
+        babelbox.load_languages("tests/parser/examples/misc", diagnostics=diagnostics)
+
+        assert diagnostics.coverage()[MISSING] == {"en_us": 0.5, "de_de": 0.5}
+        assert diagnostics.language_coverage() == {
+            "en_us": 0.5,
+            "de_de": 0.5,
+            "a": 1.0,
+            "b": 1.0,
+        }
+
+    def test_max_examples(self):
+        diagnostics = Diagnostics(max_examples=2)
+        f = diagnostics.file("a.csv")
+        for identifier in "xyz":
+            f.missing_translation("en_us", identifier)
+
+        assert f.examples == {"en_us": ["x", "y"]}
+        assert list(diagnostics.messages()) == [
+            "'a.csv': Locale 'en_us' has no translation for 'x'",
+            "'a.csv': Locale 'en_us' has no translation for 'y'",
+            "'a.csv': Locale 'en_us' has no translation for 1 more identifiers",
+        ]
+
+    def test_parallel(self, diagnostics: Diagnostics):
+        babelbox.load_languages("tests/parser/examples/misc", jobs=2, diagnostics=diagnostics)
+        assert diagnostics.files[Path(MISSING)].missing == {"en_us": 1, "de_de": 1}
+
+    def test_cache_hit(self, diagnostics: Diagnostics, tmp_path: Path):
+        cache = ParseCache(tmp_path)
+        babelbox.load_languages("tests/parser/examples/misc", cache=cache)
+
+        with patch("babelbox.parser.load_languages_from_csv") as mock_load_csv:
+            babelbox.load_languages(
+                "tests/parser/examples/misc", cache=cache, diagnostics=diagnostics
+            )
+            mock_load_csv.assert_not_called()
+
+        assert diagnostics.files[Path(MISSING)].examples == {
+            "en_us": ["spoon"],
+            "de_de": ["cat"],
+        }
+
+
+class Test_report:
+    def test_report(self, diagnostics: Diagnostics, caplog: LogCaptureFixture):
+        babelbox.load_languages_from_csv(MISSING, diagnostics=diagnostics)
+
+        with caplog.at_level(logging.WARNING):
+            diagnostics.report(logging.getLogger("test"))
+            assert [r.getMessage() for r in caplog.records] == list(diagnostics.messages())
+
+    def test_not_rendered_if_disabled(self, diagnostics: Diagnostics):
+        babelbox.load_languages_from_csv(MISSING, diagnostics=diagnostics)
+
+        with patch.object(Diagnostics, "messages") as mock_messages:
+            logger = logging.getLogger("test.disabled")
+            logger.setLevel(logging.ERROR)
+            diagnostics.report(logger)
+            mock_messages.assert_not_called()
+
+    def test_summary(self, diagnostics: Diagnostics):
+        babelbox.load_languages_from_csv(MISSING, diagnostics=diagnostics)
+
+        summary = diagnostics.summary()
+        assert "en_us" in summary and "50.00%" in summary
+        assert "Missing translations (2):" in summary
+
+    def test_to_json(self, diagnostics: Diagnostics):
+        babelbox.load_languages_from_csv(MISSING, diagnostics=diagnostics)
+
+        assert diagnostics.to_json()["files"] == [
+            {
+                "path": MISSING,
+                "rows": 2,
+                "coverage": {"en_us": 0.5, "de_de": 0.5},
+                "missing": {"en_us": 1, "de_de": 1},
+                "examples": {"en_us": ["spoon"], "de_de": ["cat"]},
+                "missing_identifiers": [],
+            }
+        ]
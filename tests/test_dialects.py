@@ -0,0 +1,71 @@
+import csv
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import babelbox
+from babelbox.dialects import DetectedDialect, DialectDetector
+
+
+@pytest.fixture
+def detector():
+    return DialectDetector()
+
+
+class Test_detect:
+    def test_sniff(self, detector: DialectDetector):
+        dialect = detector.detect("a.csv", "Ident;a;b\nx;1;2\n")
+        assert dialect.delimiter == ";"
+
+    def test_reuse_header_signature(self, detector: DialectDetector):
+        detector.detect("a.csv", "Ident|a|b\nx|1|2\n")
+
+        with patch("csv.Sniffer.sniff") as mock_sniff:
+            dialect = detector.detect("other/b.csv", "Ident|a|b\ny|3|4\n")
+            mock_sniff.assert_not_called()
+
+        assert dialect.delimiter == "|"
+
+    def test_fallback_to_directory(self, detector: DialectDetector):
+        detector.detect("lang/a.csv", "Ident;a;b\nx;1;2\n")
+
+        with patch("csv.Sniffer.sniff", side_effect=csv.Error):
+            assert detector.detect("lang/b.csv", "Ident\n").delimiter == ";"
+            assert detector.detect("other/c.csv", "Ident\n").delimiter == ","
+
+    def test_persist(self, tmp_path: Path):
+        detector = DialectDetector(tmp_path / "dialects.json")
+        detector.detect("a.csv", "Ident;a;b\nx;1;2\n")
+        detector.save()
+
+        with patch("csv.Sniffer.sniff") as mock_sniff:
+            dialect = DialectDetector(tmp_path / "dialects.json").detect(
+                "a.csv", "Ident;a;b\nx;1;2\n"
+            )
+            mock_sniff.assert_not_called()
+
+        assert dialect.delimiter == ";"
+
+
+def test_pickle_detected_dialect():
+    dialect = DetectedDialect(
+        delimiter=";",
+        quotechar='"',
+        escapechar=None,
+        doublequote=True,
+        skipinitialspace=False,
+        lineterminator="\r\n",
+        quoting=csv.QUOTE_MINIMAL,
+    )
+
+    assert pickle.loads(pickle.dumps(dialect)).delimiter == ";"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_load_languages(jobs):
+    languages = babelbox.load_languages(
+        "tests/cli/examples/custom_dialects", jobs=jobs, dialect_detector=DialectDetector()
+    )
+    assert languages == {"a": {"x": "1", "y": "3"}, "b": {"x": "2", "y": "4"}}
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import babelbox
+from babelbox import external
+from babelbox.diagnostics import Diagnostics
+from babelbox.profiling import Profiler
+
+TREE = Path("tests/cli/examples/tree")
+
+
+def expected(languages, indent):
+    return {
+        code
+        + ".json": json.dumps(
+            dict(sorted(translations.items())), indent=indent, ensure_ascii=False
+        )
+        for code, translations in languages.items()
+    }
+
+
+def written(directory: Path):
+    return {path.name: path.read_text("utf8") for path in directory.iterdir()}
+
+
+@pytest.mark.parametrize("indent", [None, "\t"])
+@pytest.mark.parametrize("run_size", [1, 3, 100_000])
+def test_same_translations(tmp_path: Path, indent, run_size):
+    files = babelbox.find_csv_files(TREE, True)
+
+    babelbox.write_language_files_external(files, tmp_path, indent, run_size=run_size)
+
+    languages = babelbox.load_languages(TREE, prefix_identifiers=True)
+    assert written(tmp_path) == expected(languages, indent)
+
+
+def test_later_files_override(tmp_path: Path):
+    (tmp_path / "a.csv").write_text("id,en_us\nx,1\ny,2\n", "utf8")
+    (tmp_path / "b.csv").write_text("id,en_us,de_de\ny,3,ä\nx,,4\nx,5,6\n", "utf8")
+    files = [(tmp_path / "a.csv", ""), (tmp_path / "b.csv", "")]
+
+    babelbox.write_language_files_external(files, tmp_path, run_size=2)
+
+    assert (tmp_path / "en_us.json").read_text("utf8") == '{"x": "5", "y": "3"}'
+    assert (tmp_path / "de_de.json").read_text("utf8") == '{"x": "6", "y": "ä"}'
+
+
+def test_multi_pass_merge(tmp_path: Path):
+    source = tmp_path / "source.csv"
+    source.write_text("id,en_us\n" + "".join(f"{i % 7},{i}\n" for i in range(50)), "utf8")
+
+    with patch.object(external, "MAX_FAN_IN", 2):
+        babelbox.write_language_files_external([(source, "")], tmp_path, run_size=1)
+
+    translations = json.loads((tmp_path / "en_us.json").read_text("utf8"))
+    assert translations == {str(i % 7): str(i) for i in range(50)}
+
+
+def test_skip_unchanged(tmp_path: Path):
+    source = tmp_path / "source.csv"
+    source.write_text("id,en_us,de_de\nx,1,2\n", "utf8")
+    out = tmp_path / "out"
+    out.mkdir()
+    babelbox.write_language_files_external([(source, "")], out)
+
+    source.write_text("id,en_us,de_de\nx,1,3\n", "utf8")
+    result = babelbox.write_language_files_external([(source, "")], out, skip_unchanged=True)
+
+    assert result.written == [out / "de_de.json"]
+    assert result.skipped == [out / "en_us.json"]
+    assert not list(out.glob("*.tmp"))
+
+
+def test_diagnostics(tmp_path: Path):
+    source = tmp_path / "source.csv"
+    source.write_text("id,en_us,de_de\nx,1,\n,2,3\ny,,\n", "utf8")
+    diagnostics = Diagnostics()
+
+    babelbox.write_language_files_external([(source, "")], tmp_path, diagnostics=diagnostics)
+
+    report = diagnostics.files[source]
+    assert report.missing == {"de_de": 2, "en_us": 1}
+    assert report.missing_identifiers == [3]
+    assert (tmp_path / "de_de.json").read_text("utf8") == '{"x": "", "y": ""}'
+
+
+def test_removes_runs(tmp_path: Path):
+    source = tmp_path / "source.csv"
+    source.write_text("id,en_us\nx,1\ny,2\n", "utf8")
+    runs = tmp_path / "runs"
+    runs.mkdir()
+
+    babelbox.write_language_files_external([(source, "")], tmp_path, run_size=1, temp_dir=runs)
+
+    assert not list(runs.iterdir())
+
+
+def test_profile_removed_source(tmp_path: Path):
+    source = tmp_path / "source.csv"
+    source.write_text("id,en_us\nx,1\n", "utf8")
+    profiler = Profiler()
+
+    with patch("babelbox.profiling.stat_source", side_effect=FileNotFoundError):
+        babelbox.write_language_files_external([(source, "")], tmp_path, profiler=profiler)
+
+    assert [(f.path, f.bytes, f.rows) for f in profiler.files] == [(str(source), 0, 1)]
+    assert (tmp_path / "en_us.json").read_text("utf8") == '{"x": "1"}'
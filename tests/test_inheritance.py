@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+from collections import ChainMap
+from pathlib import Path
+
+from _pytest.logging import LogCaptureFixture
+from typer.testing import CliRunner
+
+import babelbox
+from babelbox import cli
+from babelbox.cache import ParseCache
+from babelbox.diagnostics import Diagnostics
+from babelbox.inheritance import (
+    dependents,
+    materialize,
+    resolve_languages,
+    split_language_code,
+)
+from babelbox.watch import IncrementalBuild
+
+SHEET = "id,en_us,en_gb:en_us,en_au:en_gb\ncolor,Color,Colour,\nhi,Hi,Hi,G'day\nok,OK,,\n"
+
+
+def write(path: Path, content: str):
+    path.write_text(content, "utf8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_split_language_code():
+    assert split_language_code("en_gb:en_us") == ("en_gb", "en_us")
+    assert split_language_code("en_us") == ("en_us", None)
+    assert split_language_code("en_us:") == ("en_us", None)
+
+
+def test_resolve_languages():
+    languages = {"en_us": {"a": "1", "b": "2"}, "en_gb": {"b": "3", "c": "4"}, "en_au": {}}
+    resolved = resolve_languages(languages, {"en_gb": "en_us", "en_au": "en_gb"})
+
+    assert resolved["en_us"] is languages["en_us"]
+    assert isinstance(resolved["en_au"], ChainMap)
+    assert materialize(resolved["en_au"]) == {"a": "1", "b": "3", "c": "4"}
+    assert list(materialize(resolved["en_au"])) == list(resolved["en_au"])
+
+
+def test_resolve_unknown_parent_and_cycle(caplog: LogCaptureFixture):
+    languages = {"a": {"x": "1"}, "b": {"x": "2"}, "c": {"y": "3"}}
+
+    resolved = resolve_languages(languages, {"a": "b", "b": "a", "c": "missing"})
+
+    assert dict(resolved["a"]) == {"x": "1"}
+    assert dict(resolved["c"]) == {"y": "3"}
+    assert "'a' inherits from itself" in caplog.text
+    assert "unknown language 'missing'" in caplog.text
+
+
+def test_dependents():
+    parents = {"en_gb": "en_us", "en_au": "en_gb", "pt_pt": "pt_br"}
+    assert dependents(parents, ["en_us"]) == {"en_gb", "en_au"}
+    assert dependents(parents, ["en_au"]) == set()
+
+
+def test_only_differing_cells_are_stored(tmp_path: Path):
+    path = tmp_path / "sheet.csv"
+    path.write_text(SHEET, "utf8")
+    parents: dict = {}
+    diagnostics = Diagnostics()
+
+    languages = babelbox.load_languages_from_csv(
+        path, parents=parents, diagnostics=diagnostics
+    )
+
+    assert parents == {"en_gb": "en_us", "en_au": "en_gb"}
+    assert languages["en_gb"] == {"color": "Colour"}
+    assert languages["en_au"] == {"hi": "G'day"}
+    assert diagnostics.files[path].missing == {}
+
+
+def test_load_languages(tmp_path: Path):
+    (tmp_path / "a.csv").write_text(SHEET, "utf8")
+    (tmp_path / "b.csv").write_text("id,en_us\nok,Okay\n", "utf8")
+
+    languages = babelbox.load_languages(tmp_path)
+
+    assert materialize(languages["en_au"]) == {"color": "Colour", "hi": "G'day", "ok": "Okay"}
+    assert babelbox.load_languages(tmp_path / "a.csv")["en_gb"] == {
+        "color": "Colour",
+        "hi": "Hi",
+        "ok": "OK",
+    }
+
+
+def test_cache(tmp_path: Path):
+    (tmp_path / "a.csv").write_text(SHEET, "utf8")
+    cache = ParseCache(tmp_path / "cache")
+    expected = materialize(babelbox.load_languages(tmp_path / "a.csv", cache=cache)["en_au"])
+
+    languages = babelbox.load_languages(tmp_path / "a.csv", cache=cache)
+    assert materialize(languages["en_au"]) == expected
+
+
+def test_watch_rewrites_children(tmp_path: Path):
+    write(tmp_path / "a.csv", "id,en_us\nx,1\ny,2\n")
+    write(tmp_path / "b.csv", "id,en_gb:en_us\ny,3\n")
+    build = IncrementalBuild([tmp_path])
+    build.update()
+
+    write(tmp_path / "a.csv", "id,en_us\nx,4\ny,2\n")
+    changed = build.update()
+
+    assert {code: materialize(t) for code, t in changed.items()} == {
+        "en_us": {"x": "4", "y": "2"},
+        "en_gb": {"x": "4", "y": "3"},
+    }
+    assert build.languages["en_gb"] == {"y": "3"}
+
+
+def test_cli(tmp_path: Path, caplog: LogCaptureFixture):
+    (tmp_path / "a.csv").write_text(SHEET, "utf8")
+    out = tmp_path / "out"
+
+    with caplog.at_level(logging.WARNING):
+        args = [str(tmp_path / "a.csv"), "-o", str(out), "--minify"]
+        result = CliRunner().invoke(cli.app, args, catch_exceptions=False)
+    assert result.exit_code == 0
+    assert not caplog.text
+
+    en_au = (out / "en_au.json").read_text("utf8")
+    assert en_au == json.dumps({"color": "Colour", "hi": "G'day", "ok": "OK"})
+
+    result = CliRunner().invoke(cli.app, [*args, "--low-memory"])
+    assert result.exit_code == 1
@@ -0,0 +1,168 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import babelbox
+from babelbox import parser
+from babelbox.diagnostics import Diagnostics
+from babelbox.manifest import Target, load_manifest, load_targets, write_targets
+
+
+@pytest.fixture
+def project(tmp_path: Path):
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "ui.csv").write_text("Ident,en_us,de_de\nok,Ok,Gut\n", "utf8")
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "items.csv").write_text("Ident,en_us\nsword,Sword\n", "utf8")
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "items.csv").write_text("Ident;en_us\nbow;Bow\n", "utf8")
+    return tmp_path
+
+
+def write_manifest(directory: Path, manifest: dict):
+    path = directory / "babelbox.json"
+    path.write_text(json.dumps(manifest), "utf8")
+    return path
+
+
+class Test_load_manifest:
+    def test_defaults_and_relative_paths(self, project: Path):
+        path = write_manifest(
+            project,
+            {
+                "defaults": {"prefix_identifiers": True, "indent": "  "},
+                "targets": [
+                    {"name": "a", "sources": ["shared", "a"], "out": "out/a"},
+                    {"sources": ["b"], "out": "out/b", "delimiter": ";", "minify": True},
+                ],
+            },
+        )
+
+        assert load_manifest(path) == [
+            Target(
+                "a",
+                [project / "shared", project / "a"],
+                project / "out/a",
+                True,
+                None,
+                {},
+                "  ",
+            ),
+            Target(
+                "out/b",
+                [project / "b"],
+                project / "out/b",
+                True,
+                None,
+                {"delimiter": ";"},
+                None,
+            ),
+        ]
+
+    def test_toml(self, project: Path):
+        try:
+            import tomllib  # noqa: F401
+        except ImportError:
+            pytest.importorskip("tomli")
+
+        path = project / "babelbox.toml"
+        path.write_text(
+            '[[targets]]\nsources = ["a"]\nout = "out"\ndialect = "excel"\ncatalog = "a.bbx"\n',
+            "utf8",
+        )
+
+        (target,) = load_manifest(path)
+        assert target.dialect == "excel"
+        assert target.catalog == project / "a.bbx"
+
+    @pytest.mark.parametrize(
+        "targets, message",
+        [
+            ([{"sources": ["a"]}], "Missing 'out'"),
+            ([{"sources": ["a"], "out": "o", "jobs": 2}], "Unknown option 'jobs'"),
+            ([{"sources": "a", "out": "o"}], "'sources' must be of type list"),
+            ([{"sources": ["a"], "out": "o", "dialect": "tsv"}], "'dialect' must be one of"),
+            ([{"sources": ["a"], "out": "o"}] * 2, "defined more than once"),
+            ([{"sources": ["a", "typo"], "out": "o"}], "Source '.*typo' does not exist"),
+            (
+                [
+                    {"name": "x", "sources": ["a"], "out": "o"},
+                    {"sources": ["b"], "out": "./o"},
+                ],
+                "Targets 'x' and './o' write into the same folder",
+            ),
+        ],
+    )
+    def test_invalid(self, project: Path, targets, message):
+        with pytest.raises(ValueError, match=message):
+            load_manifest(write_manifest(project, {"targets": targets}))
+
+
+class Test_load_targets:
+    def test_same_as_separate_builds(self, project: Path):
+        targets = [
+            Target("a", [project / "shared", project / "a"], project / "out/a", True),
+            Target(
+                "b",
+                [project / "b"],
+                project / "out/b",
+                False,
+                None,
+                {"delimiter": ";"},
+            ),
+        ]
+
+        mergers = load_targets(targets)
+
+        assert mergers["a"].languages == babelbox.merge_languages(
+            [
+                babelbox.load_languages(project / "shared", True),
+                babelbox.load_languages(project / "a", True),
+            ]
+        )
+        assert mergers["b"].languages == {"en_us": {"bow": "Bow"}}
+
+    def test_parse_shared_files_once(self, project: Path):
+        targets = [
+            Target("a", [project / "shared", project / "a"], project / "out/a", True),
+            Target("b", [project / "shared" / "ui.csv"], project / "out/b"),
+        ]
+
+        with patch(
+            "babelbox.parser.load_languages_from_csv", wraps=parser.load_languages_from_csv
+        ) as mock_load_csv:
+            mergers = load_targets(targets, diagnostics=Diagnostics())
+
+        parsed = [call.args[0] for call in mock_load_csv.call_args_list]
+        assert sorted(parsed) == [project / "a" / "items.csv", project / "shared" / "ui.csv"]
+        assert mergers["a"].languages["de_de"] == {"ui.ok": "Gut"}
+        assert mergers["b"].languages["de_de"] == {"ok": "Gut"}
+
+    def test_collisions_per_target(self, project: Path):
+        (project / "a" / "more.csv").write_text("Ident,en_us\nsword,Blade\n", "utf8")
+        targets = [
+            Target("a", [project / "a"], project / "out/a"),
+            Target("b", [project / "shared"], project / "out/b"),
+        ]
+
+        mergers = load_targets(targets)
+
+        assert [c.identifier for c in mergers["a"].collisions] == ["sword"]
+        assert mergers["b"].collisions == []
+
+
+def test_write_targets(project: Path):
+    targets = [
+        Target("a", [project / "a"], project / "out/a", catalog=project / "a.bbx"),
+        Target("b", [project / "shared"], project / "out/b", indent=None),
+    ]
+    languages = {"a": {"en_us": {"sword": "Sword"}}, "b": {"de_de": {"ok": "Gut"}}}
+
+    results = write_targets(targets, languages, jobs=2)
+
+    assert results["a"].written == [project / "out/a/en_us.json"]
+    assert (project / "out/b/de_de.json").read_text("utf8") == '{"ok": "Gut"}'
+    with babelbox.Catalog(project / "a.bbx") as catalog:
+        assert catalog.get("en_us", "sword") == "Sword"
@@ -0,0 +1,71 @@
+import pytest
+
+import babelbox
+from babelbox.merge import Collision, MergeEngine, Origin
+
+
+@pytest.fixture
+def merger():
+    merger = MergeEngine()
+    merger.add(
+        "a.csv", {"en_us": {"x": "1", "y": "2"}, "de_de": {"x": "3", "y": "4"}}, {"x": 2}
+    )
+    merger.add("b.csv", {"en_us": {"y": "5", "z": "6"}}, {"y": 7, "z": 8})
+    return merger
+
+
+def test_merge(merger: MergeEngine):
+    assert merger.languages == {
+        "en_us": {"x": "1", "y": "5", "z": "6"},
+        "de_de": {"x": "3", "y": "4"},
+    }
+
+
+def test_origins(merger: MergeEngine):
+    assert merger.origin("x") == Origin("a.csv", 2)
+    assert merger.origin("y") == Origin("b.csv", 7)
+    assert merger.origin("unknown") is None
+    assert dict(merger.origins()) == {
+        "x": Origin("a.csv", 2),
+        "y": Origin("b.csv", 7),
+        "z": Origin("b.csv", 8),
+    }
+
+
+def test_collisions(merger: MergeEngine):
+    assert merger.collisions == [Collision("y", Origin("a.csv", 0), Origin("b.csv", 7))]
+    assert str(merger.collisions[0]) == "'y' defined in 'a.csv' is overridden by 'b.csv'@7"
+
+
+def test_disjoint_languages():
+    merger = MergeEngine()
+    merger.add("en.csv", {"en_us": {"hello": "Hello"}}, {"hello": 2})
+    merger.add("de.csv", {"de_de": {"hello": "Hallo"}}, {"hello": 2})
+    assert merger.collisions == []
+
+    merger.add("fr.csv", {"fr_fr": {"hello": "Salut"}, "en_us": {"hello": "Hi"}})
+    assert merger.collisions == [Collision("hello", Origin("en.csv", 2), Origin("fr.csv", 0))]
+
+
+def test_origin_per_language():
+    merger = MergeEngine()
+    merger.add("a.csv", {"en_us": {"x": "1"}}, {"x": 3})
+    merger.add("b.csv", {"de_de": {"x": "2"}}, {"x": 5})
+    merger.add("c.csv", {"en_us": {"x": "3"}}, {"x": 7})
+
+    assert merger.collisions == [Collision("x", Origin("a.csv", 3), Origin("c.csv", 7))]
+    assert merger.origin("x", "en_us") == Origin("c.csv", 7)
+    assert merger.origin("x", "de_de") == Origin("b.csv", 5)
+    assert merger.origin("x", "fr_fr") is None
+    assert merger.origin("x") == Origin("c.csv", 7)
+
+
+def test_same_as_merge_languages():
+    loaded = babelbox.load_files(babelbox.find_csv_files("tests/cli/examples/tree"))
+
+    merger = MergeEngine()
+    for f in loaded:
+        merger.add(f.path, f.languages, f.line_numbers)
+
+    assert merger.languages == babelbox.merge_languages(f.languages for f in loaded)
+    assert merger.collisions == []
@@ -0,0 +1,87 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+import babelbox
+from babelbox.profiling import Profiler, measure_memory
+
+
+def test_stage():
+    profiler = Profiler()
+
+    with profiler.stage("a"):
+        pass
+    with profiler.stage("a"):
+        pass
+
+    assert list(profiler.stages) == ["a"]
+    assert profiler.stages["a"] >= 0
+
+
+def test_load_and_write(tmp_path: Path):
+    profiler = Profiler()
+
+    languages = babelbox.load_languages("tests/parser/examples/misc", profiler=profiler)
+    babelbox.write_language_files(tmp_path, languages, profiler=profiler)
+
+    assert {"walk", "parse", "merge", "write"} <= set(profiler.stages)
+    assert sorted(Path(f.path).name for f in profiler.files) == [
+        "a.csv",
+        "missing_translations.csv",
+        "unicode.csv",
+    ]
+    assert all(f.rows == 2 and f.columns == 2 and f.bytes > 0 for f in profiler.files)
+    assert sorted(lang.code for lang in profiler.languages) == sorted(languages)
+
+    summary = profiler.summary()
+    assert "Stages:" in summary and "unicode.csv" in summary and "en_us" in summary
+
+    profiler.dump(tmp_path / "profile.json")
+    data = json.loads((tmp_path / "profile.json").read_text())
+    assert len(data["files"]) == 3
+    assert "rows_per_second" in data["files"][0]
+
+
+def test_cached_files(tmp_path: Path):
+    cache = babelbox.ParseCache(tmp_path)
+    babelbox.load_languages("tests/parser/examples/misc", cache=cache)
+
+    profiler = Profiler()
+    babelbox.load_languages("tests/parser/examples/misc", cache=cache, profiler=profiler)
+
+    assert all(f.cached for f in profiler.files)
+    assert "parse" in profiler.stages and "cache" in profiler.stages
+
+
+class Test_memory:
+    def test_measure_memory(self):
+        with measure_memory() as outer:
+            with measure_memory() as inner:
+                data = bytearray(1_000_000)
+            kept = bytearray(100_000)
+            del data
+
+        assert inner.peak >= 1_000_000 and inner.retained >= 1_000_000
+        assert outer.peak >= 1_000_000
+        assert 100_000 <= outer.retained < 1_000_000
+        assert not tracemalloc.is_tracing()
+        del kept
+
+    def test_disabled(self):
+        profiler = Profiler()
+        with profiler.stage("a"):
+            assert not tracemalloc.is_tracing()
+
+        assert profiler.stage_memory == {}
+
+    def test_load_and_write(self, tmp_path: Path):
+        profiler = Profiler(memory=True)
+
+        languages = babelbox.load_languages("tests/parser/examples/misc", profiler=profiler)
+        babelbox.write_language_files(tmp_path, languages, profiler=profiler)
+
+        assert {"parse", "merge", "write"} <= set(profiler.stage_memory)
+        assert profiler.stage_memory["parse"].retained > 0
+        assert all(f.peak_memory >= f.retained_memory > 0 for f in profiler.files)
+        assert "Memory per file" in profiler.summary()
+        assert "parse" in profiler.to_json()["stage_memory"]
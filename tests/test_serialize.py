@@ -0,0 +1,47 @@
+import json
+from collections import ChainMap
+
+import pytest
+
+from babelbox.serialize import BACKENDS, dumps, get_serializer
+
+LANGUAGES = [
+    {},
+    {"x": "1"},
+    {"item.sword": "Schwert ä 😀", "empty": "", "": "no identifier"},
+    {"quotes": '"a": "b", "c"', "escapes": "\\ \n \r \t \b \f \x00 \x1f \x7f  "},
+    {"newline\n  in key": ",\n  ", "\\": "\\\\"},
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def serializer(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return get_serializer(request.param)
+
+
+@pytest.mark.parametrize("translations", LANGUAGES)
+@pytest.mark.parametrize("indent", [None, "\t", "  ", "", 4])
+def test_same_as_json(serializer, translations, indent):
+    expected = json.dumps(translations, indent=indent, ensure_ascii=False).encode("utf8")
+    assert serializer(translations, indent) == expected
+
+
+def test_mappings(serializer):
+    translations = ChainMap({"x": "2"}, {"x": "1", "y": "3"})
+    assert serializer(translations, None) == b'{"x": "2", "y": "3"}'
+
+
+def test_surrogates(serializer):
+    with pytest.raises(UnicodeEncodeError):
+        serializer({"x": "\ud800"}, None)
+
+
+def test_default_backend():
+    assert dumps({"x": "ä"}, "\t") == '{\n\t"x": "ä"\n}'.encode("utf8")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from babelbox import client, parser
+from babelbox.server import BuildServer, make_server, parse_address
+from babelbox.watch import IncrementalBuild
+
+
+def write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, "utf8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def src(tmp_path: Path):
+    write(tmp_path / "src" / "a.csv", "Ident,en_us,de_de\nx,1,2\n")
+    write(tmp_path / "src" / "b.csv", "Ident,en_us\ny,3\n")
+    return tmp_path / "src"
+
+
+@pytest.fixture
+def address(src: Path, tmp_path: Path):
+    build_server = BuildServer(IncrementalBuild([src]), tmp_path / "out")
+    server = make_server(build_server, ("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,))
+    thread.start()
+
+    host, port = server.server_address[:2]
+    yield f"{host}:{port}"
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_parse_address():
+    assert parse_address("8000") == ("127.0.0.1", 8000)
+    assert parse_address("localhost:8000") == ("localhost", 8000)
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_build(address: str, tmp_path: Path):
+    response = client.request("build", address)
+
+    out = tmp_path / "out"
+    assert sorted(response["written"]) == [str(out / "de_de.json"), str(out / "en_us.json")]
+    assert "update" in response["stages"]
+    assert json.loads((out / "en_us.json").read_text("utf8")) == {"x": "1", "y": "3"}
+
+
+def test_only_rebuild_changes(address: str, src: Path, tmp_path: Path):
+    client.request("build", address)
+
+    write(src / "b.csv", "Ident,en_us\ny,4\n")
+    with patch(
+        "babelbox.parser.load_languages_from_csv", wraps=parser.load_languages_from_csv
+    ) as mock_load_csv:
+        response = client.request("build", address)
+
+    assert {call.args[0] for call in mock_load_csv.call_args_list} == {src / "b.csv"}
+    assert response["written"] == [str(tmp_path / "out" / "en_us.json")]
+    assert client.request("build", address)["written"] == []
+
+
+def test_check(address: str, src: Path):
+    assert client.request("check", address)["stale"] == ["de_de", "en_us"]
+
+    client.request("build", address)
+    assert client.request("check", address)["stale"] == []
+
+    write(src / "a.csv", "Ident,en_us,de_de\nx,1,5\n")
+    assert client.request("check", address)["stale"] == ["de_de"]
+
+
+def test_unknown_command(address: str):
+    with pytest.raises(RuntimeError, match="Unknown command"):
+        client.request("compile", address)
+
+
+class Test_client_main:
+    def test_check_exit_code(self, address: str, capsys):
+        assert client.main(["check", "-a", address]) == 1
+        assert "en_us.json does not exist" in capsys.readouterr().out
+
+        assert client.main(["build", "-a", address]) == 0
+        assert client.main(["check", "-a", address]) == 0
+
+    def test_no_server(self, capsys):
+        assert client.main(["build", "-a", "127.0.0.1:1", "--timeout", "1"]) == 1
+        assert "babelbox-client:" in capsys.readouterr().err
@@ -0,0 +1,30 @@
+from benchmarks.startup import import_times, imported_modules
+
+
+def test_lazy_imports():
+    """ `import babelbox` must not import the CLI or integration dependencies """
+
+    modules = imported_modules("import babelbox")
+
+    assert "babelbox.parser" in modules
+    assert not {"typer", "click", "beet", "multiprocessing", "babelbox.cli"} & modules
+
+
+def test_lazy_submodules():
+    modules = imported_modules("import babelbox; babelbox.integration.beet")
+    assert {"beet", "babelbox.integration.beet"} <= modules
+
+
+def test_lazy_stdlib_modules():
+    """ Modules only needed by some features are imported when they are used """
+
+    modules = imported_modules("import babelbox")
+    assert not {"tracemalloc", "tempfile", "mmap", "heapq"} & modules
+
+    modules = imported_modules("import babelbox; babelbox.Catalog")
+    assert "mmap" in modules
+
+
+def test_import_times():
+    times = import_times("import babelbox")
+    assert "babelbox" in times
@@ -0,0 +1,127 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import babelbox
+from babelbox.table import TranslationTable
+
+
+@pytest.fixture
+def table():
+    return TranslationTable({"en_us": {"x": "1", "y": "2"}, "de_de": {"y": "3"}})
+
+
+class Test_table:
+    def test_mapping(self, table: TranslationTable):
+        assert list(table) == ["en_us", "de_de"]
+        assert len(table) == 2
+        assert "fr_fr" not in table
+        with pytest.raises(KeyError):
+            table["fr_fr"]
+
+    def test_shared_identifiers(self, table: TranslationTable):
+        assert table.identifiers == ["x", "y"]
+        assert table.columns == {"en_us": ["1", "2"], "de_de": [None, "3"]}
+
+    def test_update_overwrites(self, table: TranslationTable):
+        table.update({"de_de": {"y": "4", "z": "5"}})
+
+        assert table.to_dict() == {
+            "en_us": {"x": "1", "y": "2"},
+            "de_de": {"y": "4", "z": "5"},
+        }
+        assert len(table["de_de"]) == 2
+
+    def test_equals_dicts(self, table: TranslationTable):
+        assert table == {"en_us": {"x": "1", "y": "2"}, "de_de": {"y": "3"}}
+
+
+class Test_language_view:
+    def test_lookup(self, table: TranslationTable):
+        de_de = table["de_de"]
+
+        assert de_de["y"] == "3"
+        assert de_de.get("x") is None
+        assert "x" not in de_de
+        with pytest.raises(KeyError):
+            de_de["unknown"]
+
+    def test_iteration(self, table: TranslationTable):
+        assert list(table["en_us"].items()) == [("x", "1"), ("y", "2")]
+        assert list(table["de_de"]) == ["y"]
+        assert len(table["de_de"]) == 1
+
+    def test_insertion_order_per_language(self, table: TranslationTable):
+        table.update({"de_de": {"x": "4"}})
+        assert list(table["de_de"]) == ["y", "x"]
+        assert list(table["en_us"]) == ["x", "y"]
+
+
+class Test_parser:
+    def test_load_languages(self):
+        table = babelbox.load_languages("tests/parser/examples/misc", True, as_table=True)
+
+        assert isinstance(table, TranslationTable)
+        assert table == babelbox.load_languages("tests/parser/examples/misc", True)
+
+    def test_load_languages_per_file(self):
+        with patch("babelbox.parser.load_files") as mock_load_files:
+            table = babelbox.load_languages("tests/parser/examples/misc", as_table=True)
+            mock_load_files.assert_not_called()
+
+        assert table == babelbox.load_languages("tests/parser/examples/misc")
+
+    def test_load_inheriting_languages(self, tmp_path: Path):
+        (tmp_path / "a.csv").write_text("id,en_us,en_gb:en_us\nx,1,\ny,2,3\n", "utf8")
+        (tmp_path / "b.csv").write_text("id,en_au:en_gb,en_us\nz,4,5\n", "utf8")
+
+        table = babelbox.load_languages(tmp_path, as_table=True)
+        assert table.to_dict() == {
+            "en_us": {"x": "1", "y": "2", "z": "5"},
+            "en_gb": {"x": "1", "y": "3", "z": "5"},
+            "en_au": {"x": "1", "y": "3", "z": "4"},
+        }
+
+    def test_same_order_as_dicts(self, tmp_path: Path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "a.csv").write_text("id,de_de\nb,1\n", "utf8")
+        (src / "b.csv").write_text("id,en_us,en_gb:en_us,de_de\na,2,,3\nb,4,5,6\n", "utf8")
+        (src / "c.csv").write_text("id,en_gb:en_us\nc,7\n", "utf8")
+
+        table = babelbox.load_languages(src, as_table=True)
+        languages = babelbox.load_languages(src)
+        assert {code: list(view) for code, view in table.items()} == {
+            code: list(translations) for code, translations in languages.items()
+        }
+
+        (tmp_path / "table").mkdir()
+        (tmp_path / "dicts").mkdir()
+        babelbox.write_language_files(tmp_path / "table", table)
+        babelbox.write_language_files(tmp_path / "dicts", languages)
+        for path in (tmp_path / "dicts").iterdir():
+            assert (tmp_path / "table" / path.name).read_text("utf8") == path.read_text("utf8")
+
+    def test_load_languages_from_csv(self):
+        table = babelbox.load_languages_from_csv(
+            "tests/parser/examples/misc/missing_translations.csv", as_table=True
+        )
+        assert table.to_dict() == {
+            "en_us": {"cat": "Cat", "spoon": ""},
+            "de_de": {"cat": "", "spoon": "Löffel"},
+        }
+
+    def test_merge_tables(self, table: TranslationTable):
+        merged = babelbox.merge_languages([table, {"de_de": {"x": "6"}}], as_table=True)
+        assert merged.to_dict() == {
+            "en_us": {"x": "1", "y": "2"},
+            "de_de": {"y": "3", "x": "6"},
+        }
+
+        assert babelbox.merge_languages([table]) == table
+
+    def test_write(self, table: TranslationTable, tmp_path: Path):
+        babelbox.write_language_files(tmp_path, table)
+
+        assert (tmp_path / "de_de.json").read_text("utf8") == '{"y": "3"}'
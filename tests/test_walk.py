@@ -0,0 +1,94 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import babelbox
+from babelbox.walk import FileWalker, compile_pattern
+
+
+@pytest.fixture
+def tree(tmp_path: Path):
+    for path in [
+        "a.csv",
+        "b.txt",
+        "lang/c.csv",
+        "lang/draft/d.csv",
+        "lang/e.csv.bak",
+        ".git/f.csv",
+        "textures/g.csv",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+    return tmp_path
+
+
+def found(walker: FileWalker, root: Path):
+    return sorted(p.relative_to(root).as_posix() for p in walker.walk(root))
+
+
+class Test_compile_pattern:
+    @pytest.mark.parametrize(
+        "pattern, name, rel_dir, is_dir, expected",
+        [
+            ("*.csv", "a.csv", "x/", False, True),
+            ("*.csv", "a.txt", "", False, False),
+            ("draft/", "draft", "lang/", True, True),
+            ("draft/", "draft", "lang/", False, False),
+            ("lang/*.csv", "c.csv", "lang/", False, True),
+            ("lang/*.csv", "d.csv", "lang/draft/", False, False),
+            ("lang/**/*.csv", "d.csv", "lang/draft/", False, True),
+            ("lang/**/*.csv", "c.csv", "lang/", False, True),
+            ("/a.csv", "a.csv", "", False, True),
+            ("/a.csv", "a.csv", "lang/", False, False),
+            ("[ab].csv", "b.csv", "", False, True),
+            ("[!ab].csv", "b.csv", "", False, False),
+            ("?.csv", "ab.csv", "", False, False),
+        ],
+    )
+    def test_matches(self, pattern, name, rel_dir, is_dir, expected):
+        assert compile_pattern(pattern).matches(name, rel_dir, is_dir) == expected
+
+
+class Test_walk:
+    def test_default(self, tree: Path):
+        assert found(FileWalker(), tree) == [
+            "a.csv",
+            "lang/c.csv",
+            "lang/draft/d.csv",
+            "textures/g.csv",
+        ]
+
+    def test_include_exclude(self, tree: Path):
+        walker = FileWalker(["*.csv", "*.txt"], ["textures/", "draft", ".git/"])
+        assert found(walker, tree) == ["a.csv", "b.txt", "lang/c.csv"]
+
+    def test_prune_excluded_folders(self, tree: Path):
+        with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+            list(FileWalker(exclude=["textures/", ".git/"]).walk(tree))
+
+        scanned = {Path(call.args[0]).name for call in mock_scandir.call_args_list}
+        assert {"lang", "draft"} <= scanned
+        assert not {"textures", ".git"} & scanned
+
+    def test_ignore_file(self, tree: Path):
+        (tree / ".babelboxignore").write_text("# Comment\n\ntextures/\n")
+        (tree / "lang" / ".babelboxignore").write_text("/draft/\n")
+
+        assert found(FileWalker(), tree) == ["a.csv", "lang/c.csv"]
+
+    def test_same_order_as_os_walk(self):
+        directory = "tests/cli/examples/tree"
+        expected = [
+            Path(d, f)
+            for d, _, files in os.walk(directory)
+            for f in files
+            if f.endswith(".csv")
+        ]
+        assert list(FileWalker().walk(directory)) == expected
+
+
+def test_find_csv_files(tree: Path):
+    files = babelbox.find_csv_files(tree, True, FileWalker(exclude=["lang/", ".git/"]))
+    assert sorted(prefix for _, prefix in files) == ["a.", "textures.g."]
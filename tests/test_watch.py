@@ -0,0 +1,122 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+
+from babelbox.parser import load_files
+from babelbox.watch import IncrementalBuild, watch
+
+
+def write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, "utf8")
+    # Make sure the change is visible even on file systems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def src(tmp_path: Path):
+    write(tmp_path / "a.csv", "Ident,en_us,de_de\nx,1,2\n")
+    write(tmp_path / "b" / "c.csv", "Ident,en_us,fr_fr\ny,3,4\n")
+    return tmp_path
+
+
+class Test_update:
+    def test_initial_build(self, src: Path):
+        build = IncrementalBuild([src])
+
+        expected = {"en_us": {"x": "1", "y": "3"}, "de_de": {"x": "2"}, "fr_fr": {"y": "4"}}
+        assert build.update() == expected
+        assert build.languages == expected
+
+    def test_no_changes(self, src: Path):
+        build = IncrementalBuild([src])
+        build.update()
+
+        with patch("babelbox.parser.load_languages_from_csv") as mock_load_csv:
+            assert build.update() == {}
+            mock_load_csv.assert_not_called()
+
+    def test_modified_file(self, src: Path):
+        build = IncrementalBuild([src])
+        build.update()
+
+        write(src / "b" / "c.csv", "Ident,fr_fr\ny,5\n")
+        assert build.update() == {"en_us": {"x": "1"}, "fr_fr": {"y": "5"}}
+        assert build.languages == {
+            "en_us": {"x": "1"},
+            "de_de": {"x": "2"},
+            "fr_fr": {"y": "5"},
+        }
+
+    def test_added_and_removed_files(self, src: Path):
+        build = IncrementalBuild([src], prefix_identifiers=True)
+        build.update()
+
+        (src / "a.csv").unlink()
+        write(src / "d.csv", "Ident,es_es\nz,6\n")
+
+        assert build.update() == {"en_us": {"b.c.y": "3"}, "es_es": {"d.z": "6"}}
+        assert build.languages == {
+            "en_us": {"b.c.y": "3"},
+            "fr_fr": {"b.c.y": "4"},
+            "es_es": {"d.z": "6"},
+        }
+
+    def test_invalid_file(self, src: Path, caplog: LogCaptureFixture):
+        build = IncrementalBuild([src])
+        build.update()
+
+        (src / "a.csv").write_bytes("Ident,en_us,de_de\nx,ä,2\n".encode("latin-1"))
+        write(src / "b" / "c.csv", "Ident,en_us,fr_fr\ny,3,5\n")
+        assert build.update() == {"en_us": {"x": "1", "y": "3"}, "fr_fr": {"y": "5"}}
+        assert "Failed to parse" in caplog.text
+        assert build.languages["de_de"] == {"x": "2"}
+
+        caplog.clear()
+        assert build.update() == {}
+        assert not caplog.text
+
+        write(src / "a.csv", "Ident,en_us,de_de\nx,ä,2\n")
+        assert build.update() == {"en_us": {"x": "ä", "y": "3"}, "de_de": {"x": "2"}}
+
+    def test_removed_while_parsing(self, src: Path):
+        build = IncrementalBuild([src])
+        build.update()
+
+        def remove_and_load(files, *args, **kwargs):
+            (src / "d.csv").unlink()
+            return load_files(files, *args, **kwargs)
+
+        write(src / "d.csv", "Ident,es_es\nz,6\n")
+        with patch("babelbox.watch.load_files", side_effect=remove_and_load):
+            assert build.update() == {}
+        assert build.update() == {}
+
+        write(src / "d.csv", "Ident,es_es\nz,6\n")
+        assert build.update() == {"es_es": {"z": "6"}}
+
+
+def test_watch(src: Path):
+    build = IncrementalBuild([src])
+    on_change = MagicMock()
+
+    with patch("time.sleep", side_effect=[None, KeyboardInterrupt]):
+        watch(build, on_change)
+
+    on_change.assert_called_once_with(build.languages)
+
+
+def test_watch_error(src: Path, caplog: LogCaptureFixture):
+    build = IncrementalBuild([src])
+    on_change = MagicMock()
+
+    with patch.object(build, "update", side_effect=[OSError, {"en_us": {}}]):
+        with patch("time.sleep", side_effect=[None, KeyboardInterrupt]):
+            watch(build, on_change)
+
+    assert "Failed to update the build" in caplog.text
+    on_change.assert_called_once_with({"en_us": {}})